@@ -0,0 +1,95 @@
+/**
+ * Throughput benchmark of the direct HTTP lookup engine against the mock portal
+ * Runs fully offline.
+ *
+ * Usage: npm run bench:http -- --codes=1000 --concurrency=4
+ */
+
+import * as http from 'http';
+import { HttpQueryEngine, MemoryCookieSource } from '../main/automation/http-query-engine';
+import { startMockPortal, mockCellsForCode, MOCK_CODE_FIELD, MOCK_FORM_TOKEN } from './mock-portal-server';
+
+function readArg(name: string, fallback: number): number {
+  const arg = process.argv.find(value => value.startsWith(`--${name}=`));
+  return arg ? Number(arg.split('=')[1]) : fallback;
+}
+
+/**
+ * Open the session on the search page, like the user does in the webview
+ */
+function openSession(url: string, cookies: MemoryCookieSource): Promise<void> {
+  return new Promise((resolve, reject) => {
+    http.get(url, res => {
+      res.resume();
+      res.on('end', () => {
+        cookies.storeSetCookies(url, res.headers['set-cookie'] || []).then(resolve, reject);
+      });
+    }).on('error', reject);
+  });
+}
+
+function percentile(sorted: number[], p: number): number {
+  if (sorted.length === 0) return 0;
+  return sorted[Math.min(sorted.length - 1, Math.floor((p / 100) * sorted.length))];
+}
+
+async function main(): Promise<void> {
+  const totalCodes = readArg('codes', 1000);
+  const concurrency = readArg('concurrency', 4);
+
+  const portal = await startMockPortal();
+  const cookies = new MemoryCookieSource();
+  await openSession(`${portal.url}/`, cookies);
+
+  const engine = new HttpQueryEngine(
+    {
+      action: `${portal.url}/consultazione`,
+      method: 'POST',
+      codeField: MOCK_CODE_FIELD,
+      fields: [['token', MOCK_FORM_TOKEN], ['azione', 'cerca']]
+    },
+    cookies,
+    {},
+    concurrency
+  );
+
+  const codes = Array.from({ length: totalCodes }, (_, i) => `2025/${String(i).padStart(6, '0')}`);
+  const latencies: number[] = [];
+  let mismatches = 0;
+  let next = 0;
+
+  const start = process.hrtime.bigint();
+
+  await Promise.all(Array.from({ length: concurrency }, async () => {
+    while (next < codes.length) {
+      const code = codes[next++];
+      const t0 = process.hrtime.bigint();
+      const result = await engine.fetchStateForCode(code);
+      latencies.push(Number(process.hrtime.bigint() - t0) / 1e6);
+
+      if (!result.success || JSON.stringify(result.cells) !== JSON.stringify(mockCellsForCode(code))) {
+        mismatches++;
+      }
+    }
+  }));
+
+  const elapsedSeconds = Number(process.hrtime.bigint() - start) / 1e9;
+  latencies.sort((a, b) => a - b);
+
+  await engine.cleanup();
+  await portal.close();
+
+  console.log(`[Bench HTTP] ${totalCodes} codici, concorrenza ${concurrency}`);
+  console.log(`[Bench HTTP] ${(totalCodes / elapsedSeconds).toFixed(1)} codici/s in ${elapsedSeconds.toFixed(2)}s`);
+  console.log(`[Bench HTTP] latenza p50 ${percentile(latencies, 50).toFixed(2)}ms, p95 ${percentile(latencies, 95).toFixed(2)}ms`);
+  console.log(`[Bench HTTP] richieste portale: ${portal.stats.lookups}, rifiutate: ${portal.stats.rejected}, errori: ${mismatches}`);
+
+  if (mismatches > 0) {
+    process.exitCode = 1;
+  }
+}
+
+main().catch(error => {
+  console.error('[Bench HTTP] Errore:', error);
+  process.exit(1);
+});
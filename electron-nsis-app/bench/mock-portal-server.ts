@@ -0,0 +1,248 @@
+/**
+ * Local mock of the NSIS consultation portal
+ * Reproduces the search form and the #risultatiConsultazionePratica table so
+ * the lookup engines can be exercised and benchmarked offline.
+ * Response latency, error rate and the kind of search control (submit button
+ * or "Cerca" link, as on some portal pages) are configurable.
+ *
+ * Usage: npx ts-node bench/mock-portal-server.ts [--port=8080] [--latency=200]
+ *        [--jitter=100] [--error-rate=0.05] [--submit=button|link]
+ */
+
+import * as http from 'http';
+import { randomBytes } from 'crypto';
+
+export const MOCK_CODE_FIELD = 'codiceRichiesta';
+export const MOCK_FORM_TOKEN = 'mock-form-token';
+export const MOCK_SESSION_COOKIE = 'JSESSIONID';
+
+const STATES = ['Chiusa', 'Aperta', 'In lavorazione', 'Annullata', 'Inviata'];
+
+// Filler that brings result pages close to the size of the real portal pages
+const PAGE_FILLER = `<footer>${'<p>Ministero della Salute - Portale NSIS</p>'.repeat(400)}</footer>`;
+
+export type MockSubmitMode = 'button' | 'link';
+
+export interface MockPortalOptions {
+  port?: number;
+  /** Fixed delay before every response (ms) */
+  latencyMs?: number;
+  /** Extra random delay, uniform in [0, jitterMs) */
+  jitterMs?: number;
+  /** Share of lookups answered with a 503 page without results (0-1) */
+  errorRate?: number;
+  /** Search control: form submit button (POST) or link (GET with the code in the URL) */
+  submit?: MockSubmitMode;
+}
+
+export interface MockPortalStats {
+  searchPages: number;
+  lookups: number;
+  rejected: number;
+  failed: number;
+}
+
+export interface MockPortal {
+  url: string;
+  stats: MockPortalStats;
+  close(): Promise<void>;
+}
+
+/**
+ * Deterministic result cells for a code
+ */
+export function mockCellsForCode(code: string): string[] {
+  let hash = 0;
+  for (let i = 0; i < code.length; i++) {
+    hash = (hash * 31 + code.charCodeAt(i)) >>> 0;
+  }
+
+  return [
+    `0${3000 + (hash % 900)}00`,          // Taric
+    'Merce varia',                         // Descrizione
+    STATES[hash % STATES.length],          // Stato
+    `PI-${hash % 100000}`,                 // Protocollo ingresso
+    '01/01/2025',                          // Inserita il
+    `PU-${hash % 70000}`,                  // Protocollo uscita
+    hash % 2 === 0 ? 'Nulla osta' : '',    // Provvedimento
+    hash % 2 === 0 ? '02/01/2025' : '',    // Data provvedimento
+    code,                                  // Codice richiesta
+    'Import',                              // Tipo pratica
+    '',                                    // Note Usmaf
+    hash % 3 === 0 ? 'SI' : 'NO'           // Invio SUD
+  ];
+}
+
+function escapeHtml(text: string): string {
+  return text
+    .replace(/&/g, '&amp;')
+    .replace(/</g, '&lt;')
+    .replace(/>/g, '&gt;')
+    .replace(/"/g, '&quot;');
+}
+
+/**
+ * Search control: submit button, or a link whose href follows the input
+ */
+function renderSearchControl(submit: MockSubmitMode, code: string | null): string {
+  if (submit === 'button') {
+    return '<button type="submit" name="azione" value="cerca">Cerca</button>';
+  }
+
+  const href = `/consultazione?${MOCK_CODE_FIELD}=${encodeURIComponent(code || '')}`;
+  return `<a id="cercaLink" href="${escapeHtml(href)}">Cerca</a>
+    <script>
+      document.getElementById('${MOCK_CODE_FIELD}').addEventListener('input', function(event) {
+        document.getElementById('cercaLink').href =
+          '/consultazione?${MOCK_CODE_FIELD}=' + encodeURIComponent(event.target.value);
+      });
+    </script>`;
+}
+
+function renderPage(code: string | null, submit: MockSubmitMode = 'button', error: boolean = false): string {
+  const rows = code === null || error
+    ? ''
+    : `<tr>${mockCellsForCode(code).map(cell => `<td>${escapeHtml(cell)}</td>`).join('')}</tr>`;
+  const errorBanner = error ? '<div class="errore">Servizio temporaneamente non disponibile</div>' : '';
+
+  return `<!DOCTYPE html>
+<html lang="it">
+<head>
+  <meta charset="utf-8">
+  <title>Consultazione pratica - Mock NSIS</title>
+  <script>window.__mockPortal = true; if (1 < 2) { /* markup-like text: <table> */ }</script>
+</head>
+<body>
+  <form id="consultazionePratica" method="post" action="/consultazione">
+    <input type="hidden" name="token" value="${MOCK_FORM_TOKEN}">
+    <input type="text" name="${MOCK_CODE_FIELD}" id="${MOCK_CODE_FIELD}" placeholder="codice richiesta" value="${escapeHtml(code || '')}">
+    ${renderSearchControl(submit, code)}
+  </form>
+  ${errorBanner}
+  <table id="risultatiConsultazionePratica">
+    <thead><tr><th>Taric</th><th>Descrizione</th><th>Stato</th><th>Protocollo ingresso</th><th>Inserita il</th><th>Protocollo uscita</th><th>Provvedimento</th><th>Data provvedimento</th><th>Codice richiesta</th><th>Tipo pratica</th><th>Note Usmaf</th><th>Invio SUD</th></tr></thead>
+    <tbody>${rows}</tbody>
+  </table>
+  ${PAGE_FILLER}
+</body>
+</html>`;
+}
+
+function hasSessionCookie(req: http.IncomingMessage): boolean {
+  return (req.headers.cookie || '').split(';').some(part => part.trim().startsWith(`${MOCK_SESSION_COOKIE}=`));
+}
+
+function readBody(req: http.IncomingMessage): Promise<string> {
+  return new Promise((resolve, reject) => {
+    let body = '';
+    req.setEncoding('utf8');
+    req.on('data', (chunk: string) => { body += chunk; });
+    req.on('end', () => resolve(body));
+    req.on('error', reject);
+  });
+}
+
+/**
+ * Start the mock portal
+ */
+export function startMockPortal(options: MockPortalOptions = {}): Promise<MockPortal> {
+  const stats: MockPortalStats = { searchPages: 0, lookups: 0, rejected: 0, failed: 0 };
+  const submit = options.submit || 'button';
+  const latencyMs = options.latencyMs || 0;
+  const jitterMs = options.jitterMs || 0;
+  const errorRate = options.errorRate || 0;
+
+  /**
+   * Answer a lookup: result page, or (errorRate) a 503 page without results
+   */
+  const sendLookup = (res: http.ServerResponse, code: string): void => {
+    stats.lookups++;
+    const error = Math.random() < errorRate;
+    if (error) {
+      stats.failed++;
+    }
+    res.writeHead(error ? 503 : 200, { 'Content-Type': 'text/html; charset=utf-8' });
+    res.end(renderPage(code, submit, error));
+  };
+
+  const server = http.createServer(async (req, res) => {
+    const url = new URL(req.url || '/', 'http://localhost');
+
+    const delay = latencyMs + Math.random() * jitterMs;
+    if (delay > 0) {
+      await new Promise(resolve => setTimeout(resolve, delay));
+    }
+
+    // Search page: opens the session (like logging in on the real portal)
+    // In link mode a GET with a code is the lookup itself
+    if (req.method === 'GET' && (url.pathname === '/' || url.pathname === '/consultazione')) {
+      const code = url.searchParams.get(MOCK_CODE_FIELD);
+
+      if (submit === 'link' && code && hasSessionCookie(req)) {
+        sendLookup(res, code.trim());
+        return;
+      }
+
+      stats.searchPages++;
+      const headers: http.OutgoingHttpHeaders = { 'Content-Type': 'text/html; charset=utf-8' };
+      if (!hasSessionCookie(req)) {
+        headers['Set-Cookie'] = `${MOCK_SESSION_COOKIE}=${randomBytes(8).toString('hex')}; Path=/; HttpOnly`;
+      }
+      res.writeHead(200, headers);
+      res.end(renderPage(code, submit));
+      return;
+    }
+
+    // Form submission
+    if (req.method === 'POST' && url.pathname === '/consultazione') {
+      const params = new URLSearchParams(await readBody(req));
+
+      if (!hasSessionCookie(req) || params.get('token') !== MOCK_FORM_TOKEN) {
+        stats.rejected++;
+        res.writeHead(403, { 'Content-Type': 'text/plain' });
+        res.end('Sessione scaduta');
+        return;
+      }
+
+      sendLookup(res, (params.get(MOCK_CODE_FIELD) || '').trim());
+      return;
+    }
+
+    res.writeHead(404, { 'Content-Type': 'text/plain' });
+    res.end('Not found');
+  });
+
+  return new Promise((resolve, reject) => {
+    server.once('error', reject);
+    server.listen(options.port || 0, '127.0.0.1', () => {
+      const address = server.address();
+      const port = typeof address === 'object' && address ? address.port : options.port;
+      resolve({
+        url: `http://127.0.0.1:${port}`,
+        stats,
+        close: () => new Promise<void>(done => {
+          server.closeAllConnections();
+          server.close(() => done());
+        })
+      });
+    });
+  });
+}
+
+// Run standalone
+if (typeof require !== 'undefined' && require.main === module) {
+  const readArg = (name: string): string | undefined => {
+    const arg = process.argv.find(value => value.startsWith(`--${name}=`));
+    return arg ? arg.split('=')[1] : undefined;
+  };
+
+  startMockPortal({
+    port: Number(readArg('port') || 8080),
+    latencyMs: Number(readArg('latency') || 0),
+    jitterMs: Number(readArg('jitter') || 0),
+    errorRate: Number(readArg('error-rate') || 0),
+    submit: readArg('submit') === 'link' ? 'link' : 'button'
+  }).then(portal => {
+    console.log(`[MockPortal] Listening on ${portal.url}`);
+  });
+}
@@ -0,0 +1,192 @@
+/**
+ * End-to-end throughput benchmark of ProcessingOrchestrator against the mock portal
+ * Runs inside Electron: the real orchestrator, worker pool, rate controller and
+ * lookup engine process 100 / 1k / 10k codes on a hidden window showing the
+ * mock portal. Reports codes/s, memory and IPC messages sent to the renderer
+ * window, checks every result against the mock data and fails when throughput
+ * drops more than --tolerance below bench/orchestrator-baseline.json.
+ *
+ * Usage: npm run bench:e2e -- [--sizes=100,1000,10000] [--engine=dom|http] [--pool=1]
+ *        [--latency=0] [--jitter=0] [--error-rate=0] [--submit=button|link]
+ *        [--tolerance=0.2] [--update-baseline]
+ */
+
+import { app, BrowserWindow } from 'electron';
+import * as fs from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+import { startMockPortal, mockCellsForCode, MockPortalOptions, MockSubmitMode } from './mock-portal-server';
+import { processingOrchestrator } from '../main/workers/processor';
+import { LookupEngineType } from '../shared/types/processing-types';
+
+// Isolated userData: no cache, checkpoints, logs or traces of the real app are touched
+// (the orchestrator resolves its userData paths lazily, at the first run)
+app.setPath('userData', fs.mkdtempSync(path.join(os.tmpdir(), 'nsis-bench-')));
+
+const BASELINE_PATH = path.join(__dirname, '..', '..', 'bench', 'orchestrator-baseline.json');
+const MEMORY_SAMPLE_MS = 250;
+
+interface BenchResult {
+  key: string;
+  codes: number;
+  seconds: number;
+  codesPerSecond: number;
+  peakRssMb: number;
+  peakHeapMb: number;
+  appMemoryMb: number;
+  ipcMessages: number;
+  ipcPerCode: number;
+  mismatches: number;
+}
+
+type Baseline = Record<string, { codesPerSecond: number }>;
+
+function readArg(name: string, fallback: string): string {
+  const arg = process.argv.find(value => value.startsWith(`--${name}=`));
+  return arg ? arg.slice(name.length + 3) : fallback;
+}
+
+function loadBaseline(): Baseline {
+  try {
+    return JSON.parse(fs.readFileSync(BASELINE_PATH, 'utf8')) as Baseline;
+  } catch {
+    return {};
+  }
+}
+
+/**
+ * Process `count` codes with the real orchestrator and measure the run
+ */
+async function runCase(
+  key: string,
+  count: number,
+  portalOptions: MockPortalOptions,
+  engine: LookupEngineType,
+  poolSize: number
+): Promise<BenchResult> {
+  const portal = await startMockPortal(portalOptions);
+  const window = new BrowserWindow({
+    show: false,
+    width: 1280,
+    height: 720,
+    webPreferences: { partition: `bench-${Date.now()}`, contextIsolation: true, sandbox: true }
+  });
+
+  // Count every message main sends to the "renderer"
+  let ipcMessages = 0;
+  const send = window.webContents.send.bind(window.webContents);
+  window.webContents.send = (channel: string, ...args: unknown[]) => {
+    ipcMessages++;
+    send(channel, ...args);
+  };
+
+  await window.loadURL(`${portal.url}/`);
+  processingOrchestrator.setMainWindow(window);
+  processingOrchestrator.setWebViewContentsId(window.webContents.id);
+
+  const codes = Array.from({ length: count }, (_, i) => `2025/${String(i).padStart(6, '0')}`);
+
+  let peakRss = 0;
+  let peakHeap = 0;
+  const sampleMemory = () => {
+    const usage = process.memoryUsage();
+    peakRss = Math.max(peakRss, usage.rss);
+    peakHeap = Math.max(peakHeap, usage.heapUsed);
+  };
+  const sampler = setInterval(sampleMemory, MEMORY_SAMPLE_MS);
+
+  const start = process.hrtime.bigint();
+  const results = await processingOrchestrator.startProcessing(codes, { poolSize, engine, forceRefresh: true });
+  const seconds = Number(process.hrtime.bigint() - start) / 1e9;
+
+  clearInterval(sampler);
+  sampleMemory();
+
+  // Main + windows (workingSetSize is in KB)
+  const appMemoryKb = app.getAppMetrics().reduce((sum, metric) => sum + metric.memory.workingSetSize, 0);
+
+  let mismatches = Math.max(0, codes.length - results.length);
+  for (const result of results) {
+    if (result.Stato !== mockCellsForCode(result['Input Code'])[2]) {
+      mismatches++;
+    }
+  }
+
+  window.destroy();
+  await portal.close();
+
+  return {
+    key,
+    codes: count,
+    seconds,
+    codesPerSecond: count / seconds,
+    peakRssMb: peakRss / 1024 / 1024,
+    peakHeapMb: peakHeap / 1024 / 1024,
+    appMemoryMb: appMemoryKb / 1024,
+    ipcMessages,
+    ipcPerCode: ipcMessages / count,
+    mismatches
+  };
+}
+
+async function main(): Promise<number> {
+  const sizes = readArg('sizes', '100,1000,10000').split(',').map(Number).filter(size => size > 0);
+  const engine: LookupEngineType = readArg('engine', 'dom') === 'http' ? 'http' : 'dom';
+  const poolSize = Number(readArg('pool', '1'));
+  const tolerance = Number(readArg('tolerance', '0.2'));
+  const updateBaseline = process.argv.includes('--update-baseline');
+
+  const portalOptions: MockPortalOptions = {
+    latencyMs: Number(readArg('latency', '0')),
+    jitterMs: Number(readArg('jitter', '0')),
+    errorRate: Number(readArg('error-rate', '0')),
+    submit: readArg('submit', 'button') as MockSubmitMode
+  };
+
+  const baseline = loadBaseline();
+  const scenario = `${engine}-pool${poolSize}-${portalOptions.submit}` +
+    `-lat${portalOptions.latencyMs}-err${portalOptions.errorRate}`;
+
+  let failed = false;
+  for (const size of sizes) {
+    const key = `${scenario}-${size}`;
+    const result = await runCase(key, size, portalOptions, engine, poolSize);
+
+    console.log(`[Bench E2E] ${key}`);
+    console.log(`[Bench E2E]   ${result.codesPerSecond.toFixed(2)} codici/s (${result.seconds.toFixed(1)}s)`);
+    console.log(`[Bench E2E]   memoria: RSS main ${result.peakRssMb.toFixed(0)} MB, heap ${result.peakHeapMb.toFixed(0)} MB, app ${result.appMemoryMb.toFixed(0)} MB`);
+    console.log(`[Bench E2E]   IPC: ${result.ipcMessages} messaggi (${result.ipcPerCode.toFixed(2)} per codice)`);
+
+    if (result.mismatches > 0) {
+      console.log(`[Bench E2E]   ✗ ${result.mismatches} risultati errati o mancanti`);
+      failed = true;
+    }
+
+    const reference = baseline[key];
+    if (updateBaseline) {
+      baseline[key] = { codesPerSecond: Math.round(result.codesPerSecond * 100) / 100 };
+    } else if (!reference) {
+      console.log('[Bench E2E]   nessun riferimento (usa --update-baseline per registrarlo)');
+    } else if (result.codesPerSecond < reference.codesPerSecond * (1 - tolerance)) {
+      console.log(`[Bench E2E]   ✗ regressione: ${result.codesPerSecond.toFixed(2)} < ${reference.codesPerSecond} codici/s (-${Math.round(tolerance * 100)}%)`);
+      failed = true;
+    } else {
+      console.log(`[Bench E2E]   ✓ riferimento ${reference.codesPerSecond} codici/s`);
+    }
+  }
+
+  if (updateBaseline) {
+    fs.writeFileSync(BASELINE_PATH, JSON.stringify(baseline, null, 2) + '\n', 'utf8');
+    console.log(`[Bench E2E] Riferimenti aggiornati in ${BASELINE_PATH}`);
+  }
+
+  return failed ? 1 : 0;
+}
+
+app.whenReady()
+  .then(main)
+  .then(code => app.exit(code))
+  .catch(error => {
+    console.error('[Bench E2E] Errore:', error);
+    app.exit(1);
+  });
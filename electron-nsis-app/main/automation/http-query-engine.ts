@@ -0,0 +1,452 @@
+/**
+ * Direct HTTP lookup engine for NSIS state checking
+ * Sends the consultation form request directly (reusing the webview session's
+ * cookies) and parses the results table from the streamed HTML response,
+ * without typing, clicking or scraping the DOM.
+ */
+
+import * as http from 'http';
+import * as https from 'https';
+import type { Session, WebContents } from 'electron';
+import { FETCH_TIMEOUT_MS } from '../../shared/constants/config';
+import {
+  FetchResult, LookupEngine, RetryPolicy, TraceScope, fixedRetryPolicy, noopTrace
+} from './lookup-engine';
+import { ResultTableParser } from './result-table-parser';
+
+const MAX_REDIRECTS = 5;
+
+/**
+ * Description of the consultation form as found on the page
+ */
+export interface HttpFormSpec {
+  action: string;
+  method: 'GET' | 'POST';
+  codeField: string;
+  fields: Array<[string, string]>;
+}
+
+/**
+ * Cookie storage used for the direct requests
+ */
+export interface CookieSource {
+  getCookieHeader(url: string): Promise<string>;
+  storeSetCookies(url: string, setCookies: string[]): Promise<void>;
+}
+
+interface ParsedSetCookie {
+  name: string;
+  value: string;
+  domain?: string;
+  path: string;
+  secure: boolean;
+  httpOnly: boolean;
+  sameSite?: 'no_restriction' | 'lax' | 'strict';
+  /** Seconds since the epoch; undefined for session cookies */
+  expirationDate?: number;
+}
+
+/**
+ * Parse a Set-Cookie header with its attributes (RFC 6265 section 5.2)
+ * Returns null for malformed headers.
+ */
+function parseSetCookie(header: string, requestUrl: URL): ParsedSetCookie | null {
+  const [pair, ...attributes] = header.split(';');
+  const separator = pair.indexOf('=');
+  if (separator <= 0) {
+    return null;
+  }
+
+  // Default path: the request path up to its last "/"
+  const lastSlash = requestUrl.pathname.lastIndexOf('/');
+  const cookie: ParsedSetCookie = {
+    name: pair.slice(0, separator).trim(),
+    value: pair.slice(separator + 1).trim(),
+    path: lastSlash > 0 ? requestUrl.pathname.slice(0, lastSlash) : '/',
+    secure: false,
+    httpOnly: false
+  };
+
+  let maxAge: number | undefined;
+  let expires: number | undefined;
+
+  for (const attribute of attributes) {
+    const equals = attribute.indexOf('=');
+    const key = (equals === -1 ? attribute : attribute.slice(0, equals)).trim().toLowerCase();
+    const value = equals === -1 ? '' : attribute.slice(equals + 1).trim();
+
+    switch (key) {
+      case 'domain':
+        if (value) cookie.domain = value.replace(/^\./, '').toLowerCase();
+        break;
+      case 'path':
+        if (value.startsWith('/')) cookie.path = value;
+        break;
+      case 'secure':
+        cookie.secure = true;
+        break;
+      case 'httponly':
+        cookie.httpOnly = true;
+        break;
+      case 'samesite': {
+        const sameSite = value.toLowerCase();
+        cookie.sameSite = sameSite === 'none' ? 'no_restriction' : sameSite === 'lax' || sameSite === 'strict' ? sameSite : undefined;
+        break;
+      }
+      case 'max-age':
+        if (/^-?\d+$/.test(value)) maxAge = Number(value);
+        break;
+      case 'expires': {
+        const time = Date.parse(value);
+        if (!isNaN(time)) expires = time / 1000;
+        break;
+      }
+    }
+  }
+
+  // Max-Age takes precedence over Expires
+  if (maxAge !== undefined) {
+    cookie.expirationDate = Date.now() / 1000 + maxAge;
+  } else if (expires !== undefined) {
+    cookie.expirationDate = expires;
+  }
+
+  return cookie;
+}
+
+/**
+ * Cookies from an Electron session (the logged-in webview partition)
+ */
+export class SessionCookieSource implements CookieSource {
+  constructor(private readonly session: Session) {}
+
+  async getCookieHeader(url: string): Promise<string> {
+    const cookies = await this.session.cookies.get({ url });
+    return cookies.map(cookie => `${cookie.name}=${cookie.value}`).join('; ');
+  }
+
+  async storeSetCookies(url: string, setCookies: string[]): Promise<void> {
+    const requestUrl = new URL(url);
+
+    for (const header of setCookies) {
+      const cookie = parseSetCookie(header, requestUrl);
+      if (!cookie) continue;
+
+      // Scope the cookie to its own path, not to the request URL
+      const cookieUrl = `${requestUrl.origin}${cookie.path}`;
+
+      try {
+        if (cookie.expirationDate !== undefined && cookie.expirationDate <= Date.now() / 1000) {
+          // Expired cookie: the server is deleting it
+          await this.session.cookies.remove(cookieUrl, cookie.name);
+          continue;
+        }
+
+        await this.session.cookies.set({
+          url: cookieUrl,
+          name: cookie.name,
+          value: cookie.value,
+          domain: cookie.domain,
+          path: cookie.path,
+          secure: cookie.secure,
+          httpOnly: cookie.httpOnly,
+          sameSite: cookie.sameSite,
+          expirationDate: cookie.expirationDate
+        });
+      } catch (error) {
+        console.warn(`[HTTP Engine] Session rejected cookie ${cookie.name}:`, error);
+      }
+    }
+  }
+}
+
+/**
+ * In-memory cookie jar (offline benchmarks against the mock portal)
+ */
+export class MemoryCookieSource implements CookieSource {
+  private cookies: Map<string, string> = new Map();
+
+  async getCookieHeader(_url: string): Promise<string> {
+    return Array.from(this.cookies.entries()).map(([name, value]) => `${name}=${value}`).join('; ');
+  }
+
+  async storeSetCookies(_url: string, setCookies: string[]): Promise<void> {
+    for (const header of setCookies) {
+      const [pair] = header.split(';');
+      const separator = pair.indexOf('=');
+      if (separator > 0) {
+        this.cookies.set(pair.slice(0, separator).trim(), pair.slice(separator + 1).trim());
+      }
+    }
+  }
+}
+
+interface HttpResponseResult {
+  status: number;
+  location?: string;
+  cells: string[] | null;
+  foundTable: boolean;
+}
+
+export class HttpQueryEngine implements LookupEngine {
+  private httpAgent: http.Agent;
+  private httpsAgent: https.Agent;
+
+  constructor(
+    private readonly form: HttpFormSpec,
+    private readonly cookies: CookieSource,
+    private readonly headers: Record<string, string> = {},
+    maxSockets: number = 4
+  ) {
+    // Keep-alive agents: consecutive lookups reuse the same connections
+    this.httpAgent = new http.Agent({ keepAlive: true, maxSockets });
+    this.httpsAgent = new https.Agent({ keepAlive: true, maxSockets });
+  }
+
+  /**
+   * Build an engine from the consultation form currently shown in a webview,
+   * reusing its session cookies, user agent and referer
+   */
+  static async fromWebContents(webContents: WebContents, maxSockets: number = 4): Promise<HttpQueryEngine> {
+    const form: HttpFormSpec | null = await webContents.executeJavaScript(`
+      (function() {
+        var selectors = [
+          'input[type="text"]',
+          'input[name*="codice"]',
+          'input[id*="codice"]',
+          'input[placeholder*="codice"]'
+        ];
+
+        for (var i = 0; i < selectors.length; i++) {
+          var input = document.querySelector(selectors[i]);
+          if (!input || !input.form || !input.name) continue;
+
+          var form = input.form;
+          var fields = [];
+          new FormData(form).forEach(function(value, name) {
+            if (name !== input.name && typeof value === 'string') {
+              fields.push([name, value]);
+            }
+          });
+
+          // Named submit buttons are part of the submitted form data
+          var buttons = form.querySelectorAll('button[name], input[type="submit"][name]');
+          for (var j = 0; j < buttons.length; j++) {
+            var text = (buttons[j].textContent || buttons[j].value || '').toLowerCase();
+            if (text.includes('cerca') || text.includes('search') || text.includes('invia')) {
+              fields.push([buttons[j].name, buttons[j].value || '']);
+              break;
+            }
+          }
+
+          return {
+            action: form.action,
+            method: (form.method || 'get').toUpperCase() === 'POST' ? 'POST' : 'GET',
+            codeField: input.name,
+            fields: fields
+          };
+        }
+
+        return null;
+      })();
+    `);
+
+    if (!form) {
+      throw new Error('Form di consultazione non trovato nella pagina (usa il motore DOM)');
+    }
+
+    console.log(`[HTTP Engine] Using form ${form.method} ${form.action} (campo: ${form.codeField})`);
+
+    return new HttpQueryEngine(
+      form,
+      new SessionCookieSource(webContents.session),
+      {
+        'User-Agent': webContents.getUserAgent(),
+        'Referer': webContents.getURL()
+      },
+      maxSockets
+    );
+  }
+
+  /**
+   * Fetch state for a specific code
+   */
+  async fetchStateForCode(
+    code: string,
+    retry: RetryPolicy = fixedRetryPolicy,
+    trace: TraceScope = noopTrace
+  ): Promise<FetchResult> {
+    let lastError = 'Unknown error';
+    let attempts = 0;
+
+    for (let attempt = 0; attempt <= retry.maxRetries(); attempt++) {
+      if (attempt > 0) {
+        await trace.span('backoff', () => retry.backoff(attempt));
+      }
+
+      attempts++;
+      const startedAt = Date.now();
+      let cells: string[] | null = null;
+
+      try {
+        cells = await trace.span('request', () => this.query(code));
+        lastError = !cells ? 'Results table not found' : cells.length === 0 ? 'No results found' : lastError;
+      } catch (error) {
+        lastError = error instanceof Error ? error.message : 'Unknown error';
+        console.error(`[HTTP Engine] Error on attempt ${attempt + 1} for ${code}:`, lastError);
+      }
+
+      // Request errors and pages without the results table count against the portal
+      retry.recordAttempt(Date.now() - startedAt, cells === null);
+
+      if (cells && cells.length > 0) {
+        return {
+          success: true,
+          code: code,
+          state: cells[2] || 'SCONOSCIUTO',
+          cells: cells
+        };
+      }
+    }
+
+    return {
+      success: false,
+      code: code,
+      error: `Failed after ${attempts} attempts: ${lastError}`
+    };
+  }
+
+  /**
+   * Submit the form for a code, following redirects (POST-redirect-GET)
+   */
+  private async query(code: string): Promise<string[] | null> {
+    const params = new URLSearchParams(this.form.fields);
+    params.set(this.form.codeField, code);
+
+    let url = new URL(this.form.action);
+    let method = this.form.method;
+    let body: string | null = null;
+
+    if (method === 'POST') {
+      body = params.toString();
+    } else {
+      params.forEach((value, name) => url.searchParams.set(name, value));
+    }
+
+    for (let redirects = 0; redirects <= MAX_REDIRECTS; redirects++) {
+      const response = await this.request(url, method, body);
+
+      if (response.status >= 300 && response.status < 400 && response.location) {
+        url = new URL(response.location, url);
+        method = 'GET';
+        body = null;
+        continue;
+      }
+
+      if (response.status !== 200) {
+        throw new Error(`HTTP ${response.status}`);
+      }
+
+      if (!response.foundTable) {
+        return null;
+      }
+      return response.cells || [];
+    }
+
+    throw new Error('Too many redirects');
+  }
+
+  /**
+   * Send one request and stream the response body through the table parser
+   * Resolves as soon as the first result row is complete.
+   */
+  private async request(url: URL, method: string, body: string | null): Promise<HttpResponseResult> {
+    const cookieHeader = await this.cookies.getCookieHeader(url.toString());
+    const isHttps = url.protocol === 'https:';
+
+    const headers: Record<string, string> = {
+      'Accept': 'text/html,application/xhtml+xml',
+      ...this.headers
+    };
+    if (cookieHeader) {
+      headers['Cookie'] = cookieHeader;
+    }
+    if (body !== null) {
+      headers['Content-Type'] = 'application/x-www-form-urlencoded';
+      headers['Content-Length'] = String(Buffer.byteLength(body));
+    }
+
+    const transport = isHttps ? https : http;
+
+    const { result, setCookies } = await new Promise<{ result: HttpResponseResult; setCookies: string[] }>((resolve, reject) => {
+      const req = transport.request(url, {
+        method,
+        headers,
+        agent: isHttps ? this.httpsAgent : this.httpAgent
+      }, (res) => {
+        const setCookies = res.headers['set-cookie'] || [];
+        const status = res.statusCode || 0;
+
+        if (status !== 200) {
+          res.resume();
+          resolve({
+            result: { status, location: res.headers.location, cells: null, foundTable: false },
+            setCookies
+          });
+          return;
+        }
+
+        const contentType = String(res.headers['content-type'] || '').toLowerCase();
+        res.setEncoding(/charset=(iso-8859-1|latin1|windows-1252)/.test(contentType) ? 'latin1' : 'utf8');
+
+        const parser = new ResultTableParser();
+        let resolved = false;
+        const finish = () => {
+          if (resolved) return;
+          resolved = true;
+          parser.end();
+          resolve({
+            result: { status, cells: parser.getCells(), foundTable: parser.foundTable() },
+            setCookies
+          });
+        };
+
+        res.on('data', (chunk: string) => {
+          if (resolved) return;
+          parser.write(chunk);
+          if (parser.isComplete()) {
+            // Row found - resolve now, the rest of the page is only drained
+            // so the keep-alive connection can be reused
+            finish();
+          }
+        });
+        res.on('end', finish);
+        res.on('error', reject);
+      });
+
+      req.setTimeout(FETCH_TIMEOUT_MS, () => {
+        req.destroy(new Error(`Timeout after ${FETCH_TIMEOUT_MS}ms`));
+      });
+      req.on('error', reject);
+
+      if (body !== null) {
+        req.write(body);
+      }
+      req.end();
+    });
+
+    if (setCookies.length > 0) {
+      await this.cookies.storeSetCookies(url.toString(), setCookies);
+    }
+
+    return result;
+  }
+
+  /**
+   * Cleanup: close keep-alive connections
+   */
+  async cleanup(): Promise<void> {
+    this.httpAgent.destroy();
+    this.httpsAgent.destroy();
+  }
+}
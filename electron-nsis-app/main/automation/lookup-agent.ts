@@ -0,0 +1,250 @@
+/**
+ * Resident in-page lookup agent for the DOM engine
+ * Installed once per document as window.__nsisLookupAgent: the search input,
+ * the search control (submit button or "Cerca" link) and the results table are
+ * resolved once and cached, and lookup(code) submits the search with a
+ * same-document fetch() instead of a click + page navigation. The fetched
+ * result page is parsed in place; its result rows and hidden form fields
+ * (session tokens) are copied into the live page so the webview stays in sync.
+ *
+ * Pages the agent cannot drive (no form or link, cross-origin action) report
+ * 'unsupported' and the engine falls back to typing and clicking.
+ */
+
+export const LOOKUP_AGENT_VERSION = 1;
+
+export type AgentLookupStatus = 'ok' | 'no-results' | 'no-table' | 'error' | 'unsupported';
+
+export interface AgentLookupResult {
+  status: AgentLookupStatus;
+  cells?: string[];
+  mode?: 'form' | 'link';
+  error?: string;
+}
+
+/**
+ * In-page cellsOf(row): texts of the row's own cells
+ * Shared by the agent (fetched, unrendered documents) and the DOM fallback
+ * (live page) so both store the same strings. Mirrors normalizeCellText of
+ * the HTTP engine's parser: <br>/<p>/<div>/<li> are line breaks, other
+ * whitespace runs collapse to one space, nested tables only add text.
+ */
+export const CELLS_OF_SCRIPT = `
+  function cellsOf(row) {
+    var LINE_BREAKS = { BR: true, P: true, DIV: true, LI: true };
+    var RAW_TEXT = { SCRIPT: true, STYLE: true, TEXTAREA: true, TITLE: true };
+
+    function rawText(node) {
+      if (node.nodeType === 3) return node.nodeValue.replace(/\\n/g, ' ');
+      if (node.nodeType !== 1 || RAW_TEXT[node.tagName]) return '';
+      var text = '';
+      for (var child = node.firstChild; child; child = child.nextSibling) {
+        text += rawText(child);
+      }
+      return LINE_BREAKS[node.tagName] ? '\\n' + text + '\\n' : text;
+    }
+
+    function normalize(raw) {
+      return raw.split('\\n')
+        .map(function(line) { return line.replace(/[ \\t\\r\\f]+/g, ' ').trim(); })
+        .filter(function(line) { return line.length > 0; })
+        .join('\\n');
+    }
+
+    var texts = [];
+    for (var i = 0; i < row.children.length; i++) {
+      if (row.children[i].tagName === 'TD') texts.push(normalize(rawText(row.children[i])));
+    }
+    return texts;
+  }
+`;
+
+/**
+ * Expression calling the agent; resolves to null when it is not installed
+ */
+export function agentLookupCall(code: string, timeoutMs: number): string {
+  return `(window.__nsisLookupAgent && window.__nsisLookupAgent.version === ${LOOKUP_AGENT_VERSION})
+    ? window.__nsisLookupAgent.lookup(${JSON.stringify(code)}, ${timeoutMs})
+    : null`;
+}
+
+/**
+ * Script installing the agent in the current document (idempotent)
+ */
+export function buildLookupAgentScript(rowSelector: string): string {
+  return `
+    (function() {
+      if (window.__nsisLookupAgent && window.__nsisLookupAgent.version === ${LOOKUP_AGENT_VERSION}) {
+        return true;
+      }
+
+      var ROW_SELECTOR = ${JSON.stringify(rowSelector)};
+      var INPUT_SELECTORS = [
+        'input[type="text"]',
+        'input[name*="codice"]',
+        'input[id*="codice"]',
+        'input[placeholder*="codice"]'
+      ];
+      var SEARCH_WORDS = ['cerca', 'search', 'invia', 'submit'];
+
+      var cache = { input: null, control: null };
+
+      function isLive(el) {
+        return !!el && el.isConnected;
+      }
+
+      // Cached elements are re-resolved only if the page replaced them
+      function resolveInput() {
+        if (isLive(cache.input)) return cache.input;
+        cache.input = null;
+        for (var i = 0; i < INPUT_SELECTORS.length; i++) {
+          var input = document.querySelector(INPUT_SELECTORS[i]);
+          if (input) {
+            cache.input = input;
+            break;
+          }
+        }
+        return cache.input;
+      }
+
+      function resolveControl() {
+        if (isLive(cache.control)) return cache.control;
+        cache.control = null;
+        var elements = document.querySelectorAll('button, input[type="submit"], .btn, a');
+        for (var i = 0; i < elements.length; i++) {
+          var text = (elements[i].textContent || elements[i].value || '').toLowerCase();
+          for (var j = 0; j < SEARCH_WORDS.length; j++) {
+            if (text.indexOf(SEARCH_WORDS[j]) !== -1) {
+              cache.control = elements[i];
+              return cache.control;
+            }
+          }
+        }
+        return null;
+      }
+
+      ${CELLS_OF_SCRIPT}
+
+      // Build the request the browser would send for the control
+      function buildRequest(input, control) {
+        if (control.tagName.toLowerCase() === 'a') {
+          if (!control.href || control.href.indexOf('javascript:') === 0) return null;
+          return { mode: 'link', url: control.href, init: { method: 'GET' } };
+        }
+
+        var form = control.form || input.form;
+        if (!form) return null;
+
+        // A submit button may override the form's action, method and encoding
+        var submitter = control.form === form ? control : null;
+        var overrides = function(name) { return !!submitter && submitter.hasAttribute(name); };
+        var action = overrides('formaction') ? submitter.formAction : form.action;
+        var method = (overrides('formmethod') ? submitter.formMethod : form.method || 'get').toUpperCase();
+        var enctype = overrides('formenctype') ? submitter.formEnctype : form.enctype;
+        if (method !== 'GET' && method !== 'POST') return null;
+
+        var data;
+        try {
+          data = submitter && control.name ? new FormData(form, control) : new FormData(form);
+        } catch (e) {
+          data = new FormData(form);
+        }
+
+        var url = new URL(action || location.href, location.href);
+        if (method === 'GET') {
+          // The form fields replace the action's query string
+          url.search = new URLSearchParams(data).toString();
+          return { mode: 'form', url: url.href, init: { method: 'GET' } };
+        }
+
+        var body;
+        if (enctype === 'multipart/form-data') {
+          body = data;
+        } else if (enctype === 'text/plain') {
+          body = '';
+          data.forEach(function(value, name) { body += name + '=' + value + '\\r\\n'; });
+        } else {
+          body = new URLSearchParams(data);
+        }
+        return { mode: 'form', url: url.href, init: { method: 'POST', body: body } };
+      }
+
+      // Copy the fetched results and refreshed hidden fields into the live page
+      function syncPage(doc, row, input) {
+        var fetchedTable = row ? row.closest('table') : null;
+        var liveTable = fetchedTable && fetchedTable.id ? document.getElementById(fetchedTable.id) : null;
+        var fetchedBody = fetchedTable ? fetchedTable.querySelector('tbody') : null;
+        var liveBody = liveTable ? liveTable.querySelector('tbody') : null;
+        if (fetchedBody && liveBody) {
+          liveBody.innerHTML = fetchedBody.innerHTML;
+        }
+
+        var form = input.form;
+        if (!form) return;
+        doc.querySelectorAll('input[type="hidden"][name]').forEach(function(hidden) {
+          var field = form.elements.namedItem(hidden.name);
+          if (field && field.type === 'hidden') field.value = hidden.value;
+        });
+      }
+
+      function lookup(code, timeoutMs) {
+        var input = resolveInput();
+        var control = resolveControl();
+        if (!input || !control) {
+          return Promise.resolve({ status: 'unsupported', error: 'Campo o pulsante di ricerca non trovato' });
+        }
+
+        input.value = code;
+        input.dispatchEvent(new Event('input', { bubbles: true }));
+        input.dispatchEvent(new Event('change', { bubbles: true }));
+
+        var request = buildRequest(input, control);
+        if (!request) {
+          return Promise.resolve({ status: 'unsupported', error: 'Ricerca senza form o link' });
+        }
+        if (new URL(request.url).origin !== location.origin) {
+          return Promise.resolve({ status: 'unsupported', error: 'Ricerca su un altro dominio' });
+        }
+
+        var controller = new AbortController();
+        var timer = setTimeout(function() { controller.abort(); }, timeoutMs);
+        request.init.credentials = 'same-origin';
+        request.init.signal = controller.signal;
+
+        return fetch(request.url, request.init)
+          .then(function(response) {
+            return response.text().then(function(html) {
+              return { status: response.status, html: html };
+            });
+          })
+          .then(function(page) {
+            var doc = new DOMParser().parseFromString(page.html, 'text/html');
+            var row = doc.querySelector(ROW_SELECTOR);
+            syncPage(doc, row, input);
+
+            if (!row) {
+              return {
+                status: page.status >= 400 ? 'error' : 'no-table',
+                mode: request.mode,
+                error: page.status >= 400 ? 'HTTP ' + page.status : undefined
+              };
+            }
+
+            var cells = cellsOf(row);
+            return { status: cells.length > 0 ? 'ok' : 'no-results', mode: request.mode, cells: cells };
+          })
+          .catch(function(error) {
+            return { status: 'error', mode: request.mode, error: String(error && error.message || error) };
+          })
+          .then(function(result) {
+            clearTimeout(timer);
+            return result;
+          });
+      }
+
+      window.__nsisLookupAgent = { version: ${LOOKUP_AGENT_VERSION}, lookup: lookup };
+      console.log('[NSIS Lookup Agent] Installed');
+      return true;
+    })();
+  `;
+}
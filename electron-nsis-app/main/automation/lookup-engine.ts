@@ -0,0 +1,100 @@
+/**
+ * Common interface shared by the code lookup engines (DOM automation, direct HTTP)
+ */
+
+import { ProcessingResult } from '../../shared/types/excel-types';
+import { MAX_RETRIES, DELAY_BETWEEN_RETRIES } from '../../shared/constants/config';
+
+export interface FetchResult {
+  success: boolean;
+  code: string;
+  state?: string;
+  cells?: string[];
+  error?: string;
+  /** The portal answered with its results table but no result row */
+  noResults?: boolean;
+}
+
+/**
+ * Retry behaviour of fetchStateForCode
+ * The engines time every attempt and report it, so a shared policy
+ * (see RateController) can adapt retries and backoff to the portal's health.
+ */
+export interface RetryPolicy {
+  /**
+   * Retries allowed after the first attempt (re-read before every retry)
+   */
+  maxRetries(): number;
+
+  /**
+   * Wait before retry number `attempt` (1-based)
+   */
+  backoff(attempt: number): Promise<void>;
+
+  /**
+   * Report the outcome of one attempt
+   * transportFailure: timeout, navigation or HTTP error, or no results table
+   * on the page. A results page without rows is a healthy response.
+   */
+  recordAttempt(latencyMs: number, transportFailure: boolean): void;
+}
+
+/**
+ * Fixed policy: MAX_RETRIES retries, DELAY_BETWEEN_RETRIES apart
+ */
+export const fixedRetryPolicy: RetryPolicy = {
+  maxRetries: () => MAX_RETRIES,
+  backoff: () => new Promise(resolve => setTimeout(resolve, DELAY_BETWEEN_RETRIES)),
+  recordAttempt: () => undefined
+};
+
+/**
+ * Per-stage span recorder for one code (see RunTracer)
+ */
+export interface TraceScope {
+  /**
+   * Time an async stage of the lookup
+   */
+  span<T>(stage: string, fn: () => Promise<T>): Promise<T>;
+}
+
+/**
+ * Scope that records nothing (engines used outside a traced run)
+ */
+export const noopTrace: TraceScope = {
+  span: (_stage, fn) => fn()
+};
+
+export interface LookupEngine {
+  /**
+   * Fetch the result row cells for a specific code
+   */
+  fetchStateForCode(code: string, retry?: RetryPolicy, trace?: TraceScope): Promise<FetchResult>;
+
+  /**
+   * Release engine resources
+   */
+  cleanup(): Promise<void>;
+}
+
+/**
+ * Parse cells into ProcessingResult
+ */
+export function parseCellsToResult(code: string, cells: string[]): ProcessingResult {
+  // Map cells to result structure
+  // Based on Python worker.py logic - CORRECT indices!
+  return {
+    'Input Code': code,
+    'Taric': cells[0] || '',                         // Index 0 - Codice TARIC
+    'Stato': cells[2] || '',                         // Index 2 - Stato
+    'Protocollo ingresso': cells[3] || '',          // Index 3 - Protocollo ingresso
+    'Inserita il': cells[4] || '',                   // Index 4 - Inserita il
+    'Protocollo uscita': cells[5] || '',            // Index 5 - Protocollo uscita (FIXED!)
+    'Provvedimento': cells[6] || '',                 // Index 6 - Provvedimento (FIXED!)
+    'Data Provvedimento': cells[7] || '',            // Index 7 - Data provvedimento (FIXED!)
+    'Codice richiesta (risultato)': cells[8] || code, // Index 8 - Codice richiesta (FIXED! Fallback to input code)
+    'Tipo pratica': cells[9] || '',                  // Index 9 - Tipo pratica
+    'Note Usmaf': cells[10] || '',                   // Index 10 - Note Usmaf (FIXED!)
+    'Invio SUD': cells[11] || ''                     // Index 11 - Invio SUD
+  };
+}
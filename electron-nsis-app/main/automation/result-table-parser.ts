@@ -0,0 +1,269 @@
+/**
+ * Streaming HTML parser for the NSIS results table
+ * Extracts the first body row of #risultatiConsultazionePratica as cell texts,
+ * chunk by chunk, without building a DOM. Stops as soon as the row is complete.
+ */
+
+const NAMED_ENTITIES: Record<string, string> = {
+  amp: '&', lt: '<', gt: '>', quot: '"', apos: "'", nbsp: '\u00a0',
+  agrave: 'à', aacute: 'á', egrave: 'è', eacute: 'é', igrave: 'ì', iacute: 'í',
+  ograve: 'ò', oacute: 'ó', ugrave: 'ù', uacute: 'ú',
+  Agrave: 'À', Egrave: 'È', Eacute: 'É', Igrave: 'Ì', Ograve: 'Ò', Ugrave: 'Ù',
+  deg: '°', euro: '€', laquo: '«', raquo: '»', middot: '·', ndash: '–', mdash: '—'
+};
+
+const RAW_TEXT_TAGS = new Set(['script', 'style', 'textarea', 'title']);
+const LINE_BREAK_TAGS = new Set(['br', 'p', 'div', 'li', 'tr']);
+
+/**
+ * Decode HTML character references
+ */
+export function decodeHtmlEntities(text: string): string {
+  return text.replace(/&(#x[0-9a-f]+|#[0-9]+|[a-z]+);/gi, (match, entity: string) => {
+    if (entity[0] === '#') {
+      const codePoint = entity[1] === 'x' || entity[1] === 'X'
+        ? parseInt(entity.slice(2), 16)
+        : parseInt(entity.slice(1), 10);
+      return Number.isFinite(codePoint) && codePoint > 0 && codePoint <= 0x10ffff
+        ? String.fromCodePoint(codePoint)
+        : match;
+    }
+    return NAMED_ENTITIES[entity] !== undefined ? NAMED_ENTITIES[entity] : match;
+  });
+}
+
+/**
+ * Approximate element.innerText.trim() for a cell's raw text
+ * (whitespace runs collapse to one space, line breaks are kept)
+ */
+function normalizeCellText(raw: string): string {
+  return raw
+    .split('\n')
+    .map(line => line.replace(/[ \t\r\f]+/g, ' ').trim())
+    .filter(line => line.length > 0)
+    .join('\n')
+    .trim();
+}
+
+export class ResultTableParser {
+  private buffer: string = '';
+  private rawTextEnd: string | null = null;
+  private tableDepth: number = 0;
+  private section: string | null = null;
+  private inRow: boolean = false;
+  private cellText: string | null = null;
+  private cells: string[] = [];
+  private complete: boolean = false;
+  private found: boolean = false;
+
+  constructor(private readonly tableId: string = 'risultatiConsultazionePratica') {}
+
+  /**
+   * Feed the next chunk of HTML
+   */
+  write(chunk: string): void {
+    if (this.complete) {
+      return;
+    }
+
+    this.buffer += chunk;
+    let pos = 0;
+
+    while (pos < this.buffer.length && !this.complete) {
+      // Inside <script>/<style>: skip until the matching close tag
+      if (this.rawTextEnd) {
+        const end = this.buffer.toLowerCase().indexOf(this.rawTextEnd, pos);
+        if (end === -1) {
+          // Keep a tail in case the close tag is split across chunks
+          pos = Math.max(pos, this.buffer.length - this.rawTextEnd.length);
+          break;
+        }
+        pos = end;
+        this.rawTextEnd = null;
+        continue;
+      }
+
+      const lt = this.buffer.indexOf('<', pos);
+      if (lt === -1) {
+        // Text may continue in the next chunk (entities could be split)
+        break;
+      }
+
+      this.onText(this.buffer.slice(pos, lt));
+      pos = lt;
+
+      // Comments
+      if (this.buffer.startsWith('<!--', lt)) {
+        const end = this.buffer.indexOf('-->', lt + 4);
+        if (end === -1) break;
+        pos = end + 3;
+        continue;
+      }
+
+      const gt = this.findTagEnd(lt + 1);
+      if (gt === -1) break;
+
+      this.onTag(this.buffer.slice(lt + 1, gt));
+      pos = gt + 1;
+    }
+
+    this.buffer = this.buffer.slice(pos);
+  }
+
+  /**
+   * Signal end of input
+   */
+  end(): void {
+    if (!this.complete && this.buffer && !this.rawTextEnd) {
+      this.onText(this.buffer);
+    }
+    this.buffer = '';
+    if (this.inRow) {
+      this.closeRow();
+    }
+    this.complete = true;
+  }
+
+  /**
+   * True once the first row has been read (or the table closed without rows)
+   */
+  isComplete(): boolean {
+    return this.complete;
+  }
+
+  /**
+   * True if the results table was present in the document
+   */
+  foundTable(): boolean {
+    return this.found;
+  }
+
+  /**
+   * Cell texts of the first body row, or null if no row was found
+   */
+  getCells(): string[] | null {
+    return this.found && this.cells.length > 0 ? [...this.cells] : null;
+  }
+
+  /**
+   * Find the closing '>' of a tag, honoring quoted attribute values
+   */
+  private findTagEnd(from: number): number {
+    let quote: string | null = null;
+    for (let i = from; i < this.buffer.length; i++) {
+      const ch = this.buffer[i];
+      if (quote) {
+        if (ch === quote) quote = null;
+      } else if (ch === '"' || ch === "'") {
+        quote = ch;
+      } else if (ch === '>') {
+        return i;
+      }
+    }
+    return -1;
+  }
+
+  private onText(text: string): void {
+    if (this.cellText !== null && text) {
+      this.cellText += decodeHtmlEntities(text.replace(/\n/g, ' '));
+    }
+  }
+
+  private onTag(body: string): void {
+    const match = /^(\/?)([a-zA-Z][a-zA-Z0-9-]*)/.exec(body);
+    if (!match) {
+      return; // <!DOCTYPE>, <?xml ?> and similar
+    }
+
+    const isClose = match[1] === '/';
+    const name = match[2].toLowerCase();
+
+    if (!isClose && RAW_TEXT_TAGS.has(name) && !body.endsWith('/')) {
+      this.rawTextEnd = `</${name}`;
+      return;
+    }
+
+    // Still looking for the results table
+    if (this.tableDepth === 0) {
+      if (!isClose && name === 'table' && this.getAttribute(body, 'id') === this.tableId) {
+        this.found = true;
+        this.tableDepth = 1;
+      }
+      return;
+    }
+
+    if (name === 'table') {
+      this.tableDepth += isClose ? -1 : 1;
+      if (this.tableDepth === 0) {
+        // Results table closed without a complete body row
+        this.end();
+      }
+      return;
+    }
+
+    if (this.cellText !== null && LINE_BREAK_TAGS.has(name) && name !== 'tr') {
+      this.cellText += '\n';
+    }
+
+    // Nested tables only contribute text
+    if (this.tableDepth > 1) {
+      return;
+    }
+
+    switch (name) {
+      case 'thead':
+      case 'tbody':
+      case 'tfoot':
+        this.section = isClose ? null : name;
+        break;
+
+      case 'tr':
+        if (isClose) {
+          if (this.inRow) this.closeRow();
+        } else if (this.section !== 'thead' && this.section !== 'tfoot') {
+          if (this.inRow) {
+            this.closeRow();
+          } else {
+            this.inRow = true;
+            this.cells = [];
+          }
+        }
+        break;
+
+      case 'td':
+      case 'th':
+        if (!this.inRow) break;
+        this.closeCell();
+        if (!isClose && name === 'td') {
+          this.cellText = '';
+        }
+        break;
+    }
+  }
+
+  private closeCell(): void {
+    if (this.cellText !== null) {
+      this.cells.push(normalizeCellText(this.cellText));
+      this.cellText = null;
+    }
+  }
+
+  private closeRow(): void {
+    this.closeCell();
+    this.inRow = false;
+    this.complete = true;
+  }
+
+  private getAttribute(tagBody: string, attribute: string): string | null {
+    const attrRegex = /([^\s=/]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?/g;
+    const attrs = tagBody.replace(/^[a-zA-Z][a-zA-Z0-9-]*/, '');
+    let match: RegExpExecArray | null;
+
+    while ((match = attrRegex.exec(attrs)) !== null) {
+      if (match[1].toLowerCase() === attribute) {
+        return decodeHtmlEntities(match[2] ?? match[3] ?? match[4] ?? '');
+      }
+    }
+    return null;
+  }
+}
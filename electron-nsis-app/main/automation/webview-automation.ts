@@ -5,25 +5,27 @@
 
 import { webContents as allWebContents, WebContents } from 'electron';
 import {
-  URL_NSIS, STATO_SELECTOR, MAX_RETRIES,
-  DELAY_AFTER_INPUT_JS, DELAY_AFTER_CLICK_JS, DELAY_BETWEEN_RETRIES,
-  FETCH_CHECK_INTERVAL_MS
+  URL_NSIS, FETCH_TIMEOUT_MS, RESULTS_ROW_SELECTOR
 } from '../../shared/constants/config';
 import { ProcessingResult } from '../../shared/types/excel-types';
+import {
+  FetchResult, LookupEngine, RetryPolicy, TraceScope,
+  fixedRetryPolicy, noopTrace, parseCellsToResult
+} from './lookup-engine';
+import { AgentLookupResult, CELLS_OF_SCRIPT, agentLookupCall, buildLookupAgentScript } from './lookup-agent';
 
-export interface FetchResult {
-  success: boolean;
-  code: string;
-  state?: string;
-  cells?: string[];
-  error?: string;
-}
+export type { FetchResult } from './lookup-engine';
 
-export class WebViewAutomation {
+export class WebViewAutomation implements LookupEngine {
   private isInitialized: boolean = false;
   private webContentsId: number | null = null;
   private webContents: WebContents | null = null;
 
+  // Every new document gets the interceptor and the lookup agent again
+  private readonly onDomReady = (): void => {
+    void this.installPageScripts();
+  };
+
   /**
    * Get WebContents from stored ID
    */
@@ -72,8 +74,9 @@ export class WebViewAutomation {
       // Give a moment for the page to settle
       await this.sleep(500);
 
-      // Inject link click interceptor (in case it's needed)
-      await this.injectLinkInterceptor();
+      // Inject link click interceptor and lookup agent, and again after every navigation
+      await this.installPageScripts();
+      this.webContents.on('dom-ready', this.onDomReady);
 
       this.isInitialized = true;
       console.log('[WebView Automation] Initialization complete - using visible webview');
@@ -87,7 +90,11 @@ export class WebViewAutomation {
   /**
    * Fetch state for a specific code
    */
-  async fetchStateForCode(code: string): Promise<FetchResult> {
+  async fetchStateForCode(
+    code: string,
+    retry: RetryPolicy = fixedRetryPolicy,
+    trace: TraceScope = noopTrace
+  ): Promise<FetchResult> {
     if (!this.isInitialized) {
       return {
         success: false,
@@ -98,53 +105,128 @@ export class WebViewAutomation {
 
     console.log(`[WebView Automation] Fetching state for code: ${code}`);
 
-    for (let attempt = 0; attempt <= MAX_RETRIES; attempt++) {
-      try {
-        if (attempt > 0) {
-          console.log(`[WebView Automation] Retry attempt ${attempt} for code: ${code}`);
-          await this.sleep(DELAY_BETWEEN_RETRIES);
-        }
+    let attempts = 0;
+    for (let attempt = 0; attempt <= retry.maxRetries(); attempt++) {
+      if (attempt > 0) {
+        console.log(`[WebView Automation] Retry attempt ${attempt} for code: ${code}`);
+        await trace.span('backoff', () => retry.backoff(attempt));
+      }
 
-        // Step 1: Input code
-        const inputSuccess = await this.inputCode(code);
-        if (!inputSuccess) {
-          console.error('[WebView Automation] Failed to input code');
-          continue; // Retry
-        }
+      attempts++;
+      const startedAt = Date.now();
+      const result = await trace.span('attempt', () => this.attemptFetch(code, trace));
+      retry.recordAttempt(Date.now() - startedAt, !result.success && !result.noResults);
 
-        // Step 2: Wait before clicking
-        await this.sleep(DELAY_AFTER_INPUT_JS);
+      if (result.success) {
+        console.log(`[WebView Automation] Successfully fetched state for ${code}: ${result.state}`);
+        return result;
+      }
+    }
 
-        // Step 3: Click search button
-        const clickSuccess = await this.clickSearchButton();
-        if (!clickSuccess) {
-          console.error('[WebView Automation] Failed to click search button');
-          continue; // Retry
-        }
+    // All retries failed
+    return {
+      success: false,
+      code: code,
+      error: `Failed after ${attempts} attempts`
+    };
+  }
 
-        // Step 4: Wait for results
-        await this.sleep(DELAY_AFTER_CLICK_JS);
-        const result = await this.extractResults(code);
+  /**
+   * Single lookup attempt
+   * The resident agent submits in the same document; pages it cannot drive
+   * fall back to input code, submit, read the fresh result row.
+   */
+  private async attemptFetch(code: string, trace: TraceScope): Promise<FetchResult> {
+    try {
+      const agent = await trace.span('agent-lookup', () => this.lookupWithAgent(code));
+      if (agent.status !== 'unsupported') {
+        return this.agentToFetchResult(code, agent);
+      }
 
-        if (result.success) {
-          console.log(`[WebView Automation] Successfully fetched state for ${code}: ${result.state}`);
-          return result;
-        }
+      // Step 1: Input code (also marks the current result row as stale)
+      const inputSuccess = await trace.span('input', () => this.inputCode(code));
+      if (!inputSuccess) {
+        console.error('[WebView Automation] Failed to input code');
+        return { success: false, code: code, error: 'Failed to input code' };
+      }
 
-      } catch (error) {
-        const errorMessage = error instanceof Error ? error.message : 'Unknown error';
-        console.error(`[WebView Automation] Error on attempt ${attempt + 1}:`, errorMessage);
+      // Step 2: Click search button
+      const clickSuccess = await trace.span('click', () => this.clickSearchButton(trace));
+      if (!clickSuccess) {
+        console.error('[WebView Automation] Failed to click search button');
+        return { success: false, code: code, error: 'Failed to click search button' };
       }
+
+      // Step 3: Wait for the fresh result row and extract it in the same round-trip
+      return await trace.span('wait-results', () => this.extractResults(code));
+
+    } catch (error) {
+      const errorMessage = error instanceof Error ? error.message : 'Unknown error';
+      console.error(`[WebView Automation] Error fetching ${code}:`, errorMessage);
+      return { success: false, code: code, error: errorMessage };
     }
+  }
 
-    // All retries failed
+  /**
+   * Run one lookup through the in-page agent (installing it if the document lacks it)
+   */
+  private async lookupWithAgent(code: string): Promise<AgentLookupResult> {
+    const webContents = this.getWebContents();
+    const call = agentLookupCall(code, FETCH_TIMEOUT_MS);
+
+    let result: AgentLookupResult | null = await webContents.executeJavaScript(call);
+    if (result === null) {
+      await this.installLookupAgent();
+      result = await webContents.executeJavaScript(call);
+    }
+
+    return result || { status: 'unsupported', error: 'Lookup agent not available' };
+  }
+
+  /**
+   * Map an agent result to the engine result
+   */
+  private agentToFetchResult(code: string, agent: AgentLookupResult): FetchResult {
+    if (agent.status === 'ok' && agent.cells) {
+      return {
+        success: true,
+        code: code,
+        state: agent.cells[2] || 'SCONOSCIUTO',
+        cells: agent.cells
+      };
+    }
+
+    const errors: Record<string, string> = {
+      'no-results': 'No results found',
+      'no-table': 'Results table not found'
+    };
     return {
       success: false,
       code: code,
-      error: `Failed after ${MAX_RETRIES + 1} attempts`
+      error: agent.error || errors[agent.status] || 'Unknown error',
+      noResults: agent.status === 'no-results'
     };
   }
 
+  /**
+   * Install the per-document scripts: link interceptor and lookup agent
+   */
+  private async installPageScripts(): Promise<void> {
+    await this.injectLinkInterceptor();
+    await this.installLookupAgent();
+  }
+
+  /**
+   * Install the resident lookup agent in the current document
+   */
+  private async installLookupAgent(): Promise<void> {
+    try {
+      await this.getWebContents().executeJavaScript(buildLookupAgentScript(RESULTS_ROW_SELECTOR));
+    } catch (error) {
+      console.error('[WebView Automation] Error installing lookup agent:', error);
+    }
+  }
+
   /**
    * Input code into search field
    */
@@ -155,6 +237,11 @@ export class WebViewAutomation {
       // Try different selectors for input field
       const result = await webContents.executeJavaScript(`
         (function() {
+          // Remember the current result row so only a fresh one is accepted
+          var staleRow = document.querySelector(${JSON.stringify(RESULTS_ROW_SELECTOR)});
+          window.__nsis_stale_row = staleRow;
+          window.__nsis_stale_text = staleRow ? staleRow.innerText : null;
+
           var selectors = [
             'input[type="text"]',
             'input[name*="codice"]',
@@ -194,7 +281,7 @@ export class WebViewAutomation {
   /**
    * Click search button
    */
-  private async clickSearchButton(): Promise<boolean> {
+  private async clickSearchButton(trace: TraceScope = noopTrace): Promise<boolean> {
     try {
       const webContents = this.getWebContents();
 
@@ -238,13 +325,14 @@ export class WebViewAutomation {
       // Handle link navigation programmatically to avoid new windows
       if (result.type === 'link' && result.href) {
         console.log('[WebView Automation] Navigating to search link:', result.href);
-        const navigationPromise = this.waitForEvent('did-navigate');
-        await webContents.loadURL(result.href);
-        await navigationPromise;
-        await this.waitForEvent('did-stop-loading');
-
-        // Reinstall interceptor after navigation
-        await this.injectLinkInterceptor();
+        await trace.span('navigation', async () => {
+          const navigationPromise = this.waitForEvent('did-navigate');
+          await webContents.loadURL(result.href);
+          await navigationPromise;
+          await this.waitForEvent('did-stop-loading');
+        });
+
+        // Interceptor and agent are reinstalled on dom-ready
         return true;
       }
 
@@ -267,12 +355,9 @@ export class WebViewAutomation {
    */
   private async extractResults(code: string): Promise<FetchResult> {
     try {
-      const webContents = this.getWebContents();
-
-      // Wait for results table (with timeout)
-      const selectorExists = await this.waitForSelector('#risultatiConsultazionePratica tbody tr', 5000);
+      const cells = await this.waitForResultCells(code, FETCH_TIMEOUT_MS);
 
-      if (!selectorExists) {
+      if (!cells) {
         return {
           success: false,
           code: code,
@@ -280,27 +365,12 @@ export class WebViewAutomation {
         };
       }
 
-      // Extract all cells using JavaScript
-      const cells = await webContents.executeJavaScript(`
-        (function() {
-          var row = document.querySelector('#risultatiConsultazionePratica tbody tr');
-          if (!row) return null;
-
-          var tds = row.querySelectorAll('td');
-          var texts = [];
-          tds.forEach(function(td) {
-            texts.push(td.innerText.trim());
-          });
-
-          return texts;
-        })();
-      `);
-
-      if (!cells || cells.length === 0) {
+      if (cells.length === 0) {
         return {
           success: false,
           code: code,
-          error: 'No results found'
+          error: 'No results found',
+          noResults: true
         };
       }
 
@@ -328,33 +398,126 @@ export class WebViewAutomation {
   }
 
   /**
-   * Wait for a selector to appear on the page (polling-based)
+   * Wait for a fresh result row (event-driven) and return its cells
+   * A single in-page MutationObserver resolves as soon as the results table
+   * changes, so there is no fixed delay and no per-poll IPC round-trip.
+   * A button submit may navigate to a new document: the observer is then
+   * armed again once the new page has loaded.
+   * Returns null on timeout.
    */
-  private async waitForSelector(selector: string, timeout: number): Promise<boolean> {
+  private async waitForResultCells(code: string, timeout: number): Promise<string[] | null> {
     const webContents = this.getWebContents();
-    const startTime = Date.now();
+    const deadline = Date.now() + timeout;
 
-    while (Date.now() - startTime < timeout) {
-      try {
-        const exists = await webContents.executeJavaScript(`
-          !!document.querySelector('${selector.replace(/'/g, "\\'")}');
-        `);
+    while (Date.now() < deadline) {
+      if (webContents.isLoading()) {
+        await this.waitForEvent('did-stop-loading', deadline - Date.now()).catch(() => undefined);
+        continue;
+      }
 
-        if (exists) {
-          return true;
+      const navigation = this.watchNavigation(webContents);
+      try {
+        const cells = await Promise.race([
+          webContents.executeJavaScript(this.buildResultWaitScript(code, deadline - Date.now())) as Promise<string[] | null>,
+          navigation.started
+        ]);
+        if (cells !== undefined) {
+          return cells;
         }
-
-        // Wait before next check
-        await this.sleep(FETCH_CHECK_INTERVAL_MS); // 50ms
-
+        // The observer's document was replaced: wait for the new one
       } catch (error) {
-        // Page might be navigating, continue polling
-        await this.sleep(FETCH_CHECK_INTERVAL_MS);
+        if (!webContents.isLoading()) {
+          throw error;
+        }
+      } finally {
+        navigation.dispose();
       }
     }
 
-    console.error(`[WebView Automation] Selector ${selector} not found after ${timeout}ms`);
-    return false;
+    return null;
+  }
+
+  /**
+   * Resolves (with undefined) when the main frame starts a cross-document navigation
+   */
+  private watchNavigation(webContents: WebContents): { started: Promise<undefined>; dispose: () => void } {
+    let listener: ((...args: any[]) => void) | null = null;
+
+    const started = new Promise<undefined>(resolve => {
+      listener = (_event: unknown, _url: string, isInPlace: boolean, isMainFrame: boolean) => {
+        if (isMainFrame && !isInPlace) {
+          resolve(undefined);
+        }
+      };
+      webContents.on('did-start-navigation', listener);
+    });
+
+    return {
+      started,
+      dispose: () => {
+        if (listener && !webContents.isDestroyed()) {
+          webContents.removeListener('did-start-navigation', listener);
+        }
+      }
+    };
+  }
+
+  /**
+   * In-page script resolving with the fresh result row cells, or null on timeout
+   */
+  private buildResultWaitScript(code: string, timeout: number): string {
+    return `
+      (function() {
+        var selector = ${JSON.stringify(RESULTS_ROW_SELECTOR)};
+        var code = ${JSON.stringify(code)};
+        var staleRow = window.__nsis_stale_row || null;
+        var staleText = window.__nsis_stale_text || null;
+
+        ${CELLS_OF_SCRIPT}
+
+        // Fresh = a different row node, or the same node with different content
+        function readFreshCells() {
+          var row = document.querySelector(selector);
+          if (!row) return null;
+          if (row === staleRow && row.innerText === staleText) return null;
+          return cellsOf(row);
+        }
+
+        return new Promise(function(resolve) {
+          var cells = readFreshCells();
+          if (cells) {
+            resolve(cells);
+            return;
+          }
+
+          var done = false;
+          var finish = function(result) {
+            if (done) return;
+            done = true;
+            observer.disconnect();
+            clearTimeout(timer);
+            resolve(result);
+          };
+
+          var observer = new MutationObserver(function() {
+            var found = readFreshCells();
+            if (found) finish(found);
+          });
+          observer.observe(document.documentElement, {
+            childList: true,
+            subtree: true,
+            characterData: true
+          });
+
+          // On timeout the unchanged row is only accepted if it belongs to this code
+          // (same code searched twice renders an identical row)
+          var timer = setTimeout(function() {
+            var row = document.querySelector(selector);
+            finish(row && row.innerText.indexOf(code) !== -1 ? cellsOf(row) : null);
+          }, ${timeout});
+        });
+      })();
+    `;
   }
 
   /**
@@ -459,22 +622,7 @@ export class WebViewAutomation {
    * Parse cells into ProcessingResult
    */
   parseCellsToResult(code: string, cells: string[]): ProcessingResult {
-    // Map cells to result structure
-    // Based on Python worker.py logic - CORRECT indices!
-    return {
-      'Input Code': code,
-      'Taric': cells[0] || '',                         // Index 0 - Codice TARIC
-      'Stato': cells[2] || '',                         // Index 2 - Stato
-      'Protocollo ingresso': cells[3] || '',          // Index 3 - Protocollo ingresso
-      'Inserita il': cells[4] || '',                   // Index 4 - Inserita il
-      'Protocollo uscita': cells[5] || '',            // Index 5 - Protocollo uscita (FIXED!)
-      'Provvedimento': cells[6] || '',                 // Index 6 - Provvedimento (FIXED!)
-      'Data Provvedimento': cells[7] || '',            // Index 7 - Data provvedimento (FIXED!)
-      'Codice richiesta (risultato)': cells[8] || code, // Index 8 - Codice richiesta (FIXED! Fallback to input code)
-      'Tipo pratica': cells[9] || '',                  // Index 9 - Tipo pratica
-      'Note Usmaf': cells[10] || '',                   // Index 10 - Note Usmaf (FIXED!)
-      'Invio SUD': cells[11] || ''                     // Index 11 - Invio SUD
-    };
+    return parseCellsToResult(code, cells);
   }
 
   /**
@@ -488,9 +636,6 @@ export class WebViewAutomation {
       await webContents.loadURL(URL_NSIS);
       await this.waitForEvent('did-stop-loading');
 
-      // Reinstall interceptor after reload
-      await this.injectLinkInterceptor();
-
     } catch (error) {
       console.error('[WebView Automation] Error reloading page:', error);
     }
@@ -507,6 +652,10 @@ export class WebViewAutomation {
       // Don't reload - let user stay on current page with results
       // No need to go back to homepage after processing
 
+      if (this.webContents && !this.webContents.isDestroyed()) {
+        this.webContents.removeListener('dom-ready', this.onDomReady);
+      }
+
       this.isInitialized = false;
       console.log('[WebView Automation] Cleanup complete - staying on current page');
 
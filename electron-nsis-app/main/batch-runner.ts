@@ -0,0 +1,255 @@
+/**
+ * Headless batch mode: electron . --batch input.xlsx [options]
+ * Processes an Excel file without splash screen, React renderer or visible
+ * webview: the lookups run on a hidden window sharing the app's persisted
+ * NSIS session (log in once from the interactive app), results are written
+ * back to the Excel file and a JSON summary is written next to it.
+ *
+ * Options:
+ *   --url=<pagina>        consultation page to open (required)
+ *   --pool=<n>            parallel sessions, positive integer (default: DEFAULT_POOL_SIZE)
+ *   --engine=dom|http     lookup engine (default: dom)
+ *   --summary=<file>      JSON summary path (default: <input>.summary.json)
+ *   --force-refresh       ignore the result cache
+ *   --no-resume           do not resume an interrupted run on the same file
+ *
+ * Exit codes: 0 run completed, 1 run failed or not completed, 2 invalid input
+ * (missing --url, invalid --pool, or a --url page without the search form
+ * and results table).
+ */
+
+import { BrowserWindow } from 'electron';
+import * as fs from 'fs';
+import * as path from 'path';
+import { excelHandler } from './excel/excel-handler';
+import { processingOrchestrator } from './workers/processor';
+import { runProcessingJob } from './workers/processing-job';
+import { logFile } from './log-file';
+import { LookupEngineType } from '../shared/types/processing-types';
+import { NSIS_PARTITION, DEFAULT_POOL_SIZE } from '../shared/constants/config';
+
+export interface BatchOptions {
+  inputPath: string;
+  summaryPath: string;
+  url: string;
+  poolSize: number;
+  engine: LookupEngineType;
+  forceRefresh: boolean;
+  resume: boolean;
+}
+
+export interface BatchSummary {
+  input: string;
+  output: string | null;
+  startedAt: string;
+  finishedAt: string;
+  durationMs: number;
+  engine: LookupEngineType;
+  poolSize: number;
+  rows: number;
+  uniqueCodes: number;
+  processed: number;
+  errors: number;
+  completed: boolean;
+  states: Record<string, number>;
+  error?: string;
+}
+
+/**
+ * Batch options from the command line, or null when --batch is not given
+ * Accepts both "--batch file.xlsx" and "--batch=file.xlsx".
+ */
+export function parseBatchArgs(argv: string[]): BatchOptions | null {
+  const flagIndex = argv.findIndex(arg => arg === '--batch' || arg.startsWith('--batch='));
+  if (flagIndex === -1) {
+    return null;
+  }
+
+  const flag = argv[flagIndex];
+  const input = flag.includes('=') ? flag.slice('--batch='.length) : argv[flagIndex + 1];
+  if (!input || input.startsWith('--')) {
+    throw new Error('--batch richiede il percorso del file Excel');
+  }
+
+  const readOption = (name: string): string | undefined => {
+    const arg = argv.find(value => value.startsWith(`--${name}=`));
+    return arg ? arg.slice(name.length + 3) : undefined;
+  };
+
+  // No default: URL_NSIS is the news page, not the consultation page
+  const url = readOption('url');
+  if (!url) {
+    throw new Error('--batch richiede --url=<pagina di consultazione>');
+  }
+
+  const pool = readOption('pool');
+  if (pool !== undefined && !/^[1-9]\d*$/.test(pool)) {
+    throw new Error(`--pool deve essere un intero positivo (ricevuto: ${pool})`);
+  }
+  const poolSize = pool === undefined ? DEFAULT_POOL_SIZE : Number(pool);
+
+  const inputPath = path.resolve(input);
+  const parsed = path.parse(inputPath);
+
+  return {
+    inputPath,
+    summaryPath: path.resolve(readOption('summary') || path.join(parsed.dir, `${parsed.name}.summary.json`)),
+    url,
+    poolSize,
+    engine: readOption('engine') === 'http' ? 'http' : 'dom',
+    forceRefresh: argv.includes('--force-refresh'),
+    resume: !argv.includes('--no-resume')
+  };
+}
+
+/**
+ * Hidden window on the persisted NSIS session, showing the consultation page
+ */
+async function openLookupWindow(url: string): Promise<BrowserWindow> {
+  const window = new BrowserWindow({
+    show: false,
+    width: 1280,
+    height: 720,
+    webPreferences: {
+      partition: NSIS_PARTITION,
+      nodeIntegration: false,
+      contextIsolation: true,
+      sandbox: true
+    }
+  });
+
+  // Prevent new windows/tabs - navigate in the same window instead
+  window.webContents.setWindowOpenHandler(({ url: target }) => {
+    window.webContents.loadURL(target);
+    return { action: 'deny' };
+  });
+
+  await window.loadURL(url);
+  return window;
+}
+
+/**
+ * Check that the loaded page is the consultation page
+ * Returns a description of what is missing, or null.
+ */
+async function checkConsultationPage(window: BrowserWindow): Promise<string | null> {
+  const found: { table: boolean; form: boolean } = await window.webContents.executeJavaScript(`
+    ({
+      table: !!document.querySelector('#risultatiConsultazionePratica'),
+      form: !!document.querySelector('form input[type="text"], form input:not([type])')
+    })
+  `);
+
+  const missing = [
+    ...(found.form ? [] : ['form di ricerca']),
+    ...(found.table ? [] : ['tabella risultati'])
+  ];
+  return missing.length > 0
+    ? `La pagina ${window.webContents.getURL()} non è la pagina di consultazione (mancano: ${missing.join(', ')})`
+    : null;
+}
+
+/**
+ * Log to stdout (scheduler output) and to the processing log file
+ */
+function report(message: string): void {
+  console.log(`[Batch] ${message}`);
+  logFile.write(`[Batch] ${message}`);
+}
+
+/**
+ * Run a batch and write its JSON summary
+ * Returns the process exit code.
+ */
+export async function runBatch(options: BatchOptions): Promise<number> {
+  const startedAt = Date.now();
+  const summary: BatchSummary = {
+    input: options.inputPath,
+    output: null,
+    startedAt: new Date(startedAt).toISOString(),
+    finishedAt: '',
+    durationMs: 0,
+    engine: options.engine,
+    poolSize: options.poolSize,
+    rows: 0,
+    uniqueCodes: 0,
+    processed: 0,
+    errors: 0,
+    completed: false,
+    states: {}
+  };
+
+  // Ctrl+C / scheduler stop: interrupt cleanly, the checkpoint allows resuming
+  const stop = () => processingOrchestrator.stopProcessing();
+  process.once('SIGINT', stop);
+  process.once('SIGTERM', stop);
+
+  let window: BrowserWindow | null = null;
+  let exitCode = 1;
+
+  try {
+    const loaded = await excelHandler.loadExcelFile(options.inputPath);
+    if (!loaded.success) {
+      summary.error = loaded.error || 'Errore caricamento file';
+      exitCode = 2;
+      return exitCode;
+    }
+
+    summary.rows = loaded.codes.length;
+    summary.uniqueCodes = new Set(loaded.codes).size;
+    report(`${options.inputPath}: ${summary.rows} righe, ${summary.uniqueCodes} codici unici`);
+
+    window = await openLookupWindow(options.url);
+    const pageError = await checkConsultationPage(window);
+    if (pageError) {
+      summary.error = pageError;
+      exitCode = 2;
+      return exitCode;
+    }
+    processingOrchestrator.setWebViewContentsId(window.webContents.id);
+    report(`Pagina di consultazione: ${window.webContents.getURL()}`);
+
+    const job = await runProcessingJob(loaded.codes, {
+      poolSize: options.poolSize,
+      engine: options.engine,
+      forceRefresh: options.forceRefresh,
+      resume: options.resume
+    });
+
+    summary.output = job.outputPath || null;
+    summary.processed = job.results.length;
+    summary.completed = job.completed;
+    for (const result of job.results) {
+      summary.states[result.Stato] = (summary.states[result.Stato] || 0) + 1;
+    }
+    summary.errors = summary.states['ERRORE'] || 0;
+
+    exitCode = job.completed ? 0 : 1;
+    return exitCode;
+
+  } catch (error) {
+    summary.error = error instanceof Error ? error.message : 'Errore sconosciuto';
+    return exitCode;
+
+  } finally {
+    process.removeListener('SIGINT', stop);
+    process.removeListener('SIGTERM', stop);
+    if (window && !window.isDestroyed()) {
+      window.destroy();
+    }
+
+    summary.finishedAt = new Date().toISOString();
+    summary.durationMs = Date.now() - startedAt;
+    try {
+      fs.writeFileSync(options.summaryPath, JSON.stringify(summary, null, 2) + '\n', 'utf8');
+      report(`Riepilogo salvato in ${options.summaryPath}`);
+    } catch (error) {
+      console.error('[Batch] Error writing summary:', error);
+    }
+
+    report(summary.error
+      ? `Errore: ${summary.error}`
+      : `${summary.processed}/${summary.uniqueCodes} codici elaborati, ${summary.errors} errori${summary.output ? ` - risultati in ${summary.output}` : ''}`);
+    logFile.close();
+  }
+}
@@ -0,0 +1,222 @@
+/**
+ * Persistent cache of processing results keyed by request code
+ * Stored as an append-only JSONL file under userData, compacted when it grows.
+ * Final states (chiusa, annullata) are kept long, open states only briefly.
+ */
+
+import { app } from 'electron';
+import * as fs from 'fs';
+import * as path from 'path';
+import { ProcessingResult } from '../../shared/types/excel-types';
+import {
+  CACHE_FILE_NAME, CACHE_TTL_FINAL_MS, CACHE_TTL_OPEN_MS, CACHE_MAX_ENTRIES, CACHE_FLUSH_BATCH
+} from '../../shared/constants/config';
+
+interface CacheEntry {
+  code: string;
+  result: ProcessingResult;
+  cachedAt: number;
+}
+
+export interface CacheStats {
+  entries: number;
+  hits: number;
+  misses: number;
+}
+
+/**
+ * True for states that no longer change on the portal
+ */
+export function isFinalState(stato: string): boolean {
+  const statoLower = stato.toLowerCase();
+  return statoLower.includes('chius') || statoLower.includes('annullat');
+}
+
+export class ResultCache {
+  // Map iteration order doubles as LRU order (oldest first)
+  private entries: Map<string, CacheEntry> = new Map();
+  private loaded: boolean = false;
+  private fileLines: number = 0;
+  private pendingLines: string[] = [];
+  private writing: Promise<void> = Promise.resolve();
+  private hits: number = 0;
+  private misses: number = 0;
+  private filePath: string = '';
+
+  constructor(private readonly fileName: string = CACHE_FILE_NAME) {}
+
+  /**
+   * Load the cache file (once)
+   */
+  async load(): Promise<void> {
+    if (this.loaded) {
+      return;
+    }
+    this.loaded = true;
+
+    // Resolved here: userData is only final once the app has started
+    this.filePath = path.join(app.getPath('userData'), this.fileName);
+
+    let content: string;
+    try {
+      content = await fs.promises.readFile(this.filePath, 'utf8');
+    } catch (error) {
+      if ((error as NodeJS.ErrnoException).code !== 'ENOENT') {
+        console.error('[ResultCache] Error reading cache file:', error);
+      }
+      return;
+    }
+
+    const now = Date.now();
+    for (const line of content.split('\n')) {
+      if (!line.trim()) continue;
+      this.fileLines++;
+
+      try {
+        const entry = JSON.parse(line) as CacheEntry;
+        if (!entry.code || !entry.result) continue;
+
+        // Later lines win: re-insert so the newest write is the most recent
+        this.entries.delete(entry.code);
+        if (!this.isExpired(entry, now)) {
+          this.entries.set(entry.code, entry);
+        }
+      } catch {
+        // Truncated line from an interrupted write - skip it
+      }
+    }
+
+    this.evict();
+    console.log(`[ResultCache] Loaded ${this.entries.size} entries from ${this.filePath}`);
+  }
+
+  /**
+   * Get a cached result, or null if missing or expired
+   */
+  get(code: string): ProcessingResult | null {
+    const entry = this.entries.get(code);
+
+    if (!entry || this.isExpired(entry, Date.now())) {
+      if (entry) {
+        this.entries.delete(code);
+      }
+      this.misses++;
+      return null;
+    }
+
+    // Mark as most recently used
+    this.entries.delete(code);
+    this.entries.set(code, entry);
+    this.hits++;
+    return entry.result;
+  }
+
+  /**
+   * Store a result (errors are never cached)
+   */
+  set(code: string, result: ProcessingResult): void {
+    if (result.Stato === 'ERRORE') {
+      return;
+    }
+
+    const entry: CacheEntry = { code, result, cachedAt: Date.now() };
+    this.entries.delete(code);
+    this.entries.set(code, entry);
+    this.evict();
+
+    this.pendingLines.push(JSON.stringify(entry));
+    if (this.pendingLines.length >= CACHE_FLUSH_BATCH) {
+      void this.flush();
+    }
+  }
+
+  /**
+   * Write pending entries to disk, compacting the file when it holds
+   * mostly stale lines
+   */
+  flush(): Promise<void> {
+    this.writing = this.writing.then(async () => {
+      if (this.pendingLines.length === 0) {
+        return;
+      }
+
+      const lines = this.pendingLines;
+      this.pendingLines = [];
+
+      try {
+        if (this.fileLines + lines.length > Math.max(this.entries.size * 2, CACHE_MAX_ENTRIES / 10)) {
+          await this.compact();
+        } else {
+          await fs.promises.mkdir(path.dirname(this.filePath), { recursive: true });
+          await fs.promises.appendFile(this.filePath, lines.join('\n') + '\n', 'utf8');
+          this.fileLines += lines.length;
+        }
+      } catch (error) {
+        console.error('[ResultCache] Error writing cache file:', error);
+      }
+    });
+
+    return this.writing;
+  }
+
+  /**
+   * Remove all entries
+   */
+  async clear(): Promise<void> {
+    await this.load();
+    this.entries.clear();
+    this.pendingLines = [];
+    await this.writing;
+    await fs.promises.rm(this.filePath, { force: true });
+    this.fileLines = 0;
+    console.log('[ResultCache] Cache cleared');
+  }
+
+  /**
+   * Hit/miss counters since the last reset
+   */
+  getStats(): CacheStats {
+    return { entries: this.entries.size, hits: this.hits, misses: this.misses };
+  }
+
+  /**
+   * Reset hit/miss counters (start of a new run)
+   */
+  resetStats(): void {
+    this.hits = 0;
+    this.misses = 0;
+  }
+
+  /**
+   * Rewrite the file with live entries only
+   */
+  private async compact(): Promise<void> {
+    const tempPath = `${this.filePath}.tmp`;
+    const content = Array.from(this.entries.values()).map(entry => JSON.stringify(entry)).join('\n');
+
+    await fs.promises.mkdir(path.dirname(this.filePath), { recursive: true });
+    await fs.promises.writeFile(tempPath, content ? content + '\n' : '', 'utf8');
+    await fs.promises.rename(tempPath, this.filePath);
+
+    this.fileLines = this.entries.size;
+    console.log(`[ResultCache] Compacted cache file (${this.entries.size} entries)`);
+  }
+
+  private isExpired(entry: CacheEntry, now: number): boolean {
+    const ttl = isFinalState(entry.result.Stato) ? CACHE_TTL_FINAL_MS : CACHE_TTL_OPEN_MS;
+    return now - entry.cachedAt > ttl;
+  }
+
+  /**
+   * Drop least recently used entries above the size limit
+   */
+  private evict(): void {
+    while (this.entries.size > CACHE_MAX_ENTRIES) {
+      const oldest = this.entries.keys().next().value as string;
+      this.entries.delete(oldest);
+    }
+  }
+}
+
+// Export singleton instance
+export const resultCache = new ResultCache();
@@ -8,13 +8,47 @@ import * as fs from 'fs';
 import {
   COL_RICERCA, COL_TARIC, COL_STATO, COL_PROTOCOLLO_INGRESSO, COL_INSERITA_IL,
   COL_PROTOCOLLO, COL_PROVVEDIMENTO, COL_DATA_PROVV, COL_CODICE_RIS,
-  COL_TIPO_PRATICA, COL_NOTE, COL_INVIO_SUD
+  COL_TIPO_PRATICA, COL_NOTE, COL_INVIO_SUD, EXCEL_STREAMING_THRESHOLD_BYTES
 } from '../../shared/constants/config';
 import { LoadExcelResult, SaveExcelResult, ProcessingResult } from '../../shared/types/excel-types';
 
+// Column mapping - ALL 11 columns!
+const COL_NAME_MAP: Record<string, string> = {
+  'Taric': COL_TARIC,
+  'Stato': COL_STATO,
+  'Protocollo ingresso': COL_PROTOCOLLO_INGRESSO,
+  'Inserita il': COL_INSERITA_IL,
+  'Protocollo uscita': COL_PROTOCOLLO,
+  'Provvedimento': COL_PROVVEDIMENTO,
+  'Data Provvedimento': COL_DATA_PROVV,
+  'Codice richiesta (risultato)': COL_CODICE_RIS,
+  'Tipo pratica': COL_TIPO_PRATICA,
+  'Note Usmaf': COL_NOTE,
+  'Invio SUD': COL_INVIO_SUD
+};
+
+const OUTPUT_CONFIG_KEYS = [
+  'Taric', 'Stato', 'Protocollo ingresso', 'Inserita il',
+  'Protocollo uscita', 'Provvedimento', 'Data Provvedimento',
+  'Codice richiesta (risultato)', 'Tipo pratica', 'Note Usmaf', 'Invio SUD'
+];
+
+/**
+ * Code -> row numbers of the search column (duplicates keep every row, in order)
+ */
+interface CodeRowIndex {
+  filePath: string;
+  mtimeMs: number;
+  searchColIdx: number;
+  rows: Map<string, number[]>;
+  /** Last used column of the sheet (streaming loads): new output columns go after it */
+  lastColumn?: number;
+}
+
 export class ExcelHandler {
   private currentFilePath: string | null = null;
   private codes: string[] = [];
+  private rowIndex: CodeRowIndex | null = null;
 
   /**
    * Load Excel file and extract codes from the search column
@@ -33,6 +67,11 @@ export class ExcelHandler {
         };
       }
 
+      // Very large files: read only the search column, row by row
+      if (await this.shouldStream(filePath)) {
+        return await this.loadExcelFileStreaming(filePath);
+      }
+
       // Load workbook
       const workbook = new ExcelJS.Workbook();
       await workbook.xlsx.readFile(filePath);
@@ -49,7 +88,7 @@ export class ExcelHandler {
       console.log(`[ExcelHandler] Caricato foglio: ${worksheet.name}`);
 
       // Find search column
-      const searchColIdx = this.findSearchColumn(worksheet);
+      const searchColIdx = this.findSearchColumn(worksheet.getRow(1));
       if (searchColIdx === null) {
         return {
           success: false,
@@ -58,9 +97,15 @@ export class ExcelHandler {
         };
       }
 
-      // Extract codes
-      const codes = this.extractCodesFromColumn(worksheet, searchColIdx);
+      // Extract codes (also builds the code -> row index used when saving)
+      const { codes, rows } = this.extractCodesFromColumn(worksheet, searchColIdx);
       this.codes = codes;
+      this.rowIndex = {
+        filePath,
+        mtimeMs: (await fs.promises.stat(filePath)).mtimeMs,
+        searchColIdx,
+        rows
+      };
 
       console.log(`[ExcelHandler] Estratti ${codes.length} codici dal file Excel`);
 
@@ -82,10 +127,93 @@ export class ExcelHandler {
   }
 
   /**
-   * Find the search column index in the Excel sheet
+   * Load codes with the streaming reader (first worksheet, search column only)
+   * Memory stays constant regardless of the number of rows.
    */
-  private findSearchColumn(worksheet: ExcelJS.Worksheet): number | null {
-    const headerRow = worksheet.getRow(1);
+  private async loadExcelFileStreaming(filePath: string): Promise<LoadExcelResult> {
+    console.log('[ExcelHandler] File di grandi dimensioni, lettura in streaming');
+
+    const reader = new ExcelJS.stream.xlsx.WorkbookReader(filePath, {
+      worksheets: 'emit',
+      sharedStrings: 'cache',
+      hyperlinks: 'ignore',
+      styles: 'ignore',
+      entries: 'ignore'
+    });
+
+    const codes: string[] = [];
+    const rows: Map<string, number[]> = new Map();
+    let searchColIdx: number | null = null;
+    let lastColumn = 0;
+    let foundWorksheet = false;
+
+    for await (const worksheetReader of reader) {
+      foundWorksheet = true;
+
+      for await (const row of worksheetReader) {
+        lastColumn = Math.max(lastColumn, row.cellCount);
+
+        if (row.number === 1) {
+          searchColIdx = this.findSearchColumn(row);
+          if (searchColIdx === null) break;
+          continue;
+        }
+
+        if (searchColIdx !== null) {
+          this.addCodeFromRow(row, searchColIdx, codes, rows);
+        }
+      }
+
+      // Only the first worksheet holds the codes
+      break;
+    }
+
+    if (!foundWorksheet) {
+      return {
+        success: false,
+        codes: [],
+        error: 'File Excel non contiene fogli di lavoro'
+      };
+    }
+
+    if (searchColIdx === null) {
+      return {
+        success: false,
+        codes: [],
+        error: `Colonna di ricerca '${COL_RICERCA}' non trovata nel file`
+      };
+    }
+
+    this.codes = codes;
+    this.rowIndex = {
+      filePath,
+      mtimeMs: (await fs.promises.stat(filePath)).mtimeMs,
+      searchColIdx,
+      rows,
+      lastColumn
+    };
+
+    console.log(`[ExcelHandler] Estratti ${codes.length} codici dal file Excel`);
+
+    return {
+      success: true,
+      codes: codes,
+      error: undefined
+    };
+  }
+
+  /**
+   * True if the file is large enough to be handled with the streaming reader/writer
+   */
+  private async shouldStream(filePath: string): Promise<boolean> {
+    const stats = await fs.promises.stat(filePath);
+    return stats.size >= EXCEL_STREAMING_THRESHOLD_BYTES;
+  }
+
+  /**
+   * Find the search column index in the header row
+   */
+  private findSearchColumn(headerRow: ExcelJS.Row): number | null {
     let searchColIdx: number | null = null;
 
     headerRow.eachCell((cell, colNumber) => {
@@ -100,49 +228,119 @@ export class ExcelHandler {
   }
 
   /**
-   * Extract codes from the specified column
+   * Extract codes from the specified column, with their code -> row index
    */
-  private extractCodesFromColumn(worksheet: ExcelJS.Worksheet, columnIdx: number): string[] {
+  private extractCodesFromColumn(
+    worksheet: ExcelJS.Worksheet,
+    columnIdx: number
+  ): { codes: string[]; rows: Map<string, number[]> } {
     const codes: string[] = [];
+    const rows: Map<string, number[]> = new Map();
 
     // Start from row 2 (skip header)
     for (let rowNumber = 2; rowNumber <= worksheet.rowCount; rowNumber++) {
-      const row = worksheet.getRow(rowNumber);
-      const cell = row.getCell(columnIdx);
+      this.addCodeFromRow(worksheet.getRow(rowNumber), columnIdx, codes, rows);
+    }
 
-      if (cell.value) {
-        const code = String(cell.value).trim();
-        if (code) {
-          codes.push(code);
-        }
-      }
+    return { codes, rows };
+  }
+
+  /**
+   * Read the code of a row and record it in the code list and row index
+   */
+  private addCodeFromRow(
+    row: ExcelJS.Row,
+    columnIdx: number,
+    codes: string[],
+    rows: Map<string, number[]>
+  ): void {
+    const code = this.readCode(row, columnIdx);
+    if (!code) {
+      return;
     }
 
-    return codes;
+    codes.push(code);
+
+    const codeRows = rows.get(code);
+    if (codeRows) {
+      codeRows.push(row.number);
+    } else {
+      rows.set(code, [row.number]);
+    }
+  }
+
+  /**
+   * Trimmed code in the search column of a row, or null if empty
+   */
+  private readCode(row: ExcelJS.Row, columnIdx: number): string | null {
+    const cell = row.getCell(columnIdx);
+    if (!cell.value) {
+      return null;
+    }
+
+    const code = String(cell.value).trim();
+    return code || null;
+  }
+
+  /**
+   * Get the code -> row index for a worksheet read from filePath
+   * Reuses the index built at load time unless the file changed on disk.
+   */
+  private async getRowIndex(
+    worksheet: ExcelJS.Worksheet,
+    searchColIdx: number,
+    filePath: string
+  ): Promise<Map<string, number[]>> {
+    const mtimeMs = (await fs.promises.stat(filePath)).mtimeMs;
+
+    if (
+      this.rowIndex &&
+      this.rowIndex.filePath === filePath &&
+      this.rowIndex.mtimeMs === mtimeMs &&
+      this.rowIndex.searchColIdx === searchColIdx
+    ) {
+      return this.rowIndex.rows;
+    }
+
+    console.log('[ExcelHandler] File modificato dal caricamento, ricostruzione indice righe');
+    const { rows } = this.extractCodesFromColumn(worksheet, searchColIdx);
+    this.rowIndex = { filePath, mtimeMs, searchColIdx, rows };
+    return this.rowIndex.rows;
   }
 
   /**
    * Save results to Excel file
+   * copyPath is the copy returned by an earlier save of the same run (original
+   * read-only or locked): the results are read from and written to that copy
+   * instead of creating a new one at every checkpoint.
    */
   async saveResultsToExcel(
     results: ProcessingResult[],
-    originalFilePath: string
+    originalFilePath: string,
+    copyPath?: string
   ): Promise<SaveExcelResult> {
-    console.log(`[ExcelHandler] Tentativo salvataggio ${results.length} risultati su ${path.basename(originalFilePath)}`);
+    console.log(`[ExcelHandler] Tentativo salvataggio ${results.length} risultati su ${path.basename(copyPath || originalFilePath)}`);
+
+    const existingCopy = copyPath && copyPath !== originalFilePath ? copyPath : undefined;
 
     try {
+      if (await this.shouldStream(originalFilePath)) {
+        return await this.saveResultsToExcelStreaming(results, originalFilePath, existingCopy);
+      }
+
       let workbook: ExcelJS.Workbook;
-      let outputFilePath = originalFilePath;
-      let isReadOnly = false;
+      let outputFilePath = existingCopy || originalFilePath;
 
       // Try to load workbook for writing
       try {
         workbook = new ExcelJS.Workbook();
-        await workbook.xlsx.readFile(originalFilePath);
+        await workbook.xlsx.readFile(outputFilePath);
         console.log('[ExcelHandler] Workbook caricato per scrittura');
       } catch (error) {
+        if (existingCopy) {
+          throw error;
+        }
         console.warn('[ExcelHandler] Errore caricamento per scrittura, tento con backup:', error);
-        isReadOnly = true;
 
         const backupPath = await this.createBackupFile(originalFilePath);
         if (!backupPath) {
@@ -167,10 +365,15 @@ export class ExcelHandler {
       const worksheet = workbook.worksheets[0];
 
       // Write results to sheet
-      const success = await this.writeResultsToSheet(worksheet, results);
+      const success = await this.writeResultsToSheet(worksheet, results, originalFilePath);
 
       if (success) {
         await workbook.xlsx.writeFile(outputFilePath);
+
+        // Only result columns were written, rows are unchanged: keep the index valid
+        if (this.rowIndex && this.rowIndex.filePath === outputFilePath) {
+          this.rowIndex.mtimeMs = (await fs.promises.stat(outputFilePath)).mtimeMs;
+        }
         console.log(`[ExcelHandler] Risultati salvati con successo in: ${outputFilePath}`);
         return {
           success: true,
@@ -193,21 +396,208 @@ export class ExcelHandler {
     }
   }
 
+  /**
+   * Save results with the streaming reader/writer
+   * The workbook is copied row by row into a temporary file, with the results
+   * applied to the first worksheet. The streamed copy loses column widths,
+   * merged cells, freeze panes, data validations, conditional formatting and
+   * images, so it never replaces the original: it is moved to a separate
+   * output file (the same one for every checkpoint of a run).
+   */
+  private async saveResultsToExcelStreaming(
+    results: ProcessingResult[],
+    originalFilePath: string,
+    existingCopy?: string
+  ): Promise<SaveExcelResult> {
+    console.log('[ExcelHandler] File di grandi dimensioni, scrittura in streaming su una copia');
+
+    const parsed = path.parse(originalFilePath);
+    const tempPath = path.join(parsed.dir, `~${parsed.name}_${Date.now()}.tmp${parsed.ext}`);
+    const sourcePath = existingCopy || originalFilePath;
+    const outputFilePath = existingCopy || this.getBackupPath(originalFilePath);
+
+    try {
+      const lastColumn = await this.getIndexedLastColumn(sourcePath);
+      await this.streamWorkbookWithResults(sourcePath, tempPath, results, lastColumn);
+      await fs.promises.rename(tempPath, outputFilePath);
+
+      console.log(`[ExcelHandler] Risultati salvati con successo in: ${outputFilePath} (il file originale non viene modificato)`);
+      return {
+        success: true,
+        outputPath: outputFilePath
+      };
+
+    } catch (error) {
+      await fs.promises.rm(tempPath, { force: true });
+      throw error;
+    }
+  }
+
+  /**
+   * Last used column recorded when filePath was loaded, if the file is unchanged
+   */
+  private async getIndexedLastColumn(filePath: string): Promise<number | null> {
+    if (!this.rowIndex || this.rowIndex.filePath !== filePath || this.rowIndex.lastColumn === undefined) {
+      return null;
+    }
+
+    const mtimeMs = (await fs.promises.stat(filePath)).mtimeMs;
+    return this.rowIndex.mtimeMs === mtimeMs ? this.rowIndex.lastColumn : null;
+  }
+
+  /**
+   * Copy sourcePath to targetPath row by row, writing results into the first worksheet
+   * lastColumn is the sheet's last used column when already known (see loadExcelFileStreaming).
+   */
+  private async streamWorkbookWithResults(
+    sourcePath: string,
+    targetPath: string,
+    results: ProcessingResult[],
+    lastColumn: number | null
+  ): Promise<void> {
+    // A code's result goes to every row containing the code
+    const resultsByCode: Map<string, ProcessingResult> = new Map();
+    for (const result of results) {
+      resultsByCode.set(result['Input Code'].trim(), result);
+    }
+
+    const reader = new ExcelJS.stream.xlsx.WorkbookReader(sourcePath, {
+      worksheets: 'emit',
+      sharedStrings: 'cache',
+      hyperlinks: 'cache',
+      styles: 'cache',
+      entries: 'ignore'
+    });
+    const writer = new ExcelJS.stream.xlsx.WorkbookWriter({
+      filename: targetPath,
+      useStyles: true,
+      useSharedStrings: false
+    });
+
+    let sheetCount = 0;
+    let written = 0;
+
+    for await (const worksheetReader of reader) {
+      sheetCount++;
+      const isResultSheet = sheetCount === 1;
+      const sheetWriter = writer.addWorksheet(this.getStreamSheetName(reader, worksheetReader, sheetCount));
+
+      let ricercaColIdx: number | null = null;
+      let finalColIndices: Record<string, number> | null = null;
+
+      for await (const row of worksheetReader) {
+        const outRow = sheetWriter.getRow(row.number);
+        if (row.height) {
+          outRow.height = row.height;
+        }
+        row.eachCell({ includeEmpty: false }, (cell, colNumber) => {
+          const outCell = outRow.getCell(colNumber);
+          outCell.value = cell.value;
+          outCell.style = cell.style;
+        });
+
+        if (isResultSheet) {
+          if (row.number === 1) {
+            const existingHeaders = this.readHeaders(row);
+            ricercaColIdx = existingHeaders[COL_RICERCA.toLowerCase()] || null;
+            if (!ricercaColIdx) {
+              throw new Error(`Colonna di ricerca '${COL_RICERCA}' non trovata`);
+            }
+            // New columns go after the last used column of the sheet, not just of the header
+            // (only read again when the file was not loaded in streaming)
+            const missingColumns = OUTPUT_CONFIG_KEYS.some(key => !existingHeaders[COL_NAME_MAP[key].toLowerCase()]);
+            const sheetLastColumn = missingColumns
+              ? Math.max(row.cellCount, lastColumn ?? await this.getLastUsedColumn(sourcePath))
+              : row.cellCount;
+            finalColIndices = this.resolveOutputColumns(outRow, existingHeaders, sheetLastColumn + 1);
+          } else if (ricercaColIdx !== null && finalColIndices) {
+            const code = this.readCode(row, ricercaColIdx);
+            const result = code ? resultsByCode.get(code) : undefined;
+
+            if (result) {
+              this.writeResultToRow(outRow, result, finalColIndices);
+              written++;
+            }
+          }
+        }
+
+        outRow.commit();
+      }
+
+      sheetWriter.commit();
+    }
+
+    if (sheetCount === 0) {
+      throw new Error('Workbook non valido o senza fogli');
+    }
+
+    await writer.commit();
+    console.log(`[ExcelHandler] Scritti ${results.length} risultati su ${written} righe`);
+  }
+
+  /**
+   * Worksheet name for the streaming copy (falls back to a generated name)
+   */
+  private getStreamSheetName(
+    reader: ExcelJS.stream.xlsx.WorkbookReader,
+    worksheetReader: ExcelJS.stream.xlsx.WorksheetReader,
+    sheetNumber: number
+  ): string {
+    // The streaming reader only exposes sheet names through the parsed workbook model
+    const model = (reader as unknown as { model?: { sheets?: Array<{ name?: string }> } }).model;
+    const id = (worksheetReader as unknown as { id?: number }).id || sheetNumber;
+    const name = model?.sheets?.[id - 1]?.name;
+    if (name) {
+      return name;
+    }
+
+    console.warn(`[ExcelHandler] Nome del foglio ${sheetNumber} non disponibile in streaming, salvato come Foglio${sheetNumber}`);
+    return `Foglio${sheetNumber}`;
+  }
+
+  /**
+   * Last column holding a cell in any row of the first worksheet (streaming pass)
+   */
+  private async getLastUsedColumn(filePath: string): Promise<number> {
+    const reader = new ExcelJS.stream.xlsx.WorkbookReader(filePath, {
+      worksheets: 'emit',
+      sharedStrings: 'ignore',
+      hyperlinks: 'ignore',
+      styles: 'ignore',
+      entries: 'ignore'
+    });
+
+    let lastColumn = 0;
+    for await (const worksheetReader of reader) {
+      for await (const row of worksheetReader) {
+        lastColumn = Math.max(lastColumn, row.cellCount);
+      }
+
+      // Only the first worksheet receives the results
+      break;
+    }
+
+    return lastColumn;
+  }
+
+  /**
+   * Backup filename next to the original file
+   */
+  private getBackupPath(originalFilePath: string): string {
+    const timestamp = new Date().toISOString().replace(/[:.]/g, '-').slice(0, -5);
+    const parsed = path.parse(originalFilePath);
+    return path.join(parsed.dir, `${parsed.name}_output_${timestamp}${parsed.ext}`);
+  }
+
   /**
    * Create a backup file when original is read-only
    */
   private async createBackupFile(originalFilePath: string): Promise<string | null> {
     try {
-      const workbook = new ExcelJS.Workbook();
-      await workbook.xlsx.readFile(originalFilePath);
+      const backupPath = this.getBackupPath(originalFilePath);
 
-      // Create backup filename
-      const timestamp = new Date().toISOString().replace(/[:.]/g, '-').slice(0, -5);
-      const parsed = path.parse(originalFilePath);
-      const backupPath = path.join(parsed.dir, `${parsed.name}_output_${timestamp}${parsed.ext}`);
-
-      // Save backup
-      await workbook.xlsx.writeFile(backupPath);
+      // Byte-level copy, no need to parse the workbook
+      await fs.promises.copyFile(originalFilePath, backupPath);
       console.log(`[ExcelHandler] Backup creato: ${backupPath}`);
 
       return backupPath;
@@ -222,39 +612,13 @@ export class ExcelHandler {
    */
   private async writeResultsToSheet(
     worksheet: ExcelJS.Worksheet,
-    results: ProcessingResult[]
+    results: ProcessingResult[],
+    sourceFilePath: string
   ): Promise<boolean> {
     try {
-      // Column mapping - ALL 11 columns!
-      const colNameMap: Record<string, string> = {
-        'Taric': COL_TARIC,
-        'Stato': COL_STATO,
-        'Protocollo ingresso': COL_PROTOCOLLO_INGRESSO,
-        'Inserita il': COL_INSERITA_IL,
-        'Protocollo uscita': COL_PROTOCOLLO,
-        'Provvedimento': COL_PROVVEDIMENTO,
-        'Data Provvedimento': COL_DATA_PROVV,
-        'Codice richiesta (risultato)': COL_CODICE_RIS,
-        'Tipo pratica': COL_TIPO_PRATICA,
-        'Note Usmaf': COL_NOTE,
-        'Invio SUD': COL_INVIO_SUD
-      };
-
-      const outputConfigKeys = [
-        'Taric', 'Stato', 'Protocollo ingresso', 'Inserita il',
-        'Protocollo uscita', 'Provvedimento', 'Data Provvedimento',
-        'Codice richiesta (risultato)', 'Tipo pratica', 'Note Usmaf', 'Invio SUD'
-      ];
-
       // Get existing headers
       const headerRow = worksheet.getRow(1);
-      const existingHeaders: Record<string, number> = {};
-
-      headerRow.eachCell((cell, colNumber) => {
-        if (cell.value && typeof cell.value === 'string') {
-          existingHeaders[cell.value.trim().toLowerCase()] = colNumber;
-        }
-      });
+      const existingHeaders = this.readHeaders(headerRow);
 
       // Find search column
       const ricercaColIdx = existingHeaders[COL_RICERCA.toLowerCase()];
@@ -263,63 +627,36 @@ export class ExcelHandler {
         return false;
       }
 
-      // Determine next available column
-      let nextAvailableColIdx = worksheet.columnCount + 1;
-
-      // Map column indices
-      const finalColIndices: Record<string, number> = {};
-
       // Find or create output columns
-      for (const configKey of outputConfigKeys) {
-        const excelHeaderName = colNameMap[configKey];
-        const excelHeaderNameLower = excelHeaderName.toLowerCase();
+      const finalColIndices = this.resolveOutputColumns(headerRow, existingHeaders, worksheet.columnCount + 1);
 
-        if (existingHeaders[excelHeaderNameLower]) {
-          // Column exists
-          finalColIndices[configKey] = existingHeaders[excelHeaderNameLower];
-        } else {
-          // Column missing, add it
-          finalColIndices[configKey] = nextAvailableColIdx;
-
-          // Add header
-          const headerCell = worksheet.getRow(1).getCell(nextAvailableColIdx);
-          headerCell.value = excelHeaderName;
-          headerCell.font = { bold: true };
+      const rowIndex = await this.getRowIndex(worksheet, ricercaColIdx, sourceFilePath);
 
-          nextAvailableColIdx++;
-        }
-      }
+      const notFound: string[] = [];
+      let rowsWritten = 0;
 
       // Write results
       for (const result of results) {
-        const code = result['Input Code'];
-        console.log(`[ExcelHandler] Processando risultato per codice: ${code}`);
+        const code = result['Input Code'].trim();
 
-        const rowIdx = this.findRowForCode(worksheet, ricercaColIdx, code);
-        if (rowIdx === null) {
-          console.warn(`[ExcelHandler] Riga non trovata per codice: ${code}`);
+        const rows = rowIndex.get(code);
+        if (!rows) {
+          notFound.push(code);
           continue;
         }
 
-        const row = worksheet.getRow(rowIdx);
-
-        // Write result data
-        for (const configKey of outputConfigKeys) {
-          if (finalColIndices[configKey]) {
-            const colIdx = finalColIndices[configKey];
-            const cell = row.getCell(colIdx);
-
-            // Special handling for Note Usmaf column
-            if (configKey === 'Note Usmaf') {
-              const noteValue = result[configKey] || '';
-              cell.value = noteValue.trim() ? noteValue : 'NOTA USMAF';
-            } else {
-              cell.value = result[configKey as keyof ProcessingResult] || '';
-            }
-          }
+        // Fan out to every row containing the code (duplicates)
+        for (const rowNumber of rows) {
+          this.writeResultToRow(worksheet.getRow(rowNumber), result, finalColIndices);
         }
+        rowsWritten += rows.length;
       }
 
+      if (notFound.length > 0) {
+        console.warn(`[ExcelHandler] Riga non trovata per ${notFound.length} codici: ${notFound.slice(0, 10).join(', ')}${notFound.length > 10 ? ', ...' : ''}`);
+      }
+      console.log(`[ExcelHandler] Scritti ${results.length - notFound.length}/${results.length} risultati su ${rowsWritten} righe`);
+
       return true;
 
     } catch (error) {
@@ -329,30 +666,75 @@ export class ExcelHandler {
   }
 
   /**
-   * Find the row index for a specific code
+   * Header name (lowercase) -> column index of a header row
    */
-  private findRowForCode(
-    worksheet: ExcelJS.Worksheet,
-    searchColIdx: number,
-    code: string
-  ): number | null {
-    console.log(`[ExcelHandler] Ricerca codice '${code}' nella colonna ${searchColIdx}`);
+  private readHeaders(headerRow: ExcelJS.Row): Record<string, number> {
+    const existingHeaders: Record<string, number> = {};
 
-    for (let rowNumber = 2; rowNumber <= worksheet.rowCount; rowNumber++) {
-      const row = worksheet.getRow(rowNumber);
-      const cell = row.getCell(searchColIdx);
-
-      if (cell.value) {
-        const cellValueStr = String(cell.value).trim();
-        if (cellValueStr === code.trim()) {
-          console.log(`[ExcelHandler] Codice trovato nella riga ${rowNumber}`);
-          return rowNumber;
-        }
+    headerRow.eachCell((cell, colNumber) => {
+      if (cell.value && typeof cell.value === 'string') {
+        existingHeaders[cell.value.trim().toLowerCase()] = colNumber;
+      }
+    });
+
+    return existingHeaders;
+  }
+
+  /**
+   * Map each output field to its column, adding missing headers from nextAvailableColIdx
+   */
+  private resolveOutputColumns(
+    headerRow: ExcelJS.Row,
+    existingHeaders: Record<string, number>,
+    nextAvailableColIdx: number
+  ): Record<string, number> {
+    const finalColIndices: Record<string, number> = {};
+
+    for (const configKey of OUTPUT_CONFIG_KEYS) {
+      const excelHeaderName = COL_NAME_MAP[configKey];
+      const excelHeaderNameLower = excelHeaderName.toLowerCase();
+
+      if (existingHeaders[excelHeaderNameLower]) {
+        // Column exists
+        finalColIndices[configKey] = existingHeaders[excelHeaderNameLower];
+      } else {
+        // Column missing, add it
+        finalColIndices[configKey] = nextAvailableColIdx;
+
+        // Add header
+        const headerCell = headerRow.getCell(nextAvailableColIdx);
+        headerCell.value = excelHeaderName;
+        headerCell.font = { bold: true };
+
+        nextAvailableColIdx++;
       }
     }
 
-    console.warn(`[ExcelHandler] Codice '${code}' non trovato in nessuna riga`);
-    return null;
+    return finalColIndices;
+  }
+
+  /**
+   * Write one result into its row
+   */
+  private writeResultToRow(
+    row: ExcelJS.Row,
+    result: ProcessingResult,
+    finalColIndices: Record<string, number>
+  ): void {
+    for (const configKey of OUTPUT_CONFIG_KEYS) {
+      if (finalColIndices[configKey]) {
+        const colIdx = finalColIndices[configKey];
+        const cell = row.getCell(colIdx);
+
+        // Special handling for Note Usmaf column
+        if (configKey === 'Note Usmaf') {
+          const noteValue = result[configKey] || '';
+          cell.value = noteValue.trim() ? noteValue : 'NOTA USMAF';
+        } else {
+          cell.value = result[configKey as keyof ProcessingResult] || '';
+        }
+      }
+    }
   }
 
   /**
@@ -375,6 +757,7 @@ export class ExcelHandler {
   reset(): void {
     this.currentFilePath = null;
     this.codes = [];
+    this.rowIndex = null;
   }
 }
 
@@ -4,6 +4,7 @@ import * as path from 'path';
 import * as fs from 'fs';
 import * as os from 'os';
 import { processingOrchestrator } from './workers/processor';
+import { BatchOptions, parseBatchArgs, runBatch } from './batch-runner';
 
 // ===== CRITICAL: Error handling BEFORE any other code =====
 process.on('uncaughtException', (error) => {
@@ -52,6 +53,21 @@ try {
   // Continue anyway - app might still work with memory partition
 }
 
+// ===== HEADLESS BATCH MODE: electron . --batch input.xlsx =====
+// No splash, renderer or auto-update: only a hidden lookup window (see batch-runner.ts)
+let batchOptions: BatchOptions | null = null;
+try {
+  batchOptions = parseBatchArgs(process.argv);
+} catch (error) {
+  console.error('[Batch]', error instanceof Error ? error.message : error);
+  process.exit(2);
+}
+
+if (batchOptions) {
+  // Nothing is displayed: skip GPU process work
+  app.disableHardwareAcceleration();
+}
+
 let mainWindow: BrowserWindow | null = null;
 let splashWindow: BrowserWindow | null = null;
 
@@ -252,6 +268,16 @@ function setupAutoUpdater() {
 
 // App lifecycle
 app.on('ready', () => {
+  if (batchOptions) {
+    runBatch(batchOptions)
+      .then(code => app.exit(code))
+      .catch(error => {
+        console.error('[Batch] Fatal error:', error);
+        app.exit(1);
+      });
+    return;
+  }
+
   createSplashScreen();
   // Start creating main window immediately
   createMainWindow();
@@ -262,6 +288,11 @@ app.on('ready', () => {
 });
 
 app.on('window-all-closed', () => {
+  // Batch mode exits with its own exit code once the run is over
+  if (batchOptions) {
+    return;
+  }
+
   // On macOS, keep app active until user quits explicitly
   if (process.platform !== 'darwin') {
     app.quit();
@@ -270,7 +301,7 @@ app.on('window-all-closed', () => {
 
 app.on('activate', () => {
   // On macOS, re-create window when dock icon is clicked
-  if (BrowserWindow.getAllWindows().length === 0) {
+  if (!batchOptions && BrowserWindow.getAllWindows().length === 0) {
     createSplashScreen();
     createMainWindow(); // BrowserView will be initialized inside createMainWindow()
   }
@@ -0,0 +1,114 @@
+/**
+ * Coalescing event bus from main to renderer
+ * Progress, status, badge, worker, rate and throughput updates keep only their latest value,
+ * log lines are accumulated; everything is flushed as a single 'ipc-batch'
+ * message at most every IPC_FLUSH_INTERVAL_MS.
+ */
+
+import { BrowserWindow } from 'electron';
+import { BadgeStats, IpcBatch, RateStats, ThroughputStats, WorkerStats } from '../shared/types/processing-types';
+import { IPC_FLUSH_INTERVAL_MS } from '../shared/constants/config';
+
+export class IpcEventBus {
+  private window: BrowserWindow | null = null;
+  private pending: IpcBatch = { logs: [] };
+  private timer: NodeJS.Timeout | null = null;
+
+  /**
+   * Set the window receiving the batches
+   */
+  setWindow(window: BrowserWindow): void {
+    this.window = window;
+  }
+
+  /**
+   * Queue a progress update (latest wins)
+   */
+  progress(current: number, total: number): void {
+    this.pending.progress = { current, total };
+    this.schedule();
+  }
+
+  /**
+   * Queue a status update (latest wins)
+   */
+  status(status: string): void {
+    this.pending.status = status;
+    this.schedule();
+  }
+
+  /**
+   * Queue a badge update (latest wins)
+   */
+  badges(badges: BadgeStats): void {
+    this.pending.badges = { ...badges };
+    this.schedule();
+  }
+
+  /**
+   * Queue per-worker stats (latest wins)
+   */
+  workerStats(stats: WorkerStats[]): void {
+    this.pending.workerStats = stats;
+    this.schedule();
+  }
+
+  /**
+   * Queue adaptive rate controller stats (latest wins)
+   */
+  rate(stats: RateStats): void {
+    this.pending.rate = stats;
+    this.schedule();
+  }
+
+  /**
+   * Queue live throughput and ETA (latest wins)
+   */
+  throughput(stats: ThroughputStats): void {
+    this.pending.throughput = stats;
+    this.schedule();
+  }
+
+  /**
+   * Queue a log line
+   */
+  log(message: string): void {
+    this.pending.logs.push(message);
+    this.schedule();
+  }
+
+  /**
+   * Send queued events now
+   * Call before one-off events (completion) so the renderer sees the final state first.
+   */
+  flush(): void {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+
+    const batch = this.pending;
+    this.pending = { logs: [] };
+
+    const isEmpty = batch.logs.length === 0 &&
+      batch.progress === undefined &&
+      batch.status === undefined &&
+      batch.badges === undefined &&
+      batch.workerStats === undefined &&
+      batch.rate === undefined &&
+      batch.throughput === undefined;
+
+    if (!isEmpty && this.window && !this.window.isDestroyed()) {
+      this.window.webContents.send('ipc-batch', batch);
+    }
+  }
+
+  private schedule(): void {
+    if (!this.timer) {
+      this.timer = setTimeout(() => this.flush(), IPC_FLUSH_INTERVAL_MS);
+    }
+  }
+}
+
+// Export singleton instance
+export const ipcEventBus = new IpcEventBus();
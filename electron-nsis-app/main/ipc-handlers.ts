@@ -2,6 +2,7 @@ import { ipcMain, dialog, app } from 'electron';
 import { autoUpdater } from 'electron-updater';
 import { excelHandler } from './excel/excel-handler';
 import { ExcelData } from '../shared/types/excel-types';
+import { ProcessingOptions } from '../shared/types/processing-types';
 
 // File selection handler
 ipcMain.handle('select-file', async () => {
@@ -32,10 +33,15 @@ ipcMain.handle('load-excel', async (_event, filePath: string): Promise<ExcelData
     // Extract column names (for now, just return basic info)
     const columns: string[] = [];
 
+    // Results left by an interrupted run on this file
+    const resumable = await checkpointJournal.readCompleted(filePath);
+    const resumableCount = new Set(result.codes.filter(code => resumable.has(code))).size;
+
     return {
       codes: result.codes,
       columns: columns,
-      filePath: filePath
+      filePath: filePath,
+      resumableCount: resumableCount
     };
   } catch (error) {
     console.error('[IPC] Errore caricamento Excel:', error);
@@ -66,7 +72,9 @@ ipcMain.handle('save-excel', async (_event, filePath: string, data: any) => {
 
 // Import processing orchestrator
 import { processingOrchestrator } from './workers/processor';
-import { excelHandler as excelHandlerInstance } from './excel/excel-handler';
+import { runProcessingJob } from './workers/processing-job';
+import { checkpointJournal } from './workers/checkpoint-journal';
+import { logFile } from './log-file';
 
 // Store the webview webContents ID for automation
 let webviewWebContentsId: number | null = null;
@@ -80,24 +88,18 @@ ipcMain.on('register-webview', (_event, webContentsId: number) => {
 });
 
 // Processing handlers
-ipcMain.on('start-processing', async (_event, codes: string[]) => {
-  console.log('[IPC] Start processing codes:', codes.length);
+ipcMain.on('start-processing', async (_event, codes: string[], options?: ProcessingOptions) => {
+  console.log('[IPC] Start processing codes:', codes.length, options);
 
   try {
-    // Start processing
-    const results = await processingOrchestrator.startProcessing(codes);
-
-    // Save results to Excel
-    const currentFilePath = excelHandlerInstance.getCurrentFilePath();
-    if (currentFilePath && results.length > 0) {
-      console.log('[IPC] Saving results to Excel...');
-      const saveResult = await excelHandlerInstance.saveResultsToExcel(results, currentFilePath);
-
-      if (saveResult.success) {
-        console.log('[IPC] Results saved successfully:', saveResult.outputPath);
-      } else {
-        console.error('[IPC] Failed to save results:', saveResult.error);
-      }
+    // Process codes: results are journaled and saved to Excel in batches
+    const job = await runProcessingJob(codes, options);
+
+    if (job.outputPath) {
+      console.log('[IPC] Results saved successfully:', job.outputPath);
+    }
+    if (!job.completed) {
+      console.log(`[IPC] Run not completed (${job.results.length} codes done), checkpoint kept for resume`);
     }
   } catch (error) {
     console.error('[IPC] Processing error:', error);
@@ -109,6 +111,11 @@ ipcMain.on('stop-processing', () => {
   processingOrchestrator.stopProcessing();
 });
 
+// Renderer log lines go to the same rotating log file as processing logs
+ipcMain.on('write-log', (_event, message: string) => {
+  logFile.write(message);
+});
+
 // WebView navigation handlers
 import { browserViewManager } from './browser-view-manager';
 
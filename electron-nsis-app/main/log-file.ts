@@ -0,0 +1,116 @@
+/**
+ * Rotating log file for processing logs
+ * Lines go to userData/logs/processing.log; when the file exceeds
+ * LOG_FILE_MAX_BYTES it is rotated to processing.1.log ... processing.N.log.
+ */
+
+import { app } from 'electron';
+import * as fs from 'fs';
+import * as path from 'path';
+import { LOG_FILE_MAX_BYTES, LOG_FILE_MAX_FILES } from '../shared/constants/config';
+
+export class RotatingLogFile {
+  private stream: fs.WriteStream | null = null;
+  private filePath: string = '';
+  private bytesWritten: number = 0;
+  private rotating: boolean = false;
+  private backlog: string[] = [];
+
+  constructor(private readonly baseName: string = 'processing') {}
+
+  /**
+   * Append a log line
+   */
+  write(message: string): void {
+    this.writeLine(`${new Date().toISOString()} ${message}\n`);
+  }
+
+  /**
+   * Close the file
+   */
+  close(): void {
+    if (this.stream) {
+      this.stream.end();
+      this.stream = null;
+    }
+  }
+
+  private writeLine(line: string): void {
+    // Lines written while the file is being rotated are kept until it reopens
+    if (this.rotating) {
+      this.backlog.push(line);
+      return;
+    }
+
+    try {
+      if (!this.stream) {
+        this.open();
+      }
+
+      this.stream!.write(line);
+      this.bytesWritten += Buffer.byteLength(line);
+
+      if (this.bytesWritten >= LOG_FILE_MAX_BYTES) {
+        this.rotate();
+      }
+    } catch (error) {
+      console.error('[LogFile] Error writing log file:', error);
+    }
+  }
+
+  private open(): void {
+    const logDir = path.join(app.getPath('userData'), 'logs');
+    fs.mkdirSync(logDir, { recursive: true });
+
+    this.filePath = path.join(logDir, `${this.baseName}.log`);
+    this.bytesWritten = fs.existsSync(this.filePath) ? fs.statSync(this.filePath).size : 0;
+
+    this.stream = fs.createWriteStream(this.filePath, { flags: 'a', encoding: 'utf8' });
+    this.stream.on('error', (error) => {
+      console.error('[LogFile] Error writing log file:', error);
+    });
+  }
+
+  /**
+   * processing.log -> processing.1.log -> ... (oldest dropped)
+   * Files are renamed once the stream is closed (Windows cannot rename open files).
+   */
+  private rotate(): void {
+    const stream = this.stream;
+    this.stream = null;
+    this.rotating = true;
+
+    const finish = () => {
+      try {
+        const dir = path.dirname(this.filePath);
+        const rotated = (n: number) => path.join(dir, `${this.baseName}.${n}.log`);
+
+        fs.rmSync(rotated(LOG_FILE_MAX_FILES), { force: true });
+        for (let n = LOG_FILE_MAX_FILES - 1; n >= 1; n--) {
+          if (fs.existsSync(rotated(n))) {
+            fs.renameSync(rotated(n), rotated(n + 1));
+          }
+        }
+        fs.renameSync(this.filePath, rotated(1));
+      } catch (error) {
+        console.error('[LogFile] Error rotating log file:', error);
+      }
+
+      this.rotating = false;
+      const backlog = this.backlog;
+      this.backlog = [];
+      for (const line of backlog) {
+        this.writeLine(line);
+      }
+    };
+
+    if (stream) {
+      stream.end(finish);
+    } else {
+      finish();
+    }
+  }
+}
+
+// Export singleton instance
+export const logFile = new RotatingLogFile();
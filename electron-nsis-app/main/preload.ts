@@ -1,4 +1,5 @@
 import { contextBridge, ipcRenderer, IpcRendererEvent } from 'electron';
+import { IpcBatch, ProcessingOptions } from '../shared/types/processing-types';
 
 // Expose protected methods to renderer process
 contextBridge.exposeInMainWorld('electronAPI', {
@@ -13,9 +14,12 @@ contextBridge.exposeInMainWorld('electronAPI', {
   saveExcel: (filePath: string, data: any) => ipcRenderer.invoke('save-excel', filePath, data),
 
   // Processing
-  startProcessing: (codes: string[]) => ipcRenderer.send('start-processing', codes),
+  startProcessing: (codes: string[], options?: ProcessingOptions) => ipcRenderer.send('start-processing', codes, options),
   stopProcessing: () => ipcRenderer.send('stop-processing'),
 
+  // Logs
+  writeLog: (message: string) => ipcRenderer.send('write-log', message),
+
   // Event listeners
   onFileSelected: (callback: (filePath: string) => void) => {
     const subscription = (_event: IpcRendererEvent, filePath: string) => callback(filePath);
@@ -29,28 +33,11 @@ contextBridge.exposeInMainWorld('electronAPI', {
     return () => ipcRenderer.removeListener('excel-loaded', subscription);
   },
 
-  onProgressUpdate: (callback: (data: { current: number; total: number }) => void) => {
-    const subscription = (_event: IpcRendererEvent, data: { current: number; total: number }) => callback(data);
-    ipcRenderer.on('progress-update', subscription);
-    return () => ipcRenderer.removeListener('progress-update', subscription);
-  },
-
-  onStatusUpdate: (callback: (status: string) => void) => {
-    const subscription = (_event: IpcRendererEvent, status: string) => callback(status);
-    ipcRenderer.on('status-update', subscription);
-    return () => ipcRenderer.removeListener('status-update', subscription);
-  },
-
-  onBadgeUpdate: (callback: (badges: any) => void) => {
-    const subscription = (_event: IpcRendererEvent, badges: any) => callback(badges);
-    ipcRenderer.on('badge-update', subscription);
-    return () => ipcRenderer.removeListener('badge-update', subscription);
-  },
-
-  onLogMessage: (callback: (message: string) => void) => {
-    const subscription = (_event: IpcRendererEvent, message: string) => callback(message);
-    ipcRenderer.on('log-message', subscription);
-    return () => ipcRenderer.removeListener('log-message', subscription);
+  // Coalesced progress/status/badge/worker updates and log lines
+  onIpcBatch: (callback: (batch: IpcBatch) => void) => {
+    const subscription = (_event: IpcRendererEvent, batch: IpcBatch) => callback(batch);
+    ipcRenderer.on('ipc-batch', subscription);
+    return () => ipcRenderer.removeListener('ipc-batch', subscription);
   },
 
   onProcessingComplete: (callback: () => void) => {
@@ -150,14 +137,12 @@ export interface ElectronAPI {
   selectFile: () => Promise<string | null>;
   loadExcel: (filePath: string) => Promise<any>;
   saveExcel: (filePath: string, data: any) => Promise<void>;
-  startProcessing: (codes: string[]) => void;
+  startProcessing: (codes: string[], options?: ProcessingOptions) => void;
   stopProcessing: () => void;
+  writeLog: (message: string) => void;
   onFileSelected: (callback: (filePath: string) => void) => () => void;
   onExcelLoaded: (callback: (data: any) => void) => () => void;
-  onProgressUpdate: (callback: (data: { current: number; total: number }) => void) => () => void;
-  onStatusUpdate: (callback: (status: string) => void) => () => void;
-  onBadgeUpdate: (callback: (badges: any) => void) => () => void;
-  onLogMessage: (callback: (message: string) => void) => () => void;
+  onIpcBatch: (callback: (batch: IpcBatch) => void) => () => void;
   onProcessingComplete: (callback: () => void) => () => void;
   registerWebView: (webContentsId: number) => void;
   // Auto-update
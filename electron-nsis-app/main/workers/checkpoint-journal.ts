@@ -0,0 +1,129 @@
+/**
+ * Checkpoint journal for processing runs
+ * Every result is appended to a per-file JSONL journal under userData/checkpoints
+ * as soon as it is produced, so an interrupted run can be resumed.
+ */
+
+import { app } from 'electron';
+import * as fs from 'fs';
+import * as path from 'path';
+import { createHash } from 'crypto';
+import { ProcessingResult } from '../../shared/types/excel-types';
+import { CHECKPOINT_DIR_NAME } from '../../shared/constants/config';
+
+interface JournalHeader {
+  type: 'header';
+  filePath: string;
+  startedAt: number;
+}
+
+export class CheckpointJournal {
+  private stream: fs.WriteStream | null = null;
+  private journalPath: string | null = null;
+
+  /**
+   * Journal path for an Excel file
+   */
+  private getJournalPath(filePath: string): string {
+    // Windows paths are case-insensitive
+    const key = createHash('sha1').update(path.resolve(filePath).toLowerCase()).digest('hex');
+    return path.join(app.getPath('userData'), CHECKPOINT_DIR_NAME, `${key}.jsonl`);
+  }
+
+  /**
+   * Read the successful results of a previous run on the file, keyed by code
+   * ERRORE results are not considered done and will be fetched again.
+   */
+  async readCompleted(filePath: string): Promise<Map<string, ProcessingResult>> {
+    const completed: Map<string, ProcessingResult> = new Map();
+
+    let content: string;
+    try {
+      content = await fs.promises.readFile(this.getJournalPath(filePath), 'utf8');
+    } catch {
+      return completed;
+    }
+
+    for (const line of content.split('\n')) {
+      if (!line.trim()) continue;
+
+      try {
+        const entry = JSON.parse(line) as ProcessingResult | JournalHeader;
+        if ('type' in entry) continue;
+
+        if (entry.Stato === 'ERRORE') {
+          completed.delete(entry['Input Code']);
+        } else {
+          completed.set(entry['Input Code'], entry);
+        }
+      } catch {
+        // Truncated last line from a crash - skip it
+      }
+    }
+
+    return completed;
+  }
+
+  /**
+   * Open the journal for a run
+   * Returns the results of the previous run when resuming; otherwise starts a new journal.
+   */
+  async open(filePath: string, resume: boolean): Promise<Map<string, ProcessingResult>> {
+    await this.close();
+
+    const completed = resume ? await this.readCompleted(filePath) : new Map<string, ProcessingResult>();
+
+    this.journalPath = this.getJournalPath(filePath);
+    await fs.promises.mkdir(path.dirname(this.journalPath), { recursive: true });
+
+    this.stream = fs.createWriteStream(this.journalPath, { flags: resume ? 'a' : 'w', encoding: 'utf8' });
+    this.stream.on('error', (error) => {
+      console.error('[Checkpoint] Error writing journal:', error);
+    });
+
+    if (!resume || completed.size === 0) {
+      const header: JournalHeader = { type: 'header', filePath, startedAt: Date.now() };
+      this.stream.write(JSON.stringify(header) + '\n');
+    }
+
+    console.log(`[Checkpoint] Journal opened: ${this.journalPath} (${completed.size} results resumed)`);
+    return completed;
+  }
+
+  /**
+   * Append a result
+   */
+  append(result: ProcessingResult): void {
+    if (this.stream) {
+      this.stream.write(JSON.stringify(result) + '\n');
+    }
+  }
+
+  /**
+   * Close the journal, keeping it on disk for a later resume
+   */
+  async close(): Promise<void> {
+    const stream = this.stream;
+    this.stream = null;
+
+    if (stream) {
+      await new Promise<void>(resolve => stream.end(() => resolve()));
+    }
+  }
+
+  /**
+   * Close and delete the journal (run completed and saved)
+   */
+  async discard(): Promise<void> {
+    await this.close();
+
+    if (this.journalPath) {
+      await fs.promises.rm(this.journalPath, { force: true });
+      console.log('[Checkpoint] Journal removed');
+      this.journalPath = null;
+    }
+  }
+}
+
+// Export singleton instance
+export const checkpointJournal = new CheckpointJournal();
@@ -0,0 +1,154 @@
+/**
+ * Processing job: runs the orchestrator on the loaded Excel file with
+ * checkpointing and batched write-back of the results
+ */
+
+import { processingOrchestrator } from './processor';
+import { checkpointJournal } from './checkpoint-journal';
+import { excelHandler } from '../excel/excel-handler';
+import { ProcessingResult } from '../../shared/types/excel-types';
+import { ProcessingOptions } from '../../shared/types/processing-types';
+import { CHECKPOINT_SAVE_EVERY, CHECKPOINT_SAVE_INTERVAL_MS } from '../../shared/constants/config';
+
+export interface ProcessingJobResult {
+  results: ProcessingResult[];
+  completed: boolean;
+  outputPath?: string;
+}
+
+/**
+ * Writes results back to the Excel file every CHECKPOINT_SAVE_EVERY results
+ * or CHECKPOINT_SAVE_INTERVAL_MS, whichever comes first
+ */
+class BatchedExcelWriter {
+  private results: Map<string, ProcessingResult> = new Map();
+  private unsaved: number = 0;
+  private saving: Promise<void> = Promise.resolve();
+  private timer: NodeJS.Timeout | null = null;
+  private outputPath: string | undefined;
+
+  constructor(private readonly filePath: string) {}
+
+  /**
+   * Start the periodic save timer
+   */
+  start(initial: Iterable<ProcessingResult>): void {
+    for (const result of initial) {
+      this.results.set(result['Input Code'], result);
+    }
+
+    this.timer = setInterval(() => {
+      if (this.unsaved > 0) {
+        void this.save();
+      }
+    }, CHECKPOINT_SAVE_INTERVAL_MS);
+  }
+
+  /**
+   * Add a result, saving when the batch is full
+   */
+  add(result: ProcessingResult): void {
+    this.results.set(result['Input Code'], result);
+    this.unsaved++;
+
+    if (this.unsaved >= CHECKPOINT_SAVE_EVERY) {
+      void this.save();
+    }
+  }
+
+  /**
+   * Stop the timer and write the final state
+   */
+  async finish(results: ProcessingResult[]): Promise<string | undefined> {
+    if (this.timer) {
+      clearInterval(this.timer);
+      this.timer = null;
+    }
+
+    for (const result of results) {
+      this.results.set(result['Input Code'], result);
+    }
+
+    await this.save(true);
+    return this.outputPath;
+  }
+
+  /**
+   * Save all results collected so far (saves never overlap)
+   */
+  private save(force: boolean = false): Promise<void> {
+    const pending = this.unsaved;
+    this.unsaved = 0;
+
+    this.saving = this.saving.then(async () => {
+      if (pending === 0 && !force) {
+        return;
+      }
+
+      const results = Array.from(this.results.values());
+      if (results.length === 0) {
+        return;
+      }
+
+      // After a first save to a copy (original read-only or locked) keep writing to it
+      const saveResult = await excelHandler.saveResultsToExcel(results, this.filePath, this.outputPath);
+      if (saveResult.success) {
+        this.outputPath = saveResult.outputPath;
+        console.log(`[ProcessingJob] Checkpoint salvato: ${results.length} risultati in ${saveResult.outputPath}`);
+      } else {
+        this.unsaved += pending;
+        console.error('[ProcessingJob] Failed to save results:', saveResult.error);
+      }
+    });
+
+    return this.saving;
+  }
+}
+
+/**
+ * Process codes of the loaded Excel file, journaling every result and writing
+ * results back in batches. With options.resume, codes already done in a previous
+ * interrupted run on the same file are skipped.
+ */
+export async function runProcessingJob(
+  codes: string[],
+  options: ProcessingOptions = {}
+): Promise<ProcessingJobResult> {
+  const filePath = excelHandler.getCurrentFilePath();
+
+  // No file loaded: plain run without checkpoints
+  if (!filePath) {
+    const results = await processingOrchestrator.startProcessing(codes, options);
+    return { results, completed: results.length === new Set(codes).size };
+  }
+
+  const resumed = await checkpointJournal.open(filePath, options.resume === true);
+  const writer = new BatchedExcelWriter(filePath);
+  writer.start(resumed.values());
+
+  let results: ProcessingResult[] = [];
+  let outputPath: string | undefined;
+  try {
+    results = await processingOrchestrator.startProcessing(codes, options, {
+      completed: resumed,
+      onResult: (result) => {
+        checkpointJournal.append(result);
+        writer.add(result);
+      }
+    });
+  } finally {
+    // Keep whatever was processed, even if the run failed
+    await checkpointJournal.close();
+    outputPath = await writer.finish(results);
+  }
+
+  // One result per unique code
+  const completed = results.length === new Set(codes).size;
+
+  // Journal is only needed to resume an unfinished run
+  if (completed && outputPath) {
+    await checkpointJournal.discard();
+  }
+
+  return { results, completed, outputPath };
+}
@@ -3,16 +3,22 @@
  */
 
 import { BrowserWindow } from 'electron';
-import { webViewAutomation } from '../automation/webview-automation';
+import { LookupEngine, TraceScope, parseCellsToResult } from '../automation/lookup-engine';
+import { WebViewWorkerPool } from './worker-pool';
+import { RateController } from './rate-controller';
+import { RunTracer } from './run-tracer';
+import { resultCache } from '../cache/result-cache';
+import { ipcEventBus } from '../ipc-event-bus';
+import { logFile } from '../log-file';
 import { ProcessingResult } from '../../shared/types/excel-types';
-
-export interface BadgeStats {
-  annullate: number;
-  aperte: number;
-  chiuse: number;
-  inLavorazione: number;
-  inviate: number;
-  eccezioni: number;
+import { BadgeStats, CircuitState, ProcessingOptions } from '../../shared/types/processing-types';
+import { DEFAULT_POOL_SIZE, MAX_POOL_SIZE } from '../../shared/constants/config';
+
+export interface ProcessingHooks {
+  /** Results already available from an interrupted run, keyed by code */
+  completed?: Map<string, ProcessingResult>;
+  /** Called for every new result (fetched or from cache) */
+  onResult?: (result: ProcessingResult) => void;
 }
 
 export class ProcessingOrchestrator {
@@ -20,6 +26,9 @@ export class ProcessingOrchestrator {
   private shouldStop: boolean = false;
   private mainWindow: BrowserWindow | null = null;
   private webViewContentsId: number | null = null;
+  private pool: WebViewWorkerPool | null = null;
+  private rateController: RateController | null = null;
+  private tracer: RunTracer | null = null;
   private results: ProcessingResult[] = [];
   private badges: BadgeStats = {
     annullate: 0,
@@ -27,7 +36,9 @@ export class ProcessingOrchestrator {
     chiuse: 0,
     inLavorazione: 0,
     inviate: 0,
-    eccezioni: 0
+    eccezioni: 0,
+    cacheHits: 0,
+    cacheMisses: 0
   };
 
   /**
@@ -35,6 +46,7 @@ export class ProcessingOrchestrator {
    */
   setMainWindow(window: BrowserWindow): void {
     this.mainWindow = window;
+    ipcEventBus.setWindow(window);
   }
 
   /**
@@ -47,114 +59,154 @@ export class ProcessingOrchestrator {
 
   /**
    * Start processing codes
+   * Duplicated codes are looked up once: one result is returned per unique code,
+   * in order of first appearance.
    */
-  async startProcessing(codes: string[]): Promise<ProcessingResult[]> {
+  async startProcessing(
+    inputCodes: string[],
+    options: ProcessingOptions = {},
+    hooks: ProcessingHooks = {}
+  ): Promise<ProcessingResult[]> {
     if (this.isProcessing) {
       console.warn('[Processor] Already processing');
       return [];
     }
 
-    console.log(`[Processor] Starting processing for ${codes.length} codes`);
+    const poolSize = Math.min(Math.max(Math.floor(options.poolSize || DEFAULT_POOL_SIZE), 1), MAX_POOL_SIZE);
+
+    const engineType = options.engine || 'dom';
+    const forceRefresh = options.forceRefresh === true;
+
+    // Deduplicate: each unique code is fetched once, the Excel writer fans
+    // its result out to every row containing it
+    const codes = Array.from(new Set(inputCodes));
+    const savedLookups = inputCodes.length - codes.length;
+
+    console.log(`[Processor] Starting processing for ${codes.length} codes (pool size: ${poolSize}, engine: ${engineType})`);
     this.isProcessing = true;
     this.shouldStop = false;
     this.results = [];
     this.resetBadges();
 
     try {
-      // Check if webview webContents ID is set
-      if (!this.webViewContentsId) {
-        throw new Error('WebView not registered. Please navigate to a page first.');
+      if (savedLookups > 0) {
+        this.sendLog(`Codici duplicati: ${codes.length} codici unici su ${inputCodes.length} righe (${savedLookups} ricerche risparmiate)`);
       }
 
-      // Initialize WebView automation with the visible webview's webContents ID
-      await webViewAutomation.initialize(this.webViewContentsId);
-
-      // Send initial progress
-      this.sendProgress(0, codes.length);
-      this.sendStatus('Inizializzazione completata');
-      this.sendLog('WebView inizializzata, avvio elaborazione...');
+      // Serve codes from the result cache first
+      await resultCache.load();
+      resultCache.resetStats();
+
+      const results: Array<ProcessingResult | undefined> = new Array(codes.length);
+      const pending: number[] = [];
+      let resumedCount = 0;
+
+      codes.forEach((code, index) => {
+        // Already done in the interrupted run being resumed
+        const resumed = hooks.completed?.get(code);
+        if (resumed) {
+          results[index] = resumed;
+          this.updateBadges(resumed.Stato);
+          resumedCount++;
+          return;
+        }
 
-      // Process each code
-      for (let i = 0; i < codes.length; i++) {
-        // Check if stop was requested
-        if (this.shouldStop) {
-          this.sendLog('Elaborazione interrotta dall\'utente');
-          break;
+        const cached = forceRefresh ? null : resultCache.get(code);
+        if (cached) {
+          const result = { ...cached, 'Input Code': code };
+          results[index] = result;
+          this.updateBadges(cached.Stato);
+          this.sendLog(`↺ ${code}: ${cached.Stato} (cache)`);
+          hooks.onResult?.(result);
+        } else {
+          pending.push(index);
         }
+      });
+
+      if (resumedCount > 0) {
+        this.sendLog(`Ripresa elaborazione: ${resumedCount} codici già elaborati saltati`);
+      }
+
+      this.badges.cacheHits = codes.length - resumedCount - pending.length;
+      this.badges.cacheMisses = pending.length;
+      this.sendBadgeUpdate();
+      this.sendLog(forceRefresh
+        ? 'Cache ignorata: tutti i codici verranno interrogati'
+        : `Cache: ${this.badges.cacheHits} codici dalla cache, ${pending.length} da interrogare`);
 
-        const code = codes[i];
-        this.sendLog(`Elaborazione codice ${i + 1}/${codes.length}: ${code}`);
-        this.sendStatus(`Elaborazione codice: ${code}`);
-
-        try {
-          // Fetch state for code
-          const fetchResult = await webViewAutomation.fetchStateForCode(code);
-
-          if (fetchResult.success && fetchResult.cells) {
-            // Parse result
-            const result = webViewAutomation.parseCellsToResult(code, fetchResult.cells);
-            this.results.push(result);
-
-            // Update badges
-            this.updateBadges(result.Stato);
-
-            // Log success
-            this.sendLog(`✓ ${code}: ${result.Stato}`);
-          } else {
-            // Log failure
-            this.sendLog(`✗ ${code}: ${fetchResult.error || 'Errore sconosciuto'}`);
-
-            // Create error result with all 11 columns
-            const errorResult: ProcessingResult = {
-              'Input Code': code,
-              'Taric': '',
-              'Stato': 'ERRORE',
-              'Protocollo ingresso': '',
-              'Inserita il': '',
-              'Protocollo uscita': '',
-              'Provvedimento': '',
-              'Data Provvedimento': '',
-              'Codice richiesta (risultato)': '',
-              'Tipo pratica': '',
-              'Note Usmaf': fetchResult.error || 'Errore durante elaborazione',
-              'Invio SUD': ''
-            };
-            this.results.push(errorResult);
-            this.badges.eccezioni++;
-          }
-
-        } catch (error) {
-          const errorMessage = error instanceof Error ? error.message : 'Errore sconosciuto';
-          this.sendLog(`✗ ${code}: ${errorMessage}`);
-
-          // Create error result with all 11 columns
-          const errorResult: ProcessingResult = {
-            'Input Code': code,
-            'Taric': '',
-            'Stato': 'ERRORE',
-            'Protocollo ingresso': '',
-            'Inserita il': '',
-            'Protocollo uscita': '',
-            'Provvedimento': '',
-            'Data Provvedimento': '',
-            'Codice richiesta (risultato)': '',
-            'Tipo pratica': '',
-            'Note Usmaf': errorMessage,
-            'Invio SUD': ''
-          };
-          this.results.push(errorResult);
-          this.badges.eccezioni++;
+      let completed = codes.length - pending.length;
+      this.sendProgress(completed, codes.length);
+
+      if (pending.length > 0) {
+        // Check if webview webContents ID is set
+        if (!this.webViewContentsId) {
+          throw new Error('WebView not registered. Please navigate to a page first.');
         }
 
-        // Update progress
-        this.sendProgress(i + 1, codes.length);
-        this.sendBadgeUpdate();
+        // Start worker pool: all workers share the visible webview's session
+        this.pool = new WebViewWorkerPool();
+        await this.pool.start(this.webViewContentsId, poolSize, engineType);
+
+        this.sendStatus('Inizializzazione completata');
+        this.sendLog(`WebView inizializzata (${this.pool.getSize()} sessioni), avvio elaborazione...`);
+
+        // Adaptive pacing, retries and circuit breaker shared by all workers
+        const rateController = new RateController(this.pool.getSize(), {
+          onCircuitChange: (state, pauseMs) => this.onCircuitChange(state, pauseMs)
+        });
+        this.rateController = rateController;
+        this.tracer = new RunTracer();
+        let fetched = 0;
+
+        // Process remaining codes in parallel, results are merged back in input order
+        await this.pool.run(
+          pending.map(index => codes[index]),
+          (engine, code, index, trace) => {
+            this.sendLog(`Elaborazione codice ${pending[index] + 1}/${codes.length}: ${code}`);
+            this.sendStatus(`Elaborazione codice: ${code}`);
+            return this.processCode(engine, code, rateController, trace);
+          },
+          () => this.shouldStop,
+          (result) => result.Stato === 'ERRORE',
+          (index, result) => {
+            results[pending[index]] = result;
+            resultCache.set(codes[pending[index]], result);
+            hooks.onResult?.(result);
+
+            completed++;
+            fetched++;
+            this.sendProgress(completed, codes.length);
+            this.sendThroughput(pending.length - fetched);
+            this.sendBadgeUpdate();
+            this.sendWorkerStats();
+            this.sendRateStats();
+          },
+          { rate: rateController, tracer: this.tracer }
+        );
+      }
+
+      this.results = results.filter((result): result is ProcessingResult => result !== undefined);
+
+      if (this.shouldStop) {
+        this.sendLog('Elaborazione interrotta dall\'utente');
+      }
 
-        // Small delay between requests
-        if (i < codes.length - 1 && !this.shouldStop) {
-          await new Promise(resolve => setTimeout(resolve, 500));
+      // Per-worker throughput summary
+      if (this.pool) {
+        for (const stats of this.pool.getStats()) {
+          this.sendLog(`Sessione ${stats.workerId + 1}: ${stats.processed} codici (${stats.codesPerMinute} codici/min, ${stats.errors} errori)`);
         }
       }
+      if (this.rateController) {
+        const rate = this.rateController.getStats();
+        this.sendLog(`Ritmo finale: ${rate.codesPerMinute} codici/min, latenza p50 ${rate.latencyP50Ms} ms / p95 ${rate.latencyP95Ms} ms, errori ${Math.round(rate.errorRate * 100)}%`);
+      }
+
+      // Per-stage latency summary and Chrome trace of the run
+      if (this.tracer && this.pool) {
+        await this.writeTrace(this.tracer, this.pool.getSize());
+        this.tracer = null;
+      }
 
       // Complete processing
       if (!this.shouldStop) {
@@ -163,7 +215,8 @@ export class ProcessingOrchestrator {
         this.sendProcessingComplete();
 
         // Show custom completion dialog
-        const message = `Processati ${this.results.length} codici su ${codes.length} totali.\n\nI risultati sono stati salvati nel file Excel.`;
+        const duplicatesNote = savedLookups > 0 ? ` (${inputCodes.length} righe, ${savedLookups} duplicati)` : '';
+        const message = `Processati ${this.results.length} codici su ${codes.length} totali${duplicatesNote}.\n\nI risultati sono stati salvati nel file Excel.`;
         this.sendCompletionDialog(message);
       }
 
@@ -178,12 +231,114 @@ export class ProcessingOrchestrator {
 
     } finally {
       // Cleanup
-      await webViewAutomation.cleanup();
+      await resultCache.flush();
+      if (this.tracer) {
+        // Failed run: keep its trace too
+        await this.writeTrace(this.tracer, this.pool ? this.pool.getSize() : 1);
+        this.tracer = null;
+      }
+      if (this.pool) {
+        await this.pool.shutdown();
+        this.pool = null;
+      }
+      this.rateController = null;
       this.isProcessing = false;
+      ipcEventBus.flush();
       console.log('[Processor] Processing finished');
     }
   }
 
+  /**
+   * Fetch and parse a single code on the given worker
+   */
+  private async processCode(
+    engine: LookupEngine,
+    code: string,
+    retry: RateController,
+    trace: TraceScope
+  ): Promise<ProcessingResult> {
+    try {
+      // Fetch state for code (retries and backoff driven by the rate controller)
+      const fetchResult = await engine.fetchStateForCode(code, retry, trace);
+
+      if (fetchResult.success && fetchResult.cells) {
+        // Parse result
+        const result = parseCellsToResult(code, fetchResult.cells);
+
+        // Update badges
+        this.updateBadges(result.Stato);
+
+        // Log success
+        this.sendLog(`✓ ${code}: ${result.Stato}`);
+        return result;
+      }
+
+      // Log failure
+      this.sendLog(`✗ ${code}: ${fetchResult.error || 'Errore sconosciuto'}`);
+      this.badges.eccezioni++;
+      return this.createErrorResult(code, fetchResult.error || 'Errore durante elaborazione');
+
+    } catch (error) {
+      const errorMessage = error instanceof Error ? error.message : 'Errore sconosciuto';
+      this.sendLog(`✗ ${code}: ${errorMessage}`);
+      this.badges.eccezioni++;
+      return this.createErrorResult(code, errorMessage);
+    }
+  }
+
+  /**
+   * Create error result with all 11 columns
+   */
+  private createErrorResult(code: string, note: string): ProcessingResult {
+    return {
+      'Input Code': code,
+      'Taric': '',
+      'Stato': 'ERRORE',
+      'Protocollo ingresso': '',
+      'Inserita il': '',
+      'Protocollo uscita': '',
+      'Provvedimento': '',
+      'Data Provvedimento': '',
+      'Codice richiesta (risultato)': '',
+      'Tipo pratica': '',
+      'Note Usmaf': note,
+      'Invio SUD': ''
+    };
+  }
+
+  /**
+   * Write the run's Chrome trace and log the slowest stages
+   * Tracing problems never fail the run.
+   */
+  private async writeTrace(tracer: RunTracer, workerCount: number): Promise<void> {
+    try {
+      for (const stage of tracer.getStageStats().slice(0, 6)) {
+        this.sendLog(`Fase ${stage.stage}: ${stage.count}× p50 ${stage.p50Ms} ms, p95 ${stage.p95Ms} ms, p99 ${stage.p99Ms} ms`);
+      }
+
+      const tracePath = await tracer.write(workerCount);
+      this.sendLog(`Profilo dell'elaborazione salvato in ${tracePath}`);
+    } catch (error) {
+      console.error('[Processor] Error writing trace:', error);
+    }
+  }
+
+  /**
+   * Circuit breaker transitions: tell the user why the run pauses or resumes
+   */
+  private onCircuitChange(state: CircuitState, pauseMs: number): void {
+    if (state === 'open') {
+      const seconds = Math.round(pauseMs / 1000);
+      this.sendLog(`⚠ Il portale non risponde correttamente: elaborazione in pausa per ${seconds}s`);
+      this.sendStatus(`Portale non disponibile, nuovo tentativo tra ${seconds}s`);
+    } else if (state === 'half-open') {
+      this.sendLog('Verifica disponibilità del portale...');
+    } else {
+      this.sendLog('Portale di nuovo disponibile, elaborazione ripresa');
+    }
+    this.sendRateStats();
+  }
+
   /**
    * Stop processing
    */
@@ -227,54 +382,75 @@ export class ProcessingOrchestrator {
       chiuse: 0,
       inLavorazione: 0,
       inviate: 0,
-      eccezioni: 0
+      eccezioni: 0,
+      cacheHits: 0,
+      cacheMisses: 0
     };
     this.sendBadgeUpdate();
   }
 
   /**
-   * Send progress update to renderer
+   * Send progress update to renderer (coalesced)
    */
   private sendProgress(current: number, total: number): void {
-    if (this.mainWindow && !this.mainWindow.isDestroyed()) {
-      this.mainWindow.webContents.send('progress-update', {
-        current,
-        total
-      });
-    }
+    ipcEventBus.progress(current, total);
   }
 
   /**
-   * Send status update to renderer
+   * Send status update to renderer (coalesced)
    */
   private sendStatus(status: string): void {
-    if (this.mainWindow && !this.mainWindow.isDestroyed()) {
-      this.mainWindow.webContents.send('status-update', status);
-    }
+    ipcEventBus.status(status);
   }
 
   /**
-   * Send badge update to renderer
+   * Send badge update to renderer (coalesced)
    */
   private sendBadgeUpdate(): void {
-    if (this.mainWindow && !this.mainWindow.isDestroyed()) {
-      this.mainWindow.webContents.send('badge-update', this.badges);
+    ipcEventBus.badges(this.badges);
+  }
+
+  /**
+   * Send per-worker throughput counters to renderer (coalesced)
+   */
+  private sendWorkerStats(): void {
+    if (this.pool) {
+      ipcEventBus.workerStats(this.pool.getStats());
     }
   }
 
   /**
-   * Send log message to renderer
+   * Send adaptive rate controller stats to renderer (coalesced)
    */
-  private sendLog(message: string): void {
-    if (this.mainWindow && !this.mainWindow.isDestroyed()) {
-      this.mainWindow.webContents.send('log-message', message);
+  private sendRateStats(): void {
+    if (this.rateController) {
+      ipcEventBus.rate(this.rateController.getStats());
     }
   }
 
+  /**
+   * Send live codes/min and ETA to renderer (coalesced)
+   */
+  private sendThroughput(remaining: number): void {
+    if (this.tracer) {
+      ipcEventBus.throughput(this.tracer.getThroughput(remaining));
+    }
+  }
+
+  /**
+   * Send log message to renderer (batched) and to the log file
+   */
+  private sendLog(message: string): void {
+    logFile.write(message);
+    ipcEventBus.log(message);
+  }
+
   /**
    * Send processing complete event to renderer
    */
   private sendProcessingComplete(): void {
+    // Deliver pending updates first, completion must come after the final progress
+    ipcEventBus.flush();
     if (this.mainWindow && !this.mainWindow.isDestroyed()) {
       this.mainWindow.webContents.send('processing-complete');
     }
@@ -284,6 +460,7 @@ export class ProcessingOrchestrator {
    * Send completion dialog event to renderer
    */
   private sendCompletionDialog(message: string): void {
+    ipcEventBus.flush();
     if (this.mainWindow && !this.mainWindow.isDestroyed()) {
       this.mainWindow.webContents.send('show-completion-dialog', message);
     }
@@ -0,0 +1,292 @@
+/**
+ * Adaptive rate controller for portal lookups
+ * Replaces the fixed pacing constants with feedback from the portal itself:
+ * - rolling window of attempt latencies/outcomes (histogram, p50/p95, error rate)
+ * - AIMD pacing and concurrency: additive increase while responses are healthy,
+ *   multiplicative decrease on errors or congestion (latency far above the best p50)
+ * - jittered exponential backoff between retries, fewer retries when most attempts fail
+ * - circuit breaker: after repeated consecutive failures the run pauses, then a
+ *   single probe decides whether to resume or pause again (doubling the pause)
+ */
+
+import { RetryPolicy } from '../automation/lookup-engine';
+import { CircuitState, RateStats } from '../../shared/types/processing-types';
+import {
+  MAX_RETRIES, DELAY_BETWEEN_RETRIES, DELAY_BETWEEN_CODES, FETCH_TIMEOUT_MS,
+  RATE_MIN_PER_SECOND, RATE_MAX_PER_SECOND, RATE_INCREASE_PER_SECOND, RATE_DECREASE_FACTOR,
+  RATE_WINDOW_SIZE, RATE_SLOW_FACTOR, RATE_SLOW_FLOOR_MS, RATE_LATENCY_BUCKETS_MS,
+  RETRY_BACKOFF_MAX_MS, RETRY_ERROR_RATE_LIMIT,
+  CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_OPEN_MS, CIRCUIT_MAX_OPEN_MS
+} from '../../shared/constants/config';
+
+const POLL_MS = 50;              // re-check interval while waiting for a slot
+const MAX_WAIT_SLICE_MS = 250;   // longest wait between stop checks
+const MIN_BASELINE_SAMPLES = 10; // attempts needed before the p50 baseline is trusted
+
+interface Attempt {
+  latencyMs: number;
+  success: boolean;
+}
+
+export interface RateControllerEvents {
+  /** Circuit breaker state changed; pauseMs is set when the circuit opens */
+  onCircuitChange?: (state: CircuitState, pauseMs: number) => void;
+}
+
+export class RateController implements RetryPolicy {
+  private window: Attempt[] = [];
+  private bestP50: number = Infinity;
+
+  private ratePerSecond: number;
+  private concurrency: number;
+  private active: number = 0;
+  private nextStartAt: number = 0;
+  private healthyStreak: number = 0;
+  private lastDecreaseAt: number = 0;
+
+  private circuit: CircuitState = 'closed';
+  private consecutiveFailures: number = 0;
+  private openMs: number = CIRCUIT_OPEN_MS;
+  private openUntil: number = 0;
+  private probeInFlight: boolean = false;
+
+  constructor(
+    private readonly maxConcurrency: number,
+    private readonly events: RateControllerEvents = {}
+  ) {
+    // Same pace as the former fixed gap, all sessions allowed at first
+    this.ratePerSecond = this.clampRate(1000 / DELAY_BETWEEN_CODES);
+    this.concurrency = Math.max(1, maxConcurrency);
+  }
+
+  /**
+   * Wait for a request slot (pace, concurrency limit and circuit breaker)
+   * Returns false if a stop was requested while waiting.
+   * Every successful acquire() must be paired with release().
+   */
+  async acquire(shouldStop: () => boolean): Promise<boolean> {
+    while (!shouldStop()) {
+      const now = Date.now();
+
+      if (this.circuit === 'open') {
+        if (now < this.openUntil) {
+          await this.sleep(Math.min(this.openUntil - now, MAX_WAIT_SLICE_MS));
+          continue;
+        }
+        this.setCircuit('half-open');
+      }
+
+      if (this.circuit === 'half-open') {
+        // Only one probe request, once every in-flight request has finished
+        if (this.probeInFlight || this.active > 0) {
+          await this.sleep(POLL_MS);
+          continue;
+        }
+        this.probeInFlight = true;
+        return this.take(now);
+      }
+
+      if (this.active >= this.concurrency) {
+        await this.sleep(POLL_MS);
+        continue;
+      }
+
+      if (now < this.nextStartAt) {
+        await this.sleep(Math.min(this.nextStartAt - now, MAX_WAIT_SLICE_MS));
+        continue;
+      }
+
+      return this.take(now);
+    }
+
+    return false;
+  }
+
+  /**
+   * Release a slot obtained with acquire()
+   */
+  release(): void {
+    this.active = Math.max(0, this.active - 1);
+    this.probeInFlight = false;
+  }
+
+  /**
+   * Retries allowed for the current attempt
+   * None while the circuit is not closed, one when most recent attempts fail
+   */
+  maxRetries(): number {
+    if (this.circuit !== 'closed') {
+      return 0;
+    }
+    return this.errorRate() > RETRY_ERROR_RATE_LIMIT ? Math.min(1, MAX_RETRIES) : MAX_RETRIES;
+  }
+
+  /**
+   * Exponential backoff with equal jitter: half fixed, half random
+   */
+  backoff(attempt: number): Promise<void> {
+    const ceiling = Math.min(RETRY_BACKOFF_MAX_MS, DELAY_BETWEEN_RETRIES * Math.pow(2, attempt - 1));
+    return this.sleep(ceiling / 2 + Math.random() * ceiling / 2);
+  }
+
+  /**
+   * Feed the outcome of one attempt into the window, pacing and circuit breaker
+   */
+  recordAttempt(latencyMs: number, transportFailure: boolean): void {
+    const success = !transportFailure;
+    this.window.push({ latencyMs, success });
+    if (this.window.length > RATE_WINDOW_SIZE) {
+      this.window.shift();
+    }
+
+    if (this.window.length >= MIN_BASELINE_SAMPLES) {
+      this.bestP50 = Math.min(this.bestP50, this.percentile(50));
+    }
+
+    if (success) {
+      this.consecutiveFailures = 0;
+      if (this.circuit === 'half-open') {
+        this.openMs = CIRCUIT_OPEN_MS;
+        this.setCircuit('closed');
+      }
+
+      if (latencyMs > this.slowThreshold()) {
+        this.decrease();
+      } else {
+        this.increase();
+      }
+      return;
+    }
+
+    this.consecutiveFailures++;
+    this.decrease();
+
+    if (this.circuit === 'half-open') {
+      this.openCircuit(Math.min(this.openMs * 2, CIRCUIT_MAX_OPEN_MS));
+    } else if (this.circuit === 'closed' && this.consecutiveFailures >= CIRCUIT_FAILURE_THRESHOLD) {
+      this.openCircuit(CIRCUIT_OPEN_MS);
+    }
+  }
+
+  /**
+   * Current pace, latency and circuit state for the UI
+   */
+  getStats(): RateStats {
+    const histogram = new Array(RATE_LATENCY_BUCKETS_MS.length + 1).fill(0);
+    for (const attempt of this.window) {
+      const bucket = RATE_LATENCY_BUCKETS_MS.findIndex(limit => attempt.latencyMs <= limit);
+      histogram[bucket === -1 ? RATE_LATENCY_BUCKETS_MS.length : bucket]++;
+    }
+
+    return {
+      codesPerMinute: Math.round(this.ratePerSecond * 60 * 10) / 10,
+      concurrency: this.circuit === 'closed' ? this.concurrency : 0,
+      maxConcurrency: this.maxConcurrency,
+      latencyP50Ms: Math.round(this.percentile(50)),
+      latencyP95Ms: Math.round(this.percentile(95)),
+      errorRate: Math.round(this.errorRate() * 1000) / 1000,
+      histogram,
+      circuit: this.circuit,
+      resumeAt: this.circuit === 'open' ? this.openUntil : null
+    };
+  }
+
+  /**
+   * Claim a slot and schedule the next request start
+   */
+  private take(now: number): boolean {
+    this.active++;
+    this.nextStartAt = Math.max(now, this.nextStartAt) + 1000 / this.ratePerSecond;
+    return true;
+  }
+
+  /**
+   * Additive increase: about +RATE_INCREASE_PER_SECOND codes/s per second,
+   * one more session after a full round of healthy responses
+   */
+  private increase(): void {
+    this.ratePerSecond = this.clampRate(this.ratePerSecond + RATE_INCREASE_PER_SECOND / this.ratePerSecond);
+
+    this.healthyStreak++;
+    if (this.healthyStreak >= this.concurrency && this.concurrency < this.maxConcurrency) {
+      this.concurrency++;
+      this.healthyStreak = 0;
+    }
+  }
+
+  /**
+   * Multiplicative decrease, at most once per typical response time so that
+   * the concurrent failures of a single congestion event count once
+   */
+  private decrease(): void {
+    this.healthyStreak = 0;
+
+    const now = Date.now();
+    const hold = Math.max(this.percentile(50), 1000);
+    if (now - this.lastDecreaseAt < hold) {
+      return;
+    }
+
+    this.lastDecreaseAt = now;
+    this.ratePerSecond = this.clampRate(this.ratePerSecond * RATE_DECREASE_FACTOR);
+    this.concurrency = Math.max(1, Math.floor(this.concurrency * RATE_DECREASE_FACTOR));
+  }
+
+  /**
+   * Pause the run; it restarts with a single session at a low pace
+   */
+  private openCircuit(pauseMs: number): void {
+    this.openMs = pauseMs;
+    this.openUntil = Date.now() + pauseMs;
+    this.concurrency = 1;
+    this.ratePerSecond = RATE_MIN_PER_SECOND;
+    this.nextStartAt = 0;
+    this.setCircuit('open');
+  }
+
+  private setCircuit(state: CircuitState): void {
+    if (this.circuit === state) {
+      return;
+    }
+
+    console.log(`[RateController] Circuit ${this.circuit} -> ${state}`);
+    this.circuit = state;
+    if (state !== 'open') {
+      this.consecutiveFailures = 0;
+    }
+    this.events.onCircuitChange?.(state, state === 'open' ? this.openMs : 0);
+  }
+
+  /**
+   * Latency above which a successful response still signals congestion
+   */
+  private slowThreshold(): number {
+    const baseline = isFinite(this.bestP50) ? this.bestP50 * RATE_SLOW_FACTOR : FETCH_TIMEOUT_MS;
+    return Math.max(RATE_SLOW_FLOOR_MS, baseline);
+  }
+
+  private percentile(p: number): number {
+    if (this.window.length === 0) {
+      return 0;
+    }
+
+    const sorted = this.window.map(attempt => attempt.latencyMs).sort((a, b) => a - b);
+    const rank = Math.min(sorted.length - 1, Math.ceil((p / 100) * sorted.length) - 1);
+    return sorted[Math.max(0, rank)];
+  }
+
+  private errorRate(): number {
+    if (this.window.length === 0) {
+      return 0;
+    }
+    return this.window.filter(attempt => !attempt.success).length / this.window.length;
+  }
+
+  private clampRate(rate: number): number {
+    return Math.min(RATE_MAX_PER_SECOND, Math.max(RATE_MIN_PER_SECOND, rate));
+  }
+
+  private sleep(ms: number): Promise<void> {
+    return new Promise(resolve => setTimeout(resolve, ms));
+  }
+}
@@ -0,0 +1,196 @@
+/**
+ * Per-stage latency tracing of a processing run
+ * Every lookup stage (pacing wait, input, click, navigation, result wait,
+ * HTTP request, retry backoff...) is recorded as a span per code and worker.
+ * Durations feed per-stage p50/p95/p99 summaries; at the end of the run the
+ * spans are written to userData/traces as a Chrome trace (chrome://tracing,
+ * Perfetto) with the stage summary in its metadata.
+ */
+
+import { app } from 'electron';
+import * as fs from 'fs';
+import * as path from 'path';
+import { performance } from 'perf_hooks';
+import { TraceScope } from '../automation/lookup-engine';
+import { StageStats, ThroughputStats } from '../../shared/types/processing-types';
+import {
+  TRACE_DIR_NAME, TRACE_MAX_FILES, TRACE_MAX_EVENTS, THROUGHPUT_WINDOW_MS
+} from '../../shared/constants/config';
+
+interface TraceEvent {
+  name: string;
+  cat: string;
+  ph: 'X' | 'M';
+  ts: number;
+  dur?: number;
+  pid: number;
+  tid: number;
+  args?: Record<string, unknown>;
+}
+
+const TRACE_PID = 1;
+
+export class RunTracer {
+  private events: TraceEvent[] = [];
+  private durations: Map<string, number[]> = new Map();
+  private completions: number[] = [];
+  private dropped: number = 0;
+  private readonly origin: number = performance.now();
+  private readonly startedAt: number = Date.now();
+
+  /**
+   * Span recorder for a code processed by a worker
+   * The span is recorded even if the stage throws.
+   */
+  scope(workerId: number, code: string): TraceScope {
+    return {
+      span: async <T>(stage: string, fn: () => Promise<T>): Promise<T> => {
+        const start = performance.now();
+        let failed = false;
+        try {
+          return await fn();
+        } catch (error) {
+          failed = true;
+          throw error;
+        } finally {
+          this.record(workerId, stage, start, performance.now() - start, failed ? { code, failed } : { code });
+        }
+      }
+    };
+  }
+
+  /**
+   * Record a span measured by the caller (start in performance.now() ms)
+   */
+  record(workerId: number, stage: string, start: number, durationMs: number, args?: Record<string, unknown>): void {
+    let durations = this.durations.get(stage);
+    if (!durations) {
+      durations = [];
+      this.durations.set(stage, durations);
+    }
+    durations.push(durationMs);
+
+    if (stage === 'code') {
+      this.completions.push(Date.now());
+    }
+
+    // Very long runs: keep the summaries exact, cap the trace file
+    if (this.events.length >= TRACE_MAX_EVENTS) {
+      this.dropped++;
+      return;
+    }
+
+    this.events.push({
+      name: stage,
+      cat: 'lookup',
+      ph: 'X',
+      ts: Math.round((start - this.origin) * 1000),
+      dur: Math.round(durationMs * 1000),
+      pid: TRACE_PID,
+      tid: workerId,
+      args
+    });
+  }
+
+  /**
+   * p50/p95/p99 and total time per stage, slowest stages first
+   */
+  getStageStats(): StageStats[] {
+    const stats: StageStats[] = [];
+
+    this.durations.forEach((durations, stage) => {
+      const sorted = [...durations].sort((a, b) => a - b);
+      const at = (p: number) => sorted[Math.min(sorted.length - 1, Math.max(0, Math.ceil((p / 100) * sorted.length) - 1))];
+
+      stats.push({
+        stage,
+        count: sorted.length,
+        p50Ms: Math.round(at(50)),
+        p95Ms: Math.round(at(95)),
+        p99Ms: Math.round(at(99)),
+        totalMs: Math.round(sorted.reduce((sum, value) => sum + value, 0))
+      });
+    });
+
+    return stats.sort((a, b) => b.totalMs - a.totalMs);
+  }
+
+  /**
+   * Live codes/min over the last THROUGHPUT_WINDOW_MS and ETA for the remaining codes
+   */
+  getThroughput(remaining: number): ThroughputStats {
+    const now = Date.now();
+    const elapsedMs = now - this.startedAt;
+    const windowStart = Math.max(this.startedAt, now - THROUGHPUT_WINDOW_MS);
+
+    // Completions are in time order: drop the ones before the window
+    let first = 0;
+    while (first < this.completions.length && this.completions[first] < windowStart) {
+      first++;
+    }
+    this.completions.splice(0, first);
+    const recent = this.completions.length;
+    const windowMs = Math.max(now - windowStart, 1);
+    const perMs = recent / windowMs;
+
+    return {
+      codesPerMinute: Math.round(perMs * 60000 * 10) / 10,
+      etaMs: remaining === 0 ? 0 : recent >= 3 ? Math.round(remaining / perMs) : null,
+      elapsedMs
+    };
+  }
+
+  /**
+   * Write the Chrome trace to userData/traces, pruning the oldest traces
+   * Returns the path of the written file.
+   */
+  async write(workerCount: number, label: string = 'run'): Promise<string> {
+    const traceDir = path.join(app.getPath('userData'), TRACE_DIR_NAME);
+    await fs.promises.mkdir(traceDir, { recursive: true });
+
+    const stamp = new Date(this.startedAt).toISOString().replace(/[:.]/g, '-');
+    const tracePath = path.join(traceDir, `${label}-${stamp}.json`);
+
+    const threadNames: TraceEvent[] = Array.from({ length: workerCount }, (_, id) => ({
+      name: 'thread_name',
+      cat: '__metadata',
+      ph: 'M',
+      ts: 0,
+      pid: TRACE_PID,
+      tid: id,
+      args: { name: `Sessione ${id + 1}` }
+    }));
+
+    const trace = {
+      traceEvents: [...threadNames, ...this.events],
+      displayTimeUnit: 'ms',
+      metadata: {
+        startedAt: new Date(this.startedAt).toISOString(),
+        durationMs: Date.now() - this.startedAt,
+        droppedEvents: this.dropped,
+        stages: this.getStageStats()
+      }
+    };
+
+    await fs.promises.writeFile(tracePath, JSON.stringify(trace), 'utf8');
+    await this.prune(traceDir);
+    return tracePath;
+  }
+
+  /**
+   * Keep only the newest TRACE_MAX_FILES traces
+   */
+  private async prune(traceDir: string): Promise<void> {
+    try {
+      const files = (await fs.promises.readdir(traceDir))
+        .filter(name => name.endsWith('.json'))
+        .sort();
+
+      for (const name of files.slice(0, Math.max(0, files.length - TRACE_MAX_FILES))) {
+        await fs.promises.unlink(path.join(traceDir, name));
+      }
+    } catch (error) {
+      console.error('[RunTracer] Error pruning traces:', error);
+    }
+  }
+}
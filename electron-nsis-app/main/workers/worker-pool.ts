@@ -0,0 +1,225 @@
+/**
+ * Pool of lookup workers sharing the logged-in NSIS session
+ * DOM engine: worker 0 drives the VISIBLE webview, extra workers run in hidden windows
+ * HTTP engine: all workers share one direct-request engine built from the webview session
+ */
+
+import { BrowserWindow, Session, webContents as allWebContents } from 'electron';
+import { performance } from 'perf_hooks';
+import { WebViewAutomation } from '../automation/webview-automation';
+import { HttpQueryEngine } from '../automation/http-query-engine';
+import { LookupEngine, TraceScope, noopTrace } from '../automation/lookup-engine';
+import { RateController } from './rate-controller';
+import { RunTracer } from './run-tracer';
+import { LookupEngineType, WorkerStats } from '../../shared/types/processing-types';
+
+interface PoolWorker {
+  id: number;
+  engine: LookupEngine;
+  window: BrowserWindow | null;
+  processed: number;
+  errors: number;
+}
+
+export type WorkerTask<T> = (engine: LookupEngine, code: string, index: number, trace: TraceScope) => Promise<T>;
+
+export interface PoolRunOptions {
+  /** Pacing/retry controller shared by the workers (default: a new one for this run) */
+  rate?: RateController;
+  /** Records a 'pacing' and a 'code' span per code, passed on to the task */
+  tracer?: RunTracer;
+}
+
+export class WebViewWorkerPool {
+  private workers: PoolWorker[] = [];
+  private startedAt: number = 0;
+
+  /**
+   * Start the pool of the given size on the page the user is currently on
+   */
+  async start(visibleWebContentsId: number, size: number, engineType: LookupEngineType = 'dom'): Promise<void> {
+    const visible = allWebContents.fromId(visibleWebContentsId);
+    if (!visible || visible.isDestroyed()) {
+      throw new Error(`WebContents with ID ${visibleWebContentsId} not found`);
+    }
+
+    const startUrl = visible.getURL();
+    console.log(`[WorkerPool] Starting ${size} ${engineType} worker(s) at URL: ${startUrl}`);
+
+    // HTTP engine: one shared engine, concurrency limited by its keep-alive sockets
+    if (engineType === 'http') {
+      const engine = await HttpQueryEngine.fromWebContents(visible, size);
+      this.workers = Array.from({ length: size }, (_, id) => ({ id, engine, window: null, processed: 0, errors: 0 }));
+      this.startedAt = Date.now();
+      return;
+    }
+
+    // Worker 0 always uses the visible webview
+    const primary = new WebViewAutomation();
+    await primary.initialize(visibleWebContentsId);
+    this.workers = [{ id: 0, engine: primary, window: null, processed: 0, errors: 0 }];
+
+    // Extra workers: hidden windows sharing the webview's session (cookies/login)
+    // Wait for every worker, so no window is left behind if one of them fails
+    const created = await Promise.allSettled(
+      Array.from({ length: size - 1 }, (_, i) => this.createHiddenWorker(i + 1, visible.session, startUrl))
+    );
+
+    for (const outcome of created) {
+      if (outcome.status === 'fulfilled') {
+        this.workers.push(outcome.value);
+      }
+    }
+
+    const failed = created.find((outcome): outcome is PromiseRejectedResult => outcome.status === 'rejected');
+    if (failed) {
+      console.error('[WorkerPool] Worker startup failed, shutting down the ready workers:', failed.reason);
+      await this.shutdown();
+      throw failed.reason;
+    }
+    this.workers.sort((a, b) => a.id - b.id);
+
+    this.startedAt = Date.now();
+    console.log(`[WorkerPool] ${this.workers.length} worker(s) ready`);
+  }
+
+  /**
+   * Create a hidden worker window on the given session
+   */
+  private async createHiddenWorker(
+    id: number,
+    session: Session,
+    startUrl: string
+  ): Promise<PoolWorker> {
+    const window = new BrowserWindow({
+      show: false,
+      width: 1280,
+      height: 720,
+      webPreferences: {
+        session: session,
+        nodeIntegration: false,
+        contextIsolation: true,
+        sandbox: true
+      }
+    });
+
+    // Prevent new windows/tabs - navigate in the same worker instead
+    window.webContents.setWindowOpenHandler(({ url }) => {
+      window.webContents.loadURL(url);
+      return { action: 'deny' };
+    });
+
+    const engine = new WebViewAutomation();
+    try {
+      await window.loadURL(startUrl);
+      await engine.initialize(window.webContents.id);
+    } catch (error) {
+      window.destroy();
+      throw error;
+    }
+    console.log(`[WorkerPool] Worker ${id} ready (webContents ${window.webContents.id})`);
+
+    return { id, engine, window, processed: 0, errors: 0 };
+  }
+
+  /**
+   * Run a task for every code, distributing codes across workers
+   * Requests are paced by the rate controller (shared by all workers);
+   * results are returned in input order; skipped codes (stop requested) are undefined
+   */
+  async run<T>(
+    codes: string[],
+    task: WorkerTask<T>,
+    shouldStop: () => boolean,
+    isError: (result: T) => boolean,
+    onResult?: (index: number, result: T) => void,
+    options: PoolRunOptions = {}
+  ): Promise<Array<T | undefined>> {
+    const rate = options.rate || new RateController(this.workers.length);
+    const tracer = options.tracer;
+    const results: Array<T | undefined> = new Array(codes.length);
+    let nextIndex = 0;
+
+    const runWorker = async (worker: PoolWorker): Promise<void> => {
+      while (nextIndex < codes.length) {
+        // Wait for the pace/concurrency slot before claiming a code
+        const waitStart = performance.now();
+        if (!(await rate.acquire(shouldStop))) {
+          return;
+        }
+
+        const index = nextIndex++;
+        if (index >= codes.length) {
+          rate.release();
+          return;
+        }
+
+        const code = codes[index];
+        tracer?.record(worker.id, 'pacing', waitStart, performance.now() - waitStart, { code });
+        const trace = tracer ? tracer.scope(worker.id, code) : noopTrace;
+
+        let result: T;
+        try {
+          result = await trace.span('code', () => task(worker.engine, code, index, trace));
+        } finally {
+          rate.release();
+        }
+
+        results[index] = result;
+        worker.processed++;
+        if (isError(result)) {
+          worker.errors++;
+        }
+
+        if (onResult) {
+          onResult(index, result);
+        }
+      }
+    };
+
+    await Promise.all(this.workers.map(worker => runWorker(worker)));
+    return results;
+  }
+
+  /**
+   * Per-worker throughput counters
+   */
+  getStats(): WorkerStats[] {
+    const elapsedMinutes = Math.max((Date.now() - this.startedAt) / 60000, 1 / 60000);
+
+    return this.workers.map(worker => ({
+      workerId: worker.id,
+      processed: worker.processed,
+      errors: worker.errors,
+      codesPerMinute: Math.round((worker.processed / elapsedMinutes) * 10) / 10
+    }));
+  }
+
+  /**
+   * Number of active workers
+   */
+  getSize(): number {
+    return this.workers.length;
+  }
+
+  /**
+   * Cleanup all workers and close hidden windows
+   * NOTE: Does NOT touch the visible webview page
+   */
+  async shutdown(): Promise<void> {
+    // Workers may share one engine, clean each engine up once
+    const engines = new Set(this.workers.map(worker => worker.engine));
+    for (const engine of engines) {
+      await engine.cleanup();
+    }
+
+    for (const worker of this.workers) {
+      if (worker.window && !worker.window.isDestroyed()) {
+        worker.window.destroy();
+      }
+    }
+
+    this.workers = [];
+    console.log('[WorkerPool] All workers shut down');
+  }
+}
@@ -1,10 +1,13 @@
-import React from 'react';
+import React, { useMemo } from 'react';
 import { useDispatch, useSelector } from 'react-redux';
 import { FileText, Loader2, Play, Square } from 'lucide-react';
 import { RootState } from '../store/store';
 import { setFilePath, setExcelData } from '../store/slices/data-slice';
 import { setState } from '../store/slices/app-slice';
-import { setProcessing, addLog, resetBadges } from '../store/slices/ui-slice';
+import { setProcessing, resetBadges, setPoolSize, setEngine, setForceRefresh, setResume, setWorkerStats, setRateStats, setThroughput } from '../store/slices/ui-slice';
+import { LookupEngineType } from '../../../shared/types/processing-types';
+import { MAX_POOL_SIZE } from '../../../shared/constants/config';
+import { addLog } from '../store/log-store';
 import { useIpc } from '../hooks/useIpc';
 import './ControlsSection.css';
 
@@ -14,7 +17,10 @@ const ControlsSection: React.FC = () => {
 
   const { state } = useSelector((state: RootState) => state.app);
   const { selectedFilePath, excel } = useSelector((state: RootState) => state.data);
-  const { progress } = useSelector((state: RootState) => state.ui);
+  const { progress, poolSize, engine, forceRefresh, resume } = useSelector((state: RootState) => state.ui);
+
+  // Duplicated codes are looked up only once
+  const uniqueCodeCount = useMemo(() => new Set(excel?.codes || []).size, [excel?.codes]);
 
   const canStart = excel && excel.codes && excel.codes.length > 0 && !progress.isProcessing;
 
@@ -22,26 +28,29 @@ const ControlsSection: React.FC = () => {
   const handleSelectFile = async () => {
     try {
       dispatch(setProcessing(true));
-      dispatch(addLog('Apertura dialog selezione file...'));
+      addLog('Apertura dialog selezione file...');
 
       const filePath = await ipc.selectFile();
 
       if (filePath) {
         dispatch(setFilePath(filePath));
-        dispatch(addLog(`File selezionato: ${filePath}`));
+        addLog(`File selezionato: ${filePath}`);
 
         // Carica il file Excel
-        dispatch(addLog('Caricamento file Excel...'));
+        addLog('Caricamento file Excel...');
         const excelData = await ipc.loadExcel(filePath);
 
         dispatch(setExcelData(excelData));
-        dispatch(addLog(`File caricato: ${excelData.codes?.length || 0} codici trovati`));
+        addLog(`File caricato: ${excelData.codes?.length || 0} codici trovati`);
+        if (excelData.resumableCount) {
+          addLog(`Trovata elaborazione interrotta: ${excelData.resumableCount} codici già elaborati`);
+        }
       } else {
-        dispatch(addLog('Selezione file annullata'));
+        addLog('Selezione file annullata');
       }
     } catch (error) {
       const message = error instanceof Error ? error.message : 'Errore sconosciuto';
-      dispatch(addLog(`Errore: ${message}`));
+      addLog(`Errore: ${message}`);
       console.error('Errore selezione file:', error);
     } finally {
       dispatch(setProcessing(false));
@@ -55,14 +64,18 @@ const ControlsSection: React.FC = () => {
     dispatch(setState('PROCESSING'));
     dispatch(setProcessing(true));
     dispatch(resetBadges());
-    dispatch(addLog(`Avvio elaborazione di ${excel.codes.length} codici...`));
+    dispatch(setWorkerStats([]));
+    dispatch(setRateStats(null));
+    dispatch(setThroughput(null));
+    addLog(`Avvio elaborazione di ${excel.codes.length} codici (${poolSize} sessioni)...`);
 
-    ipc.startProcessing(excel.codes);
+    const resumeRun = resume && (excel.resumableCount || 0) > 0;
+    ipc.startProcessing(excel.codes, { poolSize, engine, forceRefresh, resume: resumeRun });
   };
 
   // Stop processing handler
   const handleStop = () => {
-    dispatch(addLog('Interruzione elaborazione...'));
+    addLog('Interruzione elaborazione...');
     ipc.stopProcessing();
     dispatch(setProcessing(false));
     dispatch(setState('IDLE'));
@@ -124,7 +137,63 @@ const ControlsSection: React.FC = () => {
         <div className="file-info">
           <div className="info-item">
             <span className="info-label">Codici trovati:</span>
-            <span className="info-value">{excel.codes?.length || 0}</span>
+            <span className="info-value">
+              {excel.codes?.length || 0}
+              {uniqueCodeCount < (excel.codes?.length || 0) && ` (${uniqueCodeCount} unici)`}
+            </span>
+          </div>
+          <div className="info-item">
+            <label className="info-label" htmlFor="pool-size">Sessioni parallele:</label>
+            <select
+              id="pool-size"
+              className="info-select"
+              value={poolSize}
+              disabled={progress.isProcessing}
+              onChange={(e) => dispatch(setPoolSize(Number(e.target.value)))}
+            >
+              {Array.from({ length: MAX_POOL_SIZE }, (_, i) => i + 1).map(size => (
+                <option key={size} value={size}>{size}</option>
+              ))}
+            </select>
+          </div>
+          <div className="info-item">
+            <label className="info-label" htmlFor="lookup-engine">Motore:</label>
+            <select
+              id="lookup-engine"
+              className="info-select"
+              value={engine}
+              disabled={progress.isProcessing}
+              onChange={(e) => dispatch(setEngine(e.target.value as LookupEngineType))}
+            >
+              <option value="dom">Pagina web</option>
+              <option value="http">HTTP diretto</option>
+            </select>
+          </div>
+          {(excel.resumableCount || 0) > 0 && (
+            <div className="info-item">
+              <label className="info-label" htmlFor="resume-run">
+                Riprendi ({excel.resumableCount} già elaborati):
+              </label>
+              <input
+                id="resume-run"
+                type="checkbox"
+                className="info-checkbox"
+                checked={resume}
+                disabled={progress.isProcessing}
+                onChange={(e) => dispatch(setResume(e.target.checked))}
+              />
+            </div>
+          )}
+          <div className="info-item">
+            <label className="info-label" htmlFor="force-refresh">Ignora cache:</label>
+            <input
+              id="force-refresh"
+              type="checkbox"
+              className="info-checkbox"
+              checked={forceRefresh}
+              disabled={progress.isProcessing}
+              onChange={(e) => dispatch(setForceRefresh(e.target.checked))}
+            />
           </div>
           {excel.columns && excel.columns.length > 0 && (
             <div className="info-item">
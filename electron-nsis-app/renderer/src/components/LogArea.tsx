@@ -1,52 +1,80 @@
-import React, { useEffect, useRef } from 'react';
+import React, { useEffect, useLayoutEffect, useRef, useState } from 'react';
 import { useDispatch, useSelector } from 'react-redux';
 import { RootState } from '../store/store';
-import { clearLogs, toggleLogs } from '../store/slices/ui-slice';
+import { toggleLogs } from '../store/slices/ui-slice';
+import { logStore, useLogStore } from '../store/log-store';
 import './LogArea.css';
 
+// Fixed row height (px) - must match .log-entry in LogArea.css
+const ROW_HEIGHT = 22;
+// Extra rows rendered above/below the visible window
+const OVERSCAN = 10;
+
 const LogArea: React.FC = () => {
   const dispatch = useDispatch();
-  const { logs, showLogs } = useSelector((state: RootState) => state.ui);
-  const logEndRef = useRef<HTMLDivElement>(null);
+  const { showLogs } = useSelector((state: RootState) => state.ui);
+  const { size, version } = useLogStore();
+
+  const containerRef = useRef<HTMLDivElement>(null);
+  const stickToBottomRef = useRef(true);
+  const [scrollTop, setScrollTop] = useState(0);
+  const [viewportHeight, setViewportHeight] = useState(0);
 
-  // Auto-scroll to bottom when new logs are added
+  // Track the visible height of the container
   useEffect(() => {
-    if (showLogs && logEndRef.current) {
-      logEndRef.current.scrollIntoView({ behavior: 'smooth' });
+    const container = containerRef.current;
+    if (!showLogs || !container) return;
+
+    setViewportHeight(container.clientHeight);
+    const observer = new ResizeObserver(() => setViewportHeight(container.clientHeight));
+    observer.observe(container);
+
+    return () => observer.disconnect();
+  }, [showLogs]);
+
+  // Auto-scroll to bottom when new logs are added (unless the user scrolled up)
+  useLayoutEffect(() => {
+    const container = containerRef.current;
+    if (showLogs && container && stickToBottomRef.current) {
+      container.scrollTop = container.scrollHeight;
     }
-  }, [logs, showLogs]);
+  }, [version, showLogs]);
+
+  const handleScroll = (event: React.UIEvent<HTMLDivElement>) => {
+    const container = event.currentTarget;
+    stickToBottomRef.current = container.scrollTop + container.clientHeight >= container.scrollHeight - ROW_HEIGHT;
+    setScrollTop(container.scrollTop);
+  };
 
   const handleToggleLogs = () => {
     dispatch(toggleLogs());
   };
 
   const handleClearLogs = () => {
-    dispatch(clearLogs());
+    logStore.clear();
   };
 
-  const formatTimestamp = (log: string) => {
-    const now = new Date();
-    const time = now.toLocaleTimeString('it-IT', {
-      hour: '2-digit',
-      minute: '2-digit',
-      second: '2-digit'
-    });
-    return `[${time}]`;
-  };
+  // Only the rows in view are rendered
+  const firstRow = Math.max(0, Math.floor(scrollTop / ROW_HEIGHT) - OVERSCAN);
+  const lastRow = Math.min(size, Math.ceil((scrollTop + viewportHeight) / ROW_HEIGHT) + OVERSCAN);
 
-  const getLogType = (log: string): 'info' | 'warning' | 'error' | 'success' => {
-    const lowerLog = log.toLowerCase();
-    if (lowerLog.includes('errore') || lowerLog.includes('error') || lowerLog.includes('fallito')) {
-      return 'error';
-    }
-    if (lowerLog.includes('warning') || lowerLog.includes('attenzione')) {
-      return 'warning';
-    }
-    if (lowerLog.includes('completato') || lowerLog.includes('successo') || lowerLog.includes('caricato')) {
-      return 'success';
-    }
-    return 'info';
-  };
+  const rows: React.ReactNode[] = [];
+  for (let index = firstRow; index < lastRow; index++) {
+    const entry = logStore.get(index);
+    if (!entry) continue;
+
+    rows.push(
+      <div
+        key={entry.id}
+        className={`log-entry log-${entry.level}`}
+        style={{ top: index * ROW_HEIGHT }}
+        title={entry.message}
+      >
+        <span className="log-timestamp">[{entry.time}]</span>
+        <span className="log-message">{entry.message}</span>
+      </div>
+    );
+  }
 
   return (
     <div className="log-area">
@@ -56,7 +84,7 @@ const LogArea: React.FC = () => {
           <button
             className="btn-icon"
             onClick={handleClearLogs}
-            disabled={logs.length === 0}
+            disabled={size === 0}
             title="Cancella log"
           >
             <span className="icon">🗑️</span>
@@ -72,23 +100,18 @@ const LogArea: React.FC = () => {
       </div>
 
       {showLogs && (
-        <div className="log-container glass-panel-dark">
-          <div className="log-content">
-            {logs.length === 0 ? (
-              <div className="log-empty">Nessun log disponibile</div>
-            ) : (
-              logs.map((log, index) => {
-                const logType = getLogType(log);
-                return (
-                  <div key={index} className={`log-entry log-${logType}`}>
-                    <span className="log-timestamp">{formatTimestamp(log)}</span>
-                    <span className="log-message">{log}</span>
-                  </div>
-                );
-              })
-            )}
-            <div ref={logEndRef} />
-          </div>
+        <div
+          ref={containerRef}
+          className="log-container glass-panel-dark"
+          onScroll={handleScroll}
+        >
+          {size === 0 ? (
+            <div className="log-empty">Nessun log disponibile</div>
+          ) : (
+            <div className="log-content" style={{ height: size * ROW_HEIGHT }}>
+              {rows}
+            </div>
+          )}
         </div>
       )}
     </div>
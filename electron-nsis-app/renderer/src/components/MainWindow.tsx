@@ -1,8 +1,9 @@
 import React, { useEffect, useState } from 'react';
 import { useSelector, useDispatch } from 'react-redux';
 import { RootState } from '../store/store';
-import { showCompletion, setProcessing, updateBadges } from '../store/slices/ui-slice';
+import { showCompletion, setProcessing, applyIpcBatch } from '../store/slices/ui-slice';
 import { setState } from '../store/slices/app-slice';
+import { logStore } from '../store/log-store';
 import { setUpdateAvailable, setDownloadProgress, setUpdateDownloaded, setUpdateError } from '../store/slices/update-slice';
 import ControlsSection from './ControlsSection';
 import StatisticsSection from './StatisticsSection';
@@ -51,11 +52,12 @@ const MainWindow: React.FC = () => {
     };
   }, [dispatch]);
 
-  // Listen for badge updates from main process
+  // Listen for batched progress/status/badge/worker updates and logs from main process
+  // (one dispatch per batch instead of one per event)
   useEffect(() => {
-    const unsubscribe = window.electronAPI.onBadgeUpdate((badges: any) => {
-      console.log('[MainWindow] Badge update received:', badges);
-      dispatch(updateBadges(badges));
+    const unsubscribe = window.electronAPI.onIpcBatch((batch) => {
+      logStore.add(batch.logs);
+      dispatch(applyIpcBatch(batch));
     });
 
     return () => {
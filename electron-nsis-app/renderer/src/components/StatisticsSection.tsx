@@ -36,8 +36,24 @@ const AnimatedCounter: React.FC<{ value: number }> = ({ value }) => {
   return <span className="badge-value">{displayValue}</span>;
 };
 
+// 850 -> "850 ms", 1240 -> "1.2 s"
+const formatLatency = (ms: number): string =>
+  ms < 1000 ? `${ms} ms` : `${(ms / 1000).toFixed(1)} s`;
+
+// 45000 -> "45 s", 750000 -> "12 min 30 s", 4500000 -> "1 h 15 min"
+const formatDuration = (ms: number): string => {
+  const totalSeconds = Math.round(ms / 1000);
+  const hours = Math.floor(totalSeconds / 3600);
+  const minutes = Math.floor((totalSeconds % 3600) / 60);
+  const seconds = totalSeconds % 60;
+
+  if (hours > 0) return `${hours} h ${minutes} min`;
+  if (minutes > 0) return `${minutes} min ${seconds} s`;
+  return `${seconds} s`;
+};
+
 const StatisticsSection: React.FC = () => {
-  const { badges } = useSelector((state: RootState) => state.ui);
+  const { badges, workerStats, rateStats, throughput, progress } = useSelector((state: RootState) => state.ui);
 
   // Alternating DHL colors: yellow and red
   const badgeData: Array<{ label: string; value: number; color: string }> = [
@@ -65,6 +81,82 @@ const StatisticsSection: React.FC = () => {
           </div>
         ))}
       </div>
+
+      {/* Cache hits/misses of the current run */}
+      {badges.cacheHits > 0 && (
+        <div className="worker-stats">
+          <div className="worker-stats-row">
+            <span className="worker-stats-label">Dalla cache</span>
+            <span className="worker-stats-value">
+              {badges.cacheHits} · {badges.cacheMisses} interrogati
+            </span>
+          </div>
+        </div>
+      )}
+
+      {/* Live throughput and estimated time to completion */}
+      {throughput && progress.isProcessing && (
+        <div className="worker-stats">
+          <div className="worker-stats-row">
+            <span className="worker-stats-label">Velocità</span>
+            <span className="worker-stats-value">{throughput.codesPerMinute} cod/min</span>
+          </div>
+          <div className="worker-stats-row">
+            <span className="worker-stats-label">Tempo stimato</span>
+            <span className="worker-stats-value">
+              {throughput.etaMs === null ? 'calcolo...' : formatDuration(throughput.etaMs)}
+            </span>
+          </div>
+        </div>
+      )}
+
+      {/* Adaptive pace chosen by the rate controller */}
+      {rateStats && (
+        <div className="worker-stats">
+          <div className="worker-stats-row">
+            <span className="worker-stats-label">Ritmo</span>
+            <span className="worker-stats-value">
+              {rateStats.codesPerMinute} cod/min · {rateStats.concurrency}/{rateStats.maxConcurrency} sessioni
+            </span>
+          </div>
+          <div className="worker-stats-row">
+            <span className="worker-stats-label">Latenza</span>
+            <span className="worker-stats-value">
+              p50 {formatLatency(rateStats.latencyP50Ms)} · p95 {formatLatency(rateStats.latencyP95Ms)}
+            </span>
+          </div>
+          {rateStats.errorRate > 0 && (
+            <div className="worker-stats-row">
+              <span className="worker-stats-label">Errori portale</span>
+              <span className="worker-stats-value">{Math.round(rateStats.errorRate * 100)}%</span>
+            </div>
+          )}
+          {rateStats.circuit !== 'closed' && (
+            <div className="worker-stats-row">
+              <span className="worker-stats-label">In pausa</span>
+              <span className="worker-stats-value">
+                {rateStats.resumeAt
+                  ? `ripresa alle ${new Date(rateStats.resumeAt).toLocaleTimeString('it-IT')}`
+                  : 'verifica portale...'}
+              </span>
+            </div>
+          )}
+        </div>
+      )}
+
+      {/* Per-worker throughput (only shown with more than one session) */}
+      {workerStats.length > 1 && (
+        <div className="worker-stats">
+          {workerStats.map(stats => (
+            <div key={stats.workerId} className="worker-stats-row">
+              <span className="worker-stats-label">Sessione {stats.workerId + 1}</span>
+              <span className="worker-stats-value">
+                {stats.processed} · {stats.codesPerMinute} cod/min
+              </span>
+            </div>
+          ))}
+        </div>
+      )}
     </div>
   );
 };
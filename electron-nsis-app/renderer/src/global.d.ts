@@ -1,5 +1,7 @@
 // Global type definitions for the renderer process
 
+import { IpcBatch, ProcessingOptions } from '../../shared/types/processing-types';
+
 interface ElectronAPI {
   // Window controls
   windowMinimize: () => void;
@@ -12,16 +14,16 @@ interface ElectronAPI {
   saveExcel: (filePath: string, data: any) => Promise<void>;
 
   // Processing
-  startProcessing: (codes: string[]) => void;
+  startProcessing: (codes: string[], options?: ProcessingOptions) => void;
   stopProcessing: () => void;
 
+  // Logs (written to the rotating log file)
+  writeLog: (message: string) => void;
+
   // Event listeners
   onFileSelected: (callback: (filePath: string) => void) => () => void;
   onExcelLoaded: (callback: (data: any) => void) => () => void;
-  onProgressUpdate: (callback: (data: { current: number; total: number }) => void) => () => void;
-  onStatusUpdate: (callback: (status: string) => void) => () => void;
-  onBadgeUpdate: (callback: (badges: any) => void) => () => void;
-  onLogMessage: (callback: (message: string) => void) => () => void;
+  onIpcBatch: (callback: (batch: IpcBatch) => void) => () => void;
   onProcessingComplete: (callback: () => void) => () => void;
   onShowCompletionDialog: (callback: (message: string) => void) => () => void;
 
@@ -1,4 +1,5 @@
 import { useEffect } from 'react';
+import { IpcBatch, ProcessingOptions } from '../../../shared/types/processing-types';
 
 /**
  * Custom hook per gestire la comunicazione IPC con il main process
@@ -21,8 +22,8 @@ export const useIpc = () => {
     },
 
     // Processing
-    startProcessing: (codes: string[]) => {
-      window.electronAPI.startProcessing(codes);
+    startProcessing: (codes: string[], options?: ProcessingOptions) => {
+      window.electronAPI.startProcessing(codes, options);
     },
 
     stopProcessing: () => {
@@ -38,20 +39,8 @@ export const useIpc = () => {
       return window.electronAPI.onExcelLoaded(callback);
     },
 
-    onProgressUpdate: (callback: (data: { current: number; total: number }) => void) => {
-      return window.electronAPI.onProgressUpdate(callback);
-    },
-
-    onStatusUpdate: (callback: (status: string) => void) => {
-      return window.electronAPI.onStatusUpdate(callback);
-    },
-
-    onBadgeUpdate: (callback: (badges: any) => void) => {
-      return window.electronAPI.onBadgeUpdate(callback);
-    },
-
-    onLogMessage: (callback: (message: string) => void) => {
-      return window.electronAPI.onLogMessage(callback);
+    onIpcBatch: (callback: (batch: IpcBatch) => void) => {
+      return window.electronAPI.onIpcBatch(callback);
     },
 
     onProcessingComplete: (callback: () => void) => {
@@ -104,7 +93,7 @@ export const useIpc = () => {
  * Hook per auto-subscribe a eventi IPC con cleanup automatico
  */
 export const useIpcEvent = <T>(
-  event: 'file-selected' | 'excel-loaded' | 'progress-update' | 'status-update' | 'badge-update' | 'log-message' | 'processing-complete',
+  event: 'file-selected' | 'excel-loaded' | 'ipc-batch' | 'processing-complete',
   callback: (data: T) => void
 ) => {
   useEffect(() => {
@@ -117,17 +106,8 @@ export const useIpcEvent = <T>(
       case 'excel-loaded':
         unsubscribe = window.electronAPI.onExcelLoaded(callback as any);
         break;
-      case 'progress-update':
-        unsubscribe = window.electronAPI.onProgressUpdate(callback as any);
-        break;
-      case 'status-update':
-        unsubscribe = window.electronAPI.onStatusUpdate(callback as any);
-        break;
-      case 'badge-update':
-        unsubscribe = window.electronAPI.onBadgeUpdate(callback as any);
-        break;
-      case 'log-message':
-        unsubscribe = window.electronAPI.onLogMessage(callback as any);
+      case 'ipc-batch':
+        unsubscribe = window.electronAPI.onIpcBatch(callback as any);
         break;
       case 'processing-complete':
         unsubscribe = window.electronAPI.onProcessingComplete(callback as any);
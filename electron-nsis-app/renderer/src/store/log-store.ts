@@ -0,0 +1,162 @@
+/**
+ * Bounded log storage for the log area
+ * Fixed-size ring buffer outside Redux: entries are parsed once at ingest
+ * (level, time, code) and components read them through useLogStore().
+ * Every log line is also written to the rotating log file by the main process.
+ */
+
+import { useSyncExternalStore } from 'react';
+import { LOG_BUFFER_SIZE } from '../../../shared/constants/config';
+
+export type LogLevel = 'info' | 'warning' | 'error' | 'success';
+
+export interface LogEntry {
+  id: number;
+  level: LogLevel;
+  timestamp: number;
+  time: string;
+  code: string | null;
+  message: string;
+}
+
+export interface LogSnapshot {
+  version: number;
+  size: number;
+}
+
+/**
+ * Log level from the message text
+ */
+function getLogLevel(message: string): LogLevel {
+  if (message.startsWith('✗')) return 'error';
+  if (message.startsWith('✓') || message.startsWith('↺')) return 'success';
+
+  const lowerLog = message.toLowerCase();
+  if (lowerLog.includes('errore') || lowerLog.includes('error') || lowerLog.includes('fallito')) {
+    return 'error';
+  }
+  if (lowerLog.includes('warning') || lowerLog.includes('attenzione')) {
+    return 'warning';
+  }
+  if (lowerLog.includes('completato') || lowerLog.includes('successo') || lowerLog.includes('caricato')) {
+    return 'success';
+  }
+  return 'info';
+}
+
+/**
+ * Request code a message refers to, if any
+ * ("✓ CODE: stato", "✗ CODE: errore", "Elaborazione codice 3/10: CODE")
+ */
+function getLogCode(message: string): string | null {
+  const match = /^[✓✗↺]\s+([^:]+):/.exec(message) || /codice \d+\/\d+: (\S+)/.exec(message);
+  return match ? match[1].trim() : null;
+}
+
+export class LogStore {
+  private buffer: Array<LogEntry | undefined>;
+  private start: number = 0;
+  private size: number = 0;
+  private nextId: number = 1;
+  private snapshot: LogSnapshot = { version: 0, size: 0 };
+  private listeners: Set<() => void> = new Set();
+
+  constructor(private readonly capacity: number) {
+    this.buffer = new Array(capacity);
+  }
+
+  /**
+   * Append messages (oldest entries are overwritten when full)
+   */
+  add(messages: string[]): void {
+    if (messages.length === 0) {
+      return;
+    }
+
+    const now = Date.now();
+    const time = new Date(now).toLocaleTimeString('it-IT', {
+      hour: '2-digit',
+      minute: '2-digit',
+      second: '2-digit'
+    });
+
+    for (const message of messages) {
+      const entry: LogEntry = {
+        id: this.nextId++,
+        level: getLogLevel(message),
+        timestamp: now,
+        time,
+        code: getLogCode(message),
+        message
+      };
+
+      if (this.size < this.capacity) {
+        this.buffer[(this.start + this.size) % this.capacity] = entry;
+        this.size++;
+      } else {
+        this.buffer[this.start] = entry;
+        this.start = (this.start + 1) % this.capacity;
+      }
+    }
+
+    this.emit();
+  }
+
+  /**
+   * Remove all entries
+   */
+  clear(): void {
+    this.buffer = new Array(this.capacity);
+    this.start = 0;
+    this.size = 0;
+    this.emit();
+  }
+
+  /**
+   * Entry at position index (0 = oldest)
+   */
+  get(index: number): LogEntry | undefined {
+    if (index < 0 || index >= this.size) {
+      return undefined;
+    }
+    return this.buffer[(this.start + index) % this.capacity];
+  }
+
+  /**
+   * Immutable snapshot, changes identity on every update
+   */
+  getSnapshot = (): LogSnapshot => this.snapshot;
+
+  /**
+   * Subscribe to updates
+   */
+  subscribe = (listener: () => void): (() => void) => {
+    this.listeners.add(listener);
+    return () => {
+      this.listeners.delete(listener);
+    };
+  };
+
+  private emit(): void {
+    this.snapshot = { version: this.snapshot.version + 1, size: this.size };
+    this.listeners.forEach(listener => listener());
+  }
+}
+
+// Export singleton instance
+export const logStore = new LogStore(LOG_BUFFER_SIZE);
+
+/**
+ * Add a log line from the renderer (also written to the log file)
+ */
+export function addLog(message: string): void {
+  logStore.add([message]);
+  window.electronAPI.writeLog(message);
+}
+
+/**
+ * Subscribe a component to the log store
+ */
+export function useLogStore(): LogSnapshot {
+  return useSyncExternalStore(logStore.subscribe, logStore.getSnapshot);
+}
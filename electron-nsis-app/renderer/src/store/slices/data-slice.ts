@@ -4,6 +4,7 @@ interface ExcelData {
   filePath: string;
   codes: string[];
   columns: string[];
+  resumableCount?: number;
   results: Map<string, any>;
 }
 
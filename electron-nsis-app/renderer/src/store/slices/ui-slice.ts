@@ -1,4 +1,6 @@
 import { createSlice, PayloadAction } from '@reduxjs/toolkit';
+import { IpcBatch, LookupEngineType, RateStats, ThroughputStats, WorkerStats } from '../../../../shared/types/processing-types';
+import { DEFAULT_POOL_SIZE } from '../../../../shared/constants/config';
 
 interface ProgressState {
   current: number;
@@ -15,12 +17,20 @@ interface BadgeData {
   inLavorazione: number;
   inviate: number;
   eccezioni: number;
+  cacheHits: number;
+  cacheMisses: number;
 }
 
 interface UISliceState {
   progress: ProgressState;
   badges: BadgeData;
-  logs: string[];
+  poolSize: number;
+  engine: LookupEngineType;
+  forceRefresh: boolean;
+  resume: boolean;
+  workerStats: WorkerStats[];
+  rateStats: RateStats | null;
+  throughput: ThroughputStats | null;
   showLogs: boolean;
   webViewUrl: string;
   webViewLoading: boolean;
@@ -42,9 +52,17 @@ const initialState: UISliceState = {
     chiuse: 0,
     inLavorazione: 0,
     inviate: 0,
-    eccezioni: 0
+    eccezioni: 0,
+    cacheHits: 0,
+    cacheMisses: 0
   },
-  logs: [],
+  poolSize: DEFAULT_POOL_SIZE,
+  engine: 'dom',
+  forceRefresh: false,
+  resume: true,
+  workerStats: [],
+  rateStats: null,
+  throughput: null,
   showLogs: false,
   webViewUrl: '',
   webViewLoading: false,
@@ -78,15 +96,53 @@ const uiSlice = createSlice({
     resetBadges: (state) => {
       state.badges = initialState.badges;
     },
-    addLog: (state, action: PayloadAction<string>) => {
-      state.logs.push(action.payload);
-      // Keep only last 1000 logs
-      if (state.logs.length > 1000) {
-        state.logs = state.logs.slice(-1000);
-      }
+    setPoolSize: (state, action: PayloadAction<number>) => {
+      state.poolSize = action.payload;
+    },
+    setEngine: (state, action: PayloadAction<LookupEngineType>) => {
+      state.engine = action.payload;
+    },
+    setForceRefresh: (state, action: PayloadAction<boolean>) => {
+      state.forceRefresh = action.payload;
+    },
+    setResume: (state, action: PayloadAction<boolean>) => {
+      state.resume = action.payload;
+    },
+    setWorkerStats: (state, action: PayloadAction<WorkerStats[]>) => {
+      state.workerStats = action.payload;
+    },
+    setRateStats: (state, action: PayloadAction<RateStats | null>) => {
+      state.rateStats = action.payload;
+    },
+    setThroughput: (state, action: PayloadAction<ThroughputStats | null>) => {
+      state.throughput = action.payload;
     },
-    clearLogs: (state) => {
-      state.logs = [];
+    // Log lines of the batch go to the log store (see MainWindow)
+    applyIpcBatch: (state, action: PayloadAction<IpcBatch>) => {
+      const batch = action.payload;
+
+      if (batch.progress) {
+        state.progress.current = batch.progress.current;
+        state.progress.total = batch.progress.total;
+        state.progress.percentage = batch.progress.total > 0
+          ? Math.round((batch.progress.current / batch.progress.total) * 100)
+          : 0;
+      }
+      if (batch.status !== undefined) {
+        state.progress.status = batch.status;
+      }
+      if (batch.badges) {
+        state.badges = batch.badges;
+      }
+      if (batch.workerStats) {
+        state.workerStats = batch.workerStats;
+      }
+      if (batch.rate) {
+        state.rateStats = batch.rate;
+      }
+      if (batch.throughput) {
+        state.throughput = batch.throughput;
+      }
     },
     toggleLogs: (state) => {
       state.showLogs = !state.showLogs;
@@ -120,8 +176,14 @@ export const {
   setStatus,
   updateBadges,
   resetBadges,
-  addLog,
-  clearLogs,
+  setPoolSize,
+  setEngine,
+  setForceRefresh,
+  setResume,
+  setWorkerStats,
+  setRateStats,
+  setThroughput,
+  applyIpcBatch,
   toggleLogs,
   setShowLogs,
   setWebViewUrl,
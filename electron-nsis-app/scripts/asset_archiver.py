@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Archiviazione verificata e reversibile di asset
+
+Individua i file tramite pattern glob, li sposta (o copia) in una directory di
+archivio in parallelo e registra in un manifest JSON percorso originale,
+percorso archiviato, dimensione e SHA-256 di ogni file.
+
+- Sullo stesso filesystem i file vengono rinominati (spostamento) o collegati
+  con hard link (copia): nessun dato viene copiato.
+- Tra filesystem diversi il contenuto viene copiato a blocchi calcolando lo
+  SHA-256 durante la copia, poi riletto dalla destinazione e confrontato.
+- Il manifest viene aggiornato dopo ogni file: un'archiviazione interrotta
+  riprende dai file mancanti.
+- Il ripristino usa il manifest e verifica l'hash prima di rimettere a posto
+  ogni file.
+
+Uso:
+    python asset_archiver.py archive ROOT DEST PATTERN... [--copy] [--dry-run] [--jobs N]
+    python asset_archiver.py restore DEST [--dry-run] [--jobs N]
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from icon_build_cache import file_sha256
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def discover(root, patterns):
+    """
+    Trova i file che corrispondono ai pattern glob
+
+    Args:
+        root: Directory di partenza
+        patterns: Pattern relativi a root (es. "icons/*.png", "**/*.gif")
+
+    Returns:
+        Lista ordinata di percorsi relativi a root (separatore "/")
+    """
+    root = Path(root)
+    found = set()
+    for pattern in patterns:
+        for path in root.glob(pattern):
+            if path.is_file():
+                found.add(path.relative_to(root).as_posix())
+    return sorted(found)
+
+
+def write_if_changed(path, content):
+    """
+    Scrive un file di testo solo se il contenuto è diverso da quello attuale
+
+    Args:
+        path: Percorso del file
+        content: Testo da scrivere
+
+    Returns:
+        True se il file è stato scritto
+    """
+    path = Path(path)
+    try:
+        if path.read_text(encoding='utf-8') == content:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding='utf-8')
+    return True
+
+
+def copy_with_hash(source, dest):
+    """
+    Copia un file a blocchi calcolandone lo SHA-256, poi verifica la destinazione
+
+    Args:
+        source: File sorgente
+        dest: File di destinazione
+
+    Returns:
+        SHA-256 del contenuto copiato
+
+    Raises:
+        IOError: Se la copia riletta non corrisponde alla sorgente
+    """
+    digest = hashlib.sha256()
+    with open(source, 'rb') as src, open(dest, 'wb') as dst:
+        for chunk in iter(lambda: src.read(COPY_CHUNK_SIZE), b''):
+            digest.update(chunk)
+            dst.write(chunk)
+    shutil.copystat(source, dest)
+
+    expected = digest.hexdigest()
+    if file_sha256(dest) != expected:
+        os.remove(dest)
+        raise IOError(f"Verifica SHA-256 fallita per {dest}")
+    return expected
+
+
+def existing_ancestor(path):
+    """Il percorso stesso o la prima directory superiore esistente"""
+    path = Path(path).absolute()
+    while not path.exists() and path.parent != path:
+        path = path.parent
+    return path
+
+
+def same_filesystem(path_a, path_b):
+    """True se i due percorsi (esistenti) sono sullo stesso filesystem"""
+    return os.stat(path_a).st_dev == os.stat(path_b).st_dev
+
+
+class AssetArchive:
+    """Directory di archivio con il relativo manifest"""
+
+    def __init__(self, archive_dir, root=None):
+        """
+        Args:
+            archive_dir: Directory di archivio (contiene manifest.json)
+            root: Directory dei file originali (default: quella registrata nel manifest)
+        """
+        self.archive_dir = Path(archive_dir)
+        self.manifest_path = self.archive_dir / MANIFEST_NAME
+        self._lock = threading.Lock()
+
+        self.manifest = self._load()
+        if root is not None:
+            self.manifest['root'] = os.path.abspath(root)
+        if not self.manifest.get('root'):
+            raise ValueError(f"Directory originale non indicata e assente in {self.manifest_path}")
+        self.root = Path(self.manifest['root'])
+
+    def _load(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {'version': MANIFEST_VERSION, 'created': None, 'root': None, 'entries': {}}
+
+        if manifest.get('version') != MANIFEST_VERSION:
+            raise ValueError(f"Versione manifest non supportata: {manifest.get('version')}")
+        return manifest
+
+    def _save(self):
+        """Salva il manifest in modo atomico (chiamato con il lock acquisito)"""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    @property
+    def entries(self):
+        """Voci del manifest: percorso originale -> {archived, sha256, size, method}"""
+        return self.manifest['entries']
+
+    def archive(self, files, copy=False, dry_run=False, jobs=4):
+        """
+        Archivia un insieme di file in parallelo
+
+        Args:
+            files: Dizionario {percorso relativo a root: percorso relativo nell'archivio}
+            copy: Se True lascia gli originali al loro posto
+            dry_run: Se True mostra le operazioni senza eseguirle
+            jobs: Numero di file elaborati in parallelo
+
+        Returns:
+            Lista di tuple (percorso, esito)
+        """
+        if not dry_run:
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                if not self.manifest.get('created'):
+                    self.manifest['created'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                self._save()
+
+        def run(item):
+            source_rel, archived_rel = item
+            try:
+                return source_rel, self._archive_one(source_rel, archived_rel, copy, dry_run)
+            except (OSError, IOError) as e:
+                return source_rel, f"errore: {e}"
+
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            return list(pool.map(run, sorted(files.items())))
+
+    def _archive_one(self, source_rel, archived_rel, copy, dry_run):
+        source = self.root / source_rel
+        dest = self.archive_dir / archived_rel
+
+        # Già archiviato in un run precedente (ripresa)
+        entry = self.entries.get(source_rel)
+        if entry and not source.exists() and dest.exists():
+            return "già archiviato"
+
+        if not source.exists():
+            return "non trovato"
+
+        if dest.exists():
+            # Interrotto dopo la copia: basta verificare e completare lo spostamento
+            sha256 = file_sha256(dest)
+            if sha256 != file_sha256(source):
+                return "errore: destinazione esistente con contenuto diverso"
+            if dry_run:
+                return "da completare"
+            if not copy:
+                os.remove(source)
+            method = 'existing'
+        else:
+            zero_copy = same_filesystem(source, existing_ancestor(dest))
+            if dry_run:
+                return f"da archiviare ({('link' if copy else 'rename') if zero_copy else 'copy'})"
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            sha256, method = self._transfer(source, dest, copy, zero_copy)
+
+        with self._lock:
+            self.entries[source_rel] = {
+                'archived': Path(archived_rel).as_posix(),
+                'sha256': sha256,
+                'size': dest.stat().st_size,
+                'method': method,
+            }
+            self._save()
+        return f"archiviato ({method})"
+
+    @staticmethod
+    def _transfer(source, dest, copy, zero_copy):
+        """Sposta/copia un file; restituisce (sha256, metodo effettivo)"""
+        if zero_copy:
+            sha256 = file_sha256(source)
+            if copy:
+                try:
+                    os.link(source, dest)
+                    return sha256, 'link'
+                except OSError:
+                    pass  # Hard link non supportati (es. FAT): copia verificata
+            else:
+                os.replace(source, dest)
+                return sha256, 'rename'
+
+        sha256 = copy_with_hash(source, dest)
+        if not copy:
+            os.remove(source)
+        return sha256, 'copy'
+
+    def restore(self, dry_run=False, jobs=4):
+        """
+        Ripristina i file archiviati nella posizione originale
+
+        Ogni file viene verificato con lo SHA-256 del manifest prima del
+        ripristino. Le voci ripristinate vengono rimosse dal manifest.
+
+        Args:
+            dry_run: Se True mostra le operazioni senza eseguirle
+            jobs: Numero di file elaborati in parallelo
+
+        Returns:
+            Lista di tuple (percorso, esito)
+        """
+        def run(item):
+            source_rel, entry = item
+            try:
+                return source_rel, self._restore_one(source_rel, entry, dry_run)
+            except (OSError, IOError) as e:
+                return source_rel, f"errore: {e}"
+
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            results = list(pool.map(run, sorted(self.entries.items())))
+
+        if not dry_run:
+            with self._lock:
+                if self.entries:
+                    self._save()
+                elif self.manifest_path.exists():
+                    self.manifest_path.unlink()
+        return results
+
+    def _restore_one(self, source_rel, entry, dry_run):
+        source = self.root / source_rel
+        archived = self.archive_dir / entry['archived']
+
+        if not archived.exists():
+            if source.exists() and file_sha256(source) == entry['sha256']:
+                self._forget(source_rel, dry_run)
+                return "già ripristinato"
+            return "errore: file archiviato mancante"
+
+        if file_sha256(archived) != entry['sha256']:
+            return "errore: SHA-256 del file archiviato non corrisponde al manifest"
+
+        if source.exists():
+            if file_sha256(source) != entry['sha256']:
+                return "errore: l'originale esiste con contenuto diverso"
+            if entry['method'] == 'link':
+                # Copia con hard link: l'originale è lo stesso file
+                if not dry_run:
+                    os.remove(archived)
+                    self._forget(source_rel, dry_run)
+                return "già presente"
+
+        if dry_run:
+            return "da ripristinare"
+
+        source.parent.mkdir(parents=True, exist_ok=True)
+        if source.exists():
+            os.remove(archived)
+        elif same_filesystem(archived, existing_ancestor(source)):
+            os.replace(archived, source)
+        else:
+            copy_with_hash(archived, source)
+            os.remove(archived)
+
+        self._forget(source_rel, dry_run)
+        return "ripristinato"
+
+    def _forget(self, source_rel, dry_run):
+        if not dry_run:
+            with self._lock:
+                self.entries.pop(source_rel, None)
+
+
+def print_results(results):
+    """Stampa l'esito di ogni file e restituisce True se non ci sono errori"""
+    ok = True
+    for path, outcome in results:
+        mark = "✗" if outcome.startswith("errore") else "→"
+        ok = ok and mark != "✗"
+        print(f"  {mark} {path}: {outcome}")
+    return ok
+
+
+def main():
+    # Fix encoding per Windows console
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+    parser = argparse.ArgumentParser(description="Archiviazione verificata e reversibile di asset")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    archive_cmd = sub.add_parser('archive', help="Archivia i file che corrispondono ai pattern")
+    archive_cmd.add_argument('root', help="Directory dei file da archiviare")
+    archive_cmd.add_argument('dest', help="Directory di archivio")
+    archive_cmd.add_argument('patterns', nargs='+', help="Pattern glob relativi a root")
+    archive_cmd.add_argument('--copy', action='store_true', help="Lascia gli originali al loro posto")
+
+    restore_cmd = sub.add_parser('restore', help="Ripristina i file dal manifest dell'archivio")
+    restore_cmd.add_argument('dest', help="Directory di archivio")
+
+    for cmd in (archive_cmd, restore_cmd):
+        cmd.add_argument('--dry-run', action='store_true', help="Mostra le operazioni senza eseguirle")
+        cmd.add_argument('--jobs', type=int, default=4, help="File elaborati in parallelo")
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'archive':
+            archive = AssetArchive(args.dest, args.root)
+            files = {path: path for path in discover(args.root, args.patterns)}
+            results = archive.archive(files, copy=args.copy, dry_run=args.dry_run, jobs=args.jobs)
+        else:
+            archive = AssetArchive(args.dest)
+            results = archive.restore(dry_run=args.dry_run, jobs=args.jobs)
+    except ValueError as e:
+        print(f"✗ {e}")
+        return 1
+
+    return 0 if print_results(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,18 +4,22 @@
 Script per pulire le icone legacy (PNG/GIF) e archiviarle
 
 Questo script:
-1. Identifica tutte le icone legacy nella directory icons/ (root del progetto)
-2. Le sposta in una directory di archivio icons_legacy/
-3. Rimuove l'icon.ico malformato dalla root
-4. Genera un report delle operazioni
+1. Identifica le icone legacy (PNG/GIF) nella directory icons/ (root del progetto)
+2. Le sposta in una directory di archivio icons_legacy/ con verifica SHA-256
+   e manifest (vedi asset_archiver.py), ripristinabili con --restore
+3. Archivia l'icon.ico malformato dalla root
+4. Genera README e guida alla migrazione (riscritti solo se cambiano)
+
+Uso:
+    python cleanup_legacy_icons.py [--dry-run] [--restore] [--jobs N]
 """
 
-import os
+import argparse
 import sys
 import io
 from pathlib import Path
-import shutil
-from datetime import datetime
+
+from asset_archiver import AssetArchive, discover, print_results, write_if_changed
 
 # Fix encoding per Windows console
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
@@ -26,36 +30,24 @@ LEGACY_ICONS_DIR = PROJECT_ROOT / "icons"
 ARCHIVE_DIR = PROJECT_ROOT / "icons_legacy"
 OLD_ICON_ROOT = PROJECT_ROOT / "icon.ico"
 
-# Icone legacy da archiviare
-LEGACY_FILES = [
-    "chrome.png",
-    "close.png",
-    "controls.png",
-    "excel.png",
-    "folder.png",
-    "home.png",
-    "large.png",
-    "loading.gif",
-    "love.gif",
-    "minimize.png",
-    "start.png",
-    "stati.gif",
-    "statistics.gif",
-    "stop.png",
-    "trash.png",
+# Icone legacy da archiviare (pattern relativi a PROJECT_ROOT)
+LEGACY_PATTERNS = [
+    "icons/*.png",
+    "icons/*.gif",
 ]
 
-def create_archive_directory():
-    """Crea directory di archivio"""
-    ARCHIVE_DIR.mkdir(exist_ok=True)
+# File archiviati con un nome diverso
+RENAMED_FILES = {
+    OLD_ICON_ROOT.name: "icon_old.ico",
+}
 
-    # Crea README nell'archivio
+def write_archive_readme(created):
+    """Scrive il README dell'archivio (solo se cambiato)"""
     readme_path = ARCHIVE_DIR / "README.txt"
-    with open(readme_path, 'w', encoding='utf-8') as f:
-        f.write(f"""ICONE LEGACY ARCHIVIATE
+    written = write_if_changed(readme_path, f"""ICONE LEGACY ARCHIVIATE
 {'=' * 60}
 
-Data archiviazione: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Data archiviazione: {created}
 
 Queste icone sono state sostituite dal nuovo sistema basato su:
 - Lucide React (SVG vettoriali)
@@ -77,43 +69,41 @@ electron-nsis-app/assets/ICONS_README.md
 
 NOTA: Questi file sono mantenuti come archivio per riferimento.
 Possono essere eliminati in sicurezza se non più necessari.
+Per ripristinarli: python cleanup_legacy_icons.py --restore
+(l'elenco con gli SHA-256 è in manifest.json)
 """)
 
-    print(f"✓ Directory archivio creata: {ARCHIVE_DIR}")
-    return True
-
-def archive_legacy_icons():
-    """Archivia le icone legacy"""
-    if not LEGACY_ICONS_DIR.exists():
-        print(f"⚠ Directory {LEGACY_ICONS_DIR} non trovata, skip")
-        return 0
-
-    archived_count = 0
-
-    for filename in LEGACY_FILES:
-        source_path = LEGACY_ICONS_DIR / filename
-
-        if source_path.exists():
-            dest_path = ARCHIVE_DIR / filename
-            shutil.move(str(source_path), str(dest_path))
-            print(f"  → Archiviato: {filename}")
-            archived_count += 1
-        else:
-            print(f"  ⊗ Non trovato: {filename} (già rimosso?)")
-
-    return archived_count
-
-def remove_old_icon_ico():
-    """Rimuove il vecchio icon.ico malformato dalla root"""
-    if OLD_ICON_ROOT.exists():
-        # Sposta nell'archivio invece di eliminare
-        dest_path = ARCHIVE_DIR / "icon_old.ico"
-        shutil.move(str(OLD_ICON_ROOT), str(dest_path))
-        print(f"✓ Rimosso icon.ico malformato dalla root (archiviato come icon_old.ico)")
-        return True
+    if written:
+        print(f"✓ README archivio aggiornato: {readme_path}")
     else:
-        print("  ⊗ icon.ico non trovato nella root (già rimosso?)")
-        return False
+        print("  ⊗ README archivio invariato")
+
+def find_legacy_files():
+    """
+    Icone legacy presenti, con il nome da usare nell'archivio
+
+    Returns:
+        Dizionario {percorso relativo a PROJECT_ROOT: nome nell'archivio}
+    """
+    files = {path: Path(path).name for path in discover(PROJECT_ROOT, LEGACY_PATTERNS)}
+    for name, archived_name in RENAMED_FILES.items():
+        if (PROJECT_ROOT / name).exists():
+            files[name] = archived_name
+    return files
+
+def archive_legacy_icons(archive, dry_run, jobs):
+    """Archivia le icone legacy (e l'icon.ico malformato dalla root)"""
+    files = find_legacy_files()
+
+    # Riprende anche i file di un'archiviazione interrotta
+    for path, entry in archive.entries.items():
+        files.setdefault(path, entry['archived'])
+
+    if not files:
+        print(f"  ⊗ Nessuna icona legacy trovata (già archiviate?)")
+        return True
+
+    return print_results(archive.archive(files, dry_run=dry_run, jobs=jobs))
 
 def cleanup_empty_directories():
     """Rimuove directory vuote"""
@@ -136,9 +126,7 @@ def generate_migration_guide():
     """Genera guida rapida alla migrazione"""
     guide_path = ARCHIVE_DIR / "MIGRATION_GUIDE.txt"
 
-    with open(guide_path, 'w', encoding='utf-8') as f:
-        f.write("""GUIDA RAPIDA MIGRAZIONE ICONE LEGACY → MODERNE
-{'=' * 60}
+    written = write_if_changed(guide_path, "GUIDA RAPIDA MIGRAZIONE ICONE LEGACY → MODERNE\n" + "=" * 60 + """
 
 Se hai codice che usava le vecchie icone PNG/GIF, ecco come migrare:
 
@@ -204,47 +192,66 @@ Per showcase interattivo:
 → electron-nsis-app/renderer/src/components/icons/IconShowcase.tsx
 """)
 
-    print(f"✓ Guida migrazione creata: {guide_path}")
+    if written:
+        print(f"✓ Guida migrazione aggiornata: {guide_path}")
+    else:
+        print("  ⊗ Guida migrazione invariata")
 
 def main():
+    parser = argparse.ArgumentParser(description="Archivia (o ripristina) le icone legacy")
+    parser.add_argument('--dry-run', action='store_true', help="Mostra le operazioni senza eseguirle")
+    parser.add_argument('--restore', action='store_true', help="Ripristina le icone archiviate")
+    parser.add_argument('--jobs', type=int, default=4, help="File elaborati in parallelo")
+    args = parser.parse_args()
+
     print("\n" + "=" * 60)
     print("  CLEANUP ICONE LEGACY - ControlloStatoNSIS")
     print("=" * 60 + "\n")
 
-    # 1. Crea directory archivio
-    print("📁 Creazione directory archivio...")
-    create_archive_directory()
-    print()
+    archive = AssetArchive(ARCHIVE_DIR, PROJECT_ROOT)
+
+    if args.restore:
+        print("♻️  Ripristino icone legacy...")
+        ok = print_results(archive.restore(dry_run=args.dry_run, jobs=args.jobs))
+        print()
+        return 0 if ok else 1
 
-    # 2. Archivia icone legacy
+    # 1. Archivia icone legacy e icon.ico malformato
     print("📦 Archiviazione icone legacy...")
-    archived = archive_legacy_icons()
-    print(f"  → Totale archiviati: {archived} file")
+    ok = archive_legacy_icons(archive, args.dry_run, args.jobs)
+    print(f"  → Totale in archivio: {len(archive.entries)} file")
     print()
 
-    # 3. Rimuovi icon.ico malformato
-    print("🗑️  Rimozione icon.ico malformato...")
-    remove_old_icon_ico()
+    if args.dry_run:
+        print("ℹ️  Dry run: nessun file modificato\n")
+        return 0 if ok else 1
+
+    # 2. README e guida migrazione (solo se qualcosa è stato archiviato)
+    if archive.entries:
+        print("📝 Aggiornamento README e guida migrazione...")
+        write_archive_readme(archive.manifest['created'])
+        generate_migration_guide()
+    else:
+        print("📝 Archivio vuoto: README e guida migrazione non necessari")
     print()
 
-    # 4. Pulizia directory vuote
+    # 3. Pulizia directory vuote
     print("🧹 Pulizia directory vuote...")
     cleanup_empty_directories()
     print()
 
-    # 5. Genera guida migrazione
-    print("📝 Generazione guida migrazione...")
-    generate_migration_guide()
-    print()
-
     print("=" * 60)
-    print("  ✓ CLEANUP COMPLETATO")
+    print("  ✓ CLEANUP COMPLETATO" if ok else "  ✗ CLEANUP COMPLETATO CON ERRORI")
     print("=" * 60)
-    print(f"\n📂 File archiviati in: {ARCHIVE_DIR}")
-    print(f"📖 Guida migrazione: {ARCHIVE_DIR / 'MIGRATION_GUIDE.txt'}")
-    print(f"📚 Documentazione completa: electron-nsis-app/assets/ICONS_README.md")
-    print(f"\n⚠️  NOTA: Le icone archiviate possono essere eliminate")
-    print(f"   in sicurezza se non più necessarie.\n")
+    print(f"\n📚 Documentazione completa: electron-nsis-app/assets/ICONS_README.md")
+    if archive.entries:
+        print(f"📂 File archiviati in: {ARCHIVE_DIR}")
+        print(f"🧾 Manifest (SHA-256): {archive.manifest_path}")
+        print(f"📖 Guida migrazione: {ARCHIVE_DIR / 'MIGRATION_GUIDE.txt'}")
+        print(f"\n⚠️  NOTA: Le icone archiviate possono essere eliminate")
+        print(f"   in sicurezza se non più necessarie (o ripristinate con --restore).")
+    print()
+    return 0 if ok else 1
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark e test di regressione della pipeline icone
+
+Esegue icon_pipeline.py (stesso manifest, stessi output) su immagini sorgente
+sintetiche da 512 a 4096 px, con e senza canale alpha. Per ogni caso e per
+ogni fase riporta tempo reale, tempo CPU, picco RSS e byte prodotti.
+
+Con --update-golden salva gli output e i tempi come riferimento locale
+(scripts/.icon_benchmark_golden/, non versionato). I run successivi vengono
+confrontati col riferimento e il comando termina con errore se:
+- un output cambia (pixel diversi oltre --pixel-tolerance, o byte diversi
+  a parità di pixel: codifica cambiata);
+- la fase render o encode diventa più lenta oltre --time-tolerance.
+
+Uso:
+    python icon_benchmark.py [--sizes 512 1024 2048 4096] [--jobs N] [--repeat N]
+                             [--update-golden] [--json report.json]
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageChops, ImageDraw, ImageFilter, ImageStat
+
+from icon_build_cache import BuildCache
+from icon_containers import ICNS_HEADER_SIZE, validate_icns, validate_ico
+from icon_pipeline import DEFAULT_MANIFEST, build_plan, execute_plan, load_manifest
+from icon_render import StageStats, cpu_seconds, peak_rss_bytes
+
+DEFAULT_SIZES = [512, 1024, 2048, 4096]
+DEFAULT_GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".icon_benchmark_golden")
+GOLDEN_FILE = "golden.json"
+
+# Fasi controllate per i rallentamenti
+TIMED_STAGES = ('render', 'encode')
+
+# Margine assoluto sui tempi, per non segnalare rumore su fasi molto brevi
+TIME_SLACK_SECONDS = 0.02
+
+
+def make_source(size, alpha, output_path):
+    """
+    Crea un'immagine sorgente sintetica deterministica
+
+    Gradienti per i colori, una griglia di linee sottili per il dettaglio ad
+    alta frequenza (stressa il ricampionamento) e, con alpha, un disco con
+    bordo sfumato su sfondo trasparente. Proporzioni non quadrate come il logo.
+
+    Args:
+        size: Larghezza in pixel
+        alpha: Se True genera RGBA, altrimenti RGB
+        output_path: Percorso del PNG da scrivere
+    """
+    width, height = size, int(size * 0.92)
+    red = Image.linear_gradient('L').resize((width, height))
+    green = Image.radial_gradient('L').resize((width, height))
+    blue = Image.linear_gradient('L').rotate(90).resize((width, height))
+    img = Image.merge('RGB', (red, green, blue))
+
+    draw = ImageDraw.Draw(img)
+    step = max(size // 64, 4)
+    for offset in range(0, max(width, height), step):
+        draw.line([(offset, 0), (offset, height)], fill=(255, 255, 255), width=1)
+        draw.line([(0, offset), (width, offset)], fill=(0, 0, 0), width=1)
+
+    if alpha:
+        mask = Image.new('L', (width, height), 0)
+        margin = size // 16
+        ImageDraw.Draw(mask).ellipse([margin, margin, width - margin, height - margin], fill=255)
+        mask = mask.filter(ImageFilter.GaussianBlur(radius=max(size / 256, 1)))
+        img.putalpha(mask)
+
+    img.save(output_path, 'PNG', compress_level=1)
+
+
+def case_name(size, alpha):
+    return f"{size}-{'rgba' if alpha else 'rgb'}"
+
+
+def run_case(source_path, out_dir, jobs):
+    """
+    Esegue la pipeline completa su una sorgente (in un processo dedicato)
+
+    Args:
+        source_path: Immagine sorgente
+        out_dir: Directory radice degli output
+        jobs: Processi per la codifica PNG
+
+    Returns:
+        Dizionario con tempi totali, fasi e output prodotti
+    """
+    with open(DEFAULT_MANIFEST, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    data['root'] = out_dir
+    data['sources'] = {name: source_path for name in data['sources']}
+    # Gli asset ricompressi sul posto non dipendono dalla sorgente
+    data.pop('recompress', None)
+
+    manifest_path = os.path.join(out_dir, 'manifest.json')
+    os.makedirs(out_dir, exist_ok=True)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+    manifest = load_manifest(manifest_path)
+    cache = BuildCache(manifest_path=os.path.join(out_dir, 'cache.json'), force=True)
+    plan = build_plan(manifest, cache)
+
+    stats = StageStats()
+    start = time.perf_counter()
+    cpu_start = cpu_seconds()
+    execute_plan(manifest, plan, cache, jobs, stats, verbose=False)
+
+    outputs = {}
+    for output in manifest['outputs']:
+        with open(output['path'], 'rb') as f:
+            content = f.read()
+        outputs[output['name']] = {'bytes': len(content), 'sha256': hashlib.sha256(content).hexdigest()}
+
+    return {
+        'wall_seconds': time.perf_counter() - start,
+        'cpu_seconds': cpu_seconds() - cpu_start,
+        'peak_rss': peak_rss_bytes(),
+        'stages': stats.stages,
+        'outputs': outputs,
+    }
+
+
+def merge_repeats(runs):
+    """Tiene il minimo dei tempi tra le ripetizioni (meno sensibile al rumore)"""
+    best = dict(runs[0])
+    best['wall_seconds'] = min(run['wall_seconds'] for run in runs)
+    best['cpu_seconds'] = min(run['cpu_seconds'] for run in runs)
+    best['stages'] = {}
+    for name, stage in runs[0]['stages'].items():
+        merged = dict(stage)
+        merged['seconds'] = min(run['stages'][name]['seconds'] for run in runs)
+        merged['cpu_seconds'] = min(run['stages'][name]['cpu_seconds'] for run in runs)
+        best['stages'][name] = merged
+    return best
+
+
+def read_frames(path):
+    """
+    Immagini contenute in un output (PNG singolo, oppure frame di ICO/ICNS)
+
+    Args:
+        path: Percorso dell'output
+
+    Returns:
+        Dizionario {chiave frame: Immagine RGBA}
+    """
+    lower = path.lower()
+    if not (lower.endswith('.ico') or lower.endswith('.icns')):
+        return {'png': Image.open(path).convert('RGBA')}
+
+    is_icns = lower.endswith('.icns')
+    entries = validate_icns(path) if is_icns else validate_ico(path)
+    frames = {}
+    with open(path, 'rb') as f:
+        for entry in entries:
+            header = ICNS_HEADER_SIZE if is_icns else 0
+            f.seek(entry['offset'] + header)
+            data = f.read(entry['length'] - header)
+            key = entry['type'] if is_icns else str(entry['size'])
+            frames[key] = Image.open(io.BytesIO(data)).convert('RGBA')
+    return frames
+
+
+def pixel_diff(path, golden_path):
+    """
+    Differenza pixel per pixel tra un output e il suo riferimento
+
+    Args:
+        path: Output corrente
+        golden_path: Output di riferimento
+
+    Returns:
+        Tupla (differenza massima 0-255, differenza media), o None se i frame non corrispondono
+    """
+    frames = read_frames(path)
+    golden = read_frames(golden_path)
+    if frames.keys() != golden.keys():
+        return None
+
+    worst, total = 0, 0.0
+    for key, img in frames.items():
+        if img.size != golden[key].size:
+            return None
+        diff = ImageChops.difference(img, golden[key])
+        worst = max(worst, max(high for _, high in diff.getextrema()))
+        total = max(total, sum(ImageStat.Stat(diff).mean) / 4)
+    return worst, total
+
+
+def compare_case(name, result, out_dir, golden, golden_dir, args):
+    """
+    Confronta un caso col riferimento
+
+    Returns:
+        Lista dei problemi trovati (vuota se nessuna regressione)
+    """
+    problems = []
+    expected = golden.get(name)
+    if expected is None:
+        return [f"{name}: nessun riferimento (esegui con --update-golden)"]
+
+    if set(result['outputs']) != set(expected['outputs']):
+        problems.append(f"{name}: elenco output diverso dal riferimento")
+
+    for output_name, info in result['outputs'].items():
+        reference = expected['outputs'].get(output_name)
+        if reference is None or reference['sha256'] == info['sha256']:
+            continue
+
+        diff = pixel_diff(os.path.join(out_dir, output_name), os.path.join(golden_dir, name, output_name))
+        if diff is None:
+            problems.append(f"{name}: {output_name} ha frame o dimensioni diverse")
+        elif diff[0] > args.pixel_tolerance:
+            problems.append(f"{name}: {output_name} render cambiato (diff max {diff[0]}, media {diff[1]:.3f})")
+        elif diff[0] == 0:
+            problems.append(f"{name}: {output_name} codifica cambiata "
+                            f"({reference['bytes']} -> {info['bytes']} byte, pixel identici)")
+
+    for stage in TIMED_STAGES:
+        current = result['stages'].get(stage, {}).get('seconds', 0.0)
+        baseline = expected['stages'].get(stage, {}).get('seconds', 0.0)
+        if current > baseline * (1 + args.time_tolerance) + TIME_SLACK_SECONDS:
+            problems.append(f"{name}: fase {stage} più lenta ({baseline * 1000:.0f} -> {current * 1000:.0f} ms)")
+
+    return problems
+
+
+def format_bytes(value):
+    return "n/d" if value is None else f"{value / (1024 * 1024):.1f} MB"
+
+
+def print_case(name, result):
+    total_bytes = sum(info['bytes'] for info in result['outputs'].values())
+    print(f"\n[*] {name}: {result['wall_seconds'] * 1000:.0f} ms reali, {result['cpu_seconds'] * 1000:.0f} ms CPU, "
+          f"picco RSS {format_bytes(result['peak_rss'])}, output {total_bytes / 1024:.0f} KB")
+    for stage, entry in result['stages'].items():
+        print(f"    {stage:<8} {entry['seconds'] * 1000:8.1f} ms  cpu {entry['cpu_seconds'] * 1000:8.1f} ms  "
+              f"RSS {format_bytes(entry['peak_rss']):>9}  output {entry['output_bytes'] / 1024:8.1f} KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark e regressioni della pipeline icone")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Dimensioni delle sorgenti sintetiche")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="Processi per la codifica PNG")
+    parser.add_argument('--repeat', type=int, default=1, help="Ripetizioni per caso (si tiene il tempo minimo)")
+    parser.add_argument('--golden', default=DEFAULT_GOLDEN_DIR, help="Directory del riferimento")
+    parser.add_argument('--update-golden', action='store_true', help="Salva i risultati come nuovo riferimento")
+    parser.add_argument('--time-tolerance', type=float, default=0.25, help="Rallentamento ammesso (0.25 = +25%%)")
+    parser.add_argument('--pixel-tolerance', type=int, default=0, help="Differenza massima ammessa per canale (0-255)")
+    parser.add_argument('--json', help="Scrive il report completo in questo file")
+    args = parser.parse_args()
+
+    golden_path = os.path.join(args.golden, GOLDEN_FILE)
+    golden = {}
+    if not args.update_golden and os.path.exists(golden_path):
+        with open(golden_path, 'r', encoding='utf-8') as f:
+            golden = json.load(f)
+
+    work_dir = tempfile.mkdtemp(prefix='icon-benchmark-')
+    results = {}
+    problems = []
+
+    try:
+        for size in args.sizes:
+            for alpha in (True, False):
+                name = case_name(size, alpha)
+                source_path = os.path.join(work_dir, f"{name}.png")
+                make_source(size, alpha, source_path)
+
+                # Ogni ripetizione in un processo nuovo: il picco RSS è quello del solo caso
+                runs = []
+                for repeat in range(max(1, args.repeat)):
+                    out_dir = os.path.join(work_dir, name)
+                    shutil.rmtree(out_dir, ignore_errors=True)
+                    with ProcessPoolExecutor(max_workers=1) as pool:
+                        runs.append(pool.submit(run_case, source_path, out_dir, args.jobs).result())
+
+                result = merge_repeats(runs)
+                results[name] = result
+                print_case(name, result)
+
+                if args.update_golden:
+                    shutil.rmtree(os.path.join(args.golden, name), ignore_errors=True)
+                    shutil.copytree(out_dir, os.path.join(args.golden, name))
+                elif golden:
+                    problems += compare_case(name, result, out_dir, golden, args.golden, args)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'results': results, 'problems': problems}, f, indent=2)
+
+    if args.update_golden:
+        os.makedirs(args.golden, exist_ok=True)
+        with open(golden_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n[+] Riferimento aggiornato: {args.golden}")
+        return 0
+
+    if not golden:
+        print("\n[i] Nessun riferimento: esegui con --update-golden per crearlo")
+        return 0
+
+    if problems:
+        print(f"\n[-] {len(problems)} regressioni:")
+        for problem in problems:
+            print(f"  [!] {problem}")
+        return 1
+
+    print("\n[+] Nessuna regressione rispetto al riferimento")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache incrementale per i generatori di icone
+
+Registra in un manifest JSON, per ogni file generato, l'hash dell'immagine
+sorgente, i parametri di generazione (dimensione, padding, formato) e l'hash
+del file prodotto. Al run successivo vengono rigenerati solo gli output non
+aggiornati: sorgente cambiata, parametri diversi, file mancante o modificato.
+"""
+
+import hashlib
+import json
+import os
+
+# Incrementare quando cambia il modo in cui vengono generati gli output
+CACHE_VERSION = 1
+
+DEFAULT_MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".icon_build_cache.json")
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """
+    Calcola lo SHA-256 di un file leggendolo a blocchi
+
+    Args:
+        path: Percorso del file
+        chunk_size: Dimensione dei blocchi letti
+
+    Returns:
+        Digest esadecimale
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildCache:
+    """Manifest degli output generati, con conteggio hit/miss"""
+
+    def __init__(self, manifest_path=DEFAULT_MANIFEST, force=False):
+        """
+        Args:
+            manifest_path: Percorso del manifest JSON
+            force: Se True ignora la cache e rigenera tutto
+        """
+        self.manifest_path = manifest_path
+        self.force = force
+        self.hits = []
+        self.misses = []
+        self.entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if data.get('version') != CACHE_VERSION:
+            return {}
+        return data.get('outputs', {})
+
+    @staticmethod
+    def _key(output_path):
+        return os.path.normcase(os.path.abspath(output_path))
+
+    def is_fresh(self, output_path, params, source_hash):
+        """
+        Verifica se un output è aggiornato rispetto a sorgente e parametri
+
+        Args:
+            output_path: Percorso del file di output
+            params: Dizionario serializzabile dei parametri di generazione
+            source_hash: Hash della sorgente di questo output (vedi file_sha256)
+
+        Returns:
+            True se il file può essere riutilizzato (hit), False se va rigenerato (miss)
+        """
+        entry = self.entries.get(self._key(output_path))
+        fresh = (
+            not self.force
+            and entry is not None
+            and entry.get('source') == source_hash
+            and entry.get('params') == params
+            and os.path.exists(output_path)
+            and entry.get('output') == file_sha256(output_path)
+        )
+
+        (self.hits if fresh else self.misses).append(output_path)
+        return fresh
+
+    def record(self, output_path, params, source_hash):
+        """
+        Registra un output appena generato
+
+        Args:
+            output_path: Percorso del file di output
+            params: Parametri usati per generarlo
+            source_hash: Hash della sorgente di questo output (vedi file_sha256)
+        """
+        self.entries[self._key(output_path)] = {
+            'source': source_hash,
+            'params': params,
+            'output': file_sha256(output_path),
+        }
+
+    def save(self):
+        """Scrive il manifest su disco"""
+        data = {'version': CACHE_VERSION, 'outputs': self.entries}
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def print_summary(self):
+        """Stampa il riepilogo hit/miss"""
+        total = len(self.hits) + len(self.misses)
+        print(f"[*] Cache: {len(self.hits)}/{total} output aggiornati (hit), {len(self.misses)} rigenerati (miss)")
+        if self.force:
+            print("  [i] --force: cache ignorata")
@@ -0,0 +1,616 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analisi delle dimensioni delle icone nel bundle dell'applicazione
+
+Attribuisce i byte a ogni tipo di icona:
+- icone raster (assets/, renderer/src/assets/): dimensioni, formato, SHA-256,
+  file che le referenziano; segnala i file non usati e i duplicati
+  (stesso contenuto, es. assets/icon.png e assets/icons/icon-512.png);
+- componenti icona SVG (Lucide, importati da renderer/src/components/icons):
+  byte del modulo, presenza nel bundle webpack e file che li usano;
+- icone animate (AnimatedIcons.tsx): byte del componente e delle regole CSS
+  e @keyframes che usa, da AnimatedIcons.css;
+- output webpack (dist/renderer): byte e byte gzip di ogni file.
+
+Se esiste l'archivio delle icone legacy (icons_legacy/manifest.json, vedi
+cleanup_legacy_icons.py) ne riporta anche il totale, per confrontarlo con
+il sistema attuale.
+
+Il report JSON (--json) può essere confrontato con quello di una release
+precedente (--diff).
+
+Uso:
+    python icon_bundle_report.py [--dist DIR] [--json report.json] [--diff precedente.json]
+"""
+
+import argparse
+import gzip
+import io
+import json
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from PIL import Image
+
+from asset_archiver import MANIFEST_NAME
+from icon_build_cache import file_sha256
+from icon_containers import validate_icns, validate_ico
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+REPORT_VERSION = 1
+
+# Directory (relative a PROJECT_ROOT) con le icone raster sorgente
+RASTER_DIRS = ['assets', 'renderer/src/assets']
+RASTER_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.ico', '.icns')
+
+# Sorgenti in cui cercare i riferimenti alle icone
+REFERENCE_DIRS = ['main', 'renderer', 'shared']
+REFERENCE_FILES = ['package.json', 'webpack.config.js']
+REFERENCE_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx', '.css', '.html', '.json')
+
+# Icone usate da electron-builder per nome nella directory buildResources
+BUILDER_CONVENTIONS = [
+    re.compile(r'^icon\.(ico|icns|png)$'),
+    re.compile(r'^(Square\d+x\d+Logo|Wide\d+x\d+Logo|StoreLogo|LargeTile|SmallTile|SplashScreen)\b'),
+]
+
+ICONS_DIR = 'renderer/src/components/icons'
+ICON_INDEX = f'{ICONS_DIR}/index.tsx'
+ANIMATED_SOURCE = f'{ICONS_DIR}/AnimatedIcons.tsx'
+ANIMATED_CSS = f'{ICONS_DIR}/AnimatedIcons.css'
+LUCIDE_ESM_DIR = 'node_modules/lucide-react/dist/esm'
+
+LEGACY_ARCHIVE = 'icons_legacy'
+
+DEFAULT_DIST = 'dist/renderer'
+
+
+def rel(path, root):
+    return Path(path).relative_to(root).as_posix()
+
+
+def read_text(path):
+    try:
+        return Path(path).read_text(encoding='utf-8', errors='replace')
+    except OSError:
+        return ''
+
+
+def gzip_size(path):
+    """Dimensione del file compresso con gzip (livello 9)"""
+    with open(path, 'rb') as f:
+        return len(gzip.compress(f.read(), compresslevel=9, mtime=0))
+
+
+def kebab_case(name):
+    """Nome di un componente Lucide (BarChart3) nel nome file (bar-chart-3)"""
+    name = re.sub(r'([a-z0-9])([A-Z])', r'\1-\2', name)
+    name = re.sub(r'([A-Za-z])([0-9])', r'\1-\2', name)
+    return name.lower()
+
+
+def load_reference_sources(root):
+    """
+    Legge i sorgenti in cui cercare i riferimenti alle icone
+
+    Returns:
+        Dizionario {percorso relativo: testo}
+    """
+    sources = {}
+    for directory in REFERENCE_DIRS:
+        for path in sorted((root / directory).rglob('*')):
+            if path.is_file() and path.suffix in REFERENCE_EXTENSIONS:
+                sources[rel(path, root)] = read_text(path)
+    for name in REFERENCE_FILES:
+        if (root / name).is_file():
+            sources[name] = read_text(root / name)
+    return sources
+
+
+def find_references(sources, patterns, exclude=()):
+    """File che contengono almeno uno dei pattern (regex compilate)"""
+    return sorted(
+        path for path, text in sources.items()
+        if path not in exclude and any(pattern.search(text) for pattern in patterns)
+    )
+
+
+def raster_info(path):
+    """Formato, dimensioni in pixel e numero di frame di un'icona raster"""
+    try:
+        if path.suffix == '.ico':
+            sizes = [entry['size'] for entry in validate_ico(path)]
+            return {'format': 'ico', 'width': max(sizes), 'height': max(sizes), 'frames': len(sizes)}
+        if path.suffix == '.icns':
+            sizes = [entry['size'] for entry in validate_icns(path) if entry['size']]
+            side = max(sizes) if sizes else None
+            return {'format': 'icns', 'width': side, 'height': side, 'frames': len(sizes)}
+        with Image.open(path) as img:
+            return {
+                'format': (img.format or path.suffix[1:]).lower(),
+                'width': img.width,
+                'height': img.height,
+                'frames': getattr(img, 'n_frames', 1),
+            }
+    except (OSError, ValueError) as e:
+        return {'format': 'invalid', 'width': None, 'height': None, 'frames': 0, 'error': str(e)}
+
+
+def builder_resources(root):
+    """Directory buildResources di electron-builder (da package.json)"""
+    try:
+        with open(root / 'package.json', 'r', encoding='utf-8') as f:
+            return json.load(f)['build']['directories']['buildResources']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def scan_rasters(root, sources):
+    """
+    Icone raster sorgente con riferimenti, convenzioni e duplicati
+
+    Un'icona è considerata usata se il suo nome file compare nei sorgenti o
+    nella configurazione di build, o se electron-builder la usa per nome.
+    Tra file identici resta "canonico" quello usato (o il primo in ordine).
+
+    Returns:
+        Lista di dizionari, uno per file
+    """
+    build_dir = builder_resources(root)
+    rasters = []
+
+    for directory in RASTER_DIRS:
+        for path in sorted((root / directory).rglob('*')):
+            if not path.is_file() or path.suffix.lower() not in RASTER_EXTENSIONS:
+                continue
+
+            name_pattern = re.compile(r'(?<![\w.-])' + re.escape(path.name) + r'(?![\w.-])')
+            referenced_by = find_references(sources, [name_pattern])
+            convention = None
+            if build_dir and path.parent == root / build_dir:
+                if any(pattern.search(path.name) for pattern in BUILDER_CONVENTIONS):
+                    convention = 'electron-builder'
+
+            entry = {
+                'path': rel(path, root),
+                'bytes': path.stat().st_size,
+                'sha256': file_sha256(path),
+                'referenced_by': referenced_by,
+                'convention': convention,
+                'used': bool(referenced_by or convention),
+                'duplicate_of': None,
+            }
+            entry.update(raster_info(path))
+            rasters.append(entry)
+
+    by_hash = {}
+    for entry in sorted(rasters, key=lambda e: (not e['used'], e['path'])):
+        canonical = by_hash.setdefault(entry['sha256'], entry['path'])
+        if canonical != entry['path']:
+            entry['duplicate_of'] = canonical
+
+    return rasters
+
+
+def parse_lucide_imports(text):
+    """Nomi importati da 'lucide-react' (esclusi i tipi)"""
+    names = []
+    for block in re.findall(r"import\s*\{([^}]*)\}\s*from\s*'lucide-react'", text):
+        block = re.sub(r'//[^\n]*', '', block)
+        names.extend(name.strip() for name in block.split(',') if name.strip())
+    return names
+
+
+def parse_icon_aliases(text):
+    """
+    Alias dei componenti nei gruppi di index.tsx
+
+    Returns:
+        Dizionario {componente: ['StatusIcons.Loading', 'Icons.Status.Loading', ...]}
+    """
+    groups = dict(re.findall(r'^\s+(\w+):\s*(\w+Icons|\w+Map),', text, re.MULTILINE))
+    group_names = {value: key for key, value in groups.items()}
+
+    aliases = {}
+    for group, body in re.findall(r'export const (\w+) = \{(.*?)\} as const;', text, re.DOTALL):
+        for key, component in re.findall(r"^\s+'?([\w.]+)'?:\s*(?:\w+\.)?(\w+),", body, re.MULTILINE):
+            if group.endswith('Map') or group not in group_names:
+                continue
+            aliases.setdefault(component, []).extend([
+                f'{group}.{key}',
+                f'Icons.{group_names[group]}.{key}',
+            ])
+    return aliases
+
+
+def lucide_modules(root):
+    """
+    File del modulo ESM di ogni componente Lucide (alias compresi)
+
+    Returns:
+        Dizionario {componente: percorso del file} (vuoto senza node_modules)
+    """
+    esm_dir = root / LUCIDE_ESM_DIR
+    index = read_text(esm_dir / 'lucide-react.js')
+    modules = {}
+    for names, module in re.findall(r"export \{([^}]*)\} from '\./icons/([\w-]+)\.js'", index):
+        for name in re.findall(r'as (\w+)', names):
+            modules[name] = esm_dir / 'icons' / f'{module}.js'
+    return modules
+
+
+def scan_svg_icons(root, sources, bundle_text):
+    """
+    Componenti icona SVG importati dal sistema icone
+
+    Returns:
+        Lista di dizionari, uno per componente
+    """
+    index_text = read_text(root / ICON_INDEX)
+    names = parse_lucide_imports(index_text) + parse_lucide_imports(read_text(root / ANIMATED_SOURCE))
+    aliases = parse_icon_aliases(index_text)
+    modules = lucide_modules(root)
+    definitions = {ICON_INDEX, ANIMATED_SOURCE}
+
+    icons = []
+    for name in sorted(set(names)):
+        module = modules.get(name)
+        icon_name = module.stem if module else kebab_case(name)
+        patterns = [re.compile(r'\b' + re.escape(name) + r'\b')]
+        patterns += [re.compile(re.escape(alias) + r'\b') for alias in aliases.get(name, [])]
+
+        icons.append({
+            'name': name,
+            'icon': icon_name,
+            'module_bytes': module.stat().st_size if module and module.exists() else None,
+            'in_bundle': (f'"{icon_name}"' in bundle_text) if bundle_text else None,
+            'aliases': aliases.get(name, []),
+            'referenced_by': find_references(sources, patterns, exclude=definitions),
+        })
+    return icons
+
+
+def css_blocks(text):
+    """
+    Blocchi CSS di primo livello
+
+    Returns:
+        Lista di tuple (preludio, corpo, byte del blocco)
+    """
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.DOTALL)
+    blocks = []
+    depth = 0
+    start = 0
+    body_start = 0
+    for index, char in enumerate(text):
+        if char == '{':
+            if depth == 0:
+                body_start = index
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                prelude = text[start:body_start].strip()
+                blocks.append((prelude, text[body_start + 1:index], len(text[start:index + 1].strip().encode('utf-8'))))
+                start = index + 1
+    return blocks
+
+
+def css_rules(text):
+    """
+    Regole e @keyframes di un foglio di stile (i blocchi @media vengono espansi)
+
+    Returns:
+        Tupla (lista di (selettore, corpo, byte), {nome keyframes: byte})
+    """
+    rules = []
+    keyframes = {}
+    for prelude, body, size in css_blocks(text):
+        if prelude.startswith('@keyframes'):
+            keyframes[prelude.split()[1]] = size
+        elif prelude.startswith('@'):
+            inner_rules, inner_keyframes = css_rules(body)
+            rules.extend(inner_rules)
+            keyframes.update(inner_keyframes)
+        else:
+            rules.append((prelude, body, size))
+    return rules, keyframes
+
+
+def scan_animated_icons(root, sources):
+    """
+    Icone animate: byte del componente e delle regole CSS che usa
+
+    Le regole condivise da più componenti (e i @keyframes usati da più
+    regole) vengono suddivisi in parti uguali, così la somma per componente
+    più i byte non attribuiti corrisponde al foglio di stile.
+
+    Returns:
+        Tupla (lista di dizionari per componente, byte CSS non attribuiti)
+    """
+    source = read_text(root / ANIMATED_SOURCE)
+    rules, keyframes = css_rules(read_text(root / ANIMATED_CSS))
+
+    # Segmento di sorgente di ogni componente: dal suo "export const" al successivo
+    starts = [(m.start(), m.group(1)) for m in re.finditer(r'^export const (\w+Icon)\b', source, re.MULTILINE)]
+    ends = [m.start() for m in re.finditer(r'^export ', source, re.MULTILINE)]
+    components = {}
+    for start, name in starts:
+        end = next((e for e in ends if e > start), len(source))
+        segment = source[start:end]
+        classes = set()
+        for literal in re.findall(r'className=\{?[`"\']([^`"\']*)', segment):
+            classes.update(token for token in literal.split() if not token.startswith('$'))
+        components[name] = {'bytes': len(segment.encode('utf-8')), 'classes': classes, 'css_bytes': 0.0}
+
+    def class_pattern(name):
+        return re.compile(r'\.' + re.escape(name) + r'(?![\w-])')
+
+    attributed = 0.0
+    keyframe_users = {}
+    for selector, body, size in rules:
+        owners = [
+            name for name, info in components.items()
+            if any(class_pattern(cls).search(selector) for cls in info['classes'])
+        ]
+        if not owners:
+            continue
+        for name in owners:
+            components[name]['css_bytes'] += size / len(owners)
+        attributed += size
+        for animation in re.findall(r'animation(?:-name)?\s*:\s*([\w-]+)', body):
+            if animation in keyframes:
+                keyframe_users.setdefault(animation, set()).update(owners)
+
+    for animation, owners in keyframe_users.items():
+        for name in owners:
+            components[name]['css_bytes'] += keyframes[animation] / len(owners)
+        attributed += keyframes[animation]
+
+    total_css = sum(size for _, _, size in rules) + sum(keyframes.values())
+    definitions = {ANIMATED_SOURCE, ICON_INDEX}
+
+    icons = []
+    for name, info in components.items():
+        icons.append({
+            'name': name,
+            'source_bytes': info['bytes'],
+            'css_classes': sorted(info['classes']),
+            'css_bytes': round(info['css_bytes']),
+            'referenced_by': find_references(sources, [re.compile(r'\b' + name + r'\b')], exclude=definitions),
+        })
+    return icons, round(total_css - attributed)
+
+
+def scan_bundle(root, dist):
+    """
+    File prodotti da webpack
+
+    Returns:
+        Tupla (lista di dizionari per file, testo concatenato dei file JS)
+    """
+    dist_dir = root / dist
+    files = []
+    js_text = []
+    if not dist_dir.is_dir():
+        return files, ''
+
+    for path in sorted(dist_dir.rglob('*')):
+        if not path.is_file():
+            continue
+        suffix = path.suffix.lower()
+        if suffix == '.js':
+            kind = 'js'
+            js_text.append(read_text(path))
+        elif suffix in RASTER_EXTENSIONS or suffix == '.svg':
+            kind = 'image'
+        elif suffix in ('.css', '.html', '.map'):
+            kind = suffix[1:]
+        else:
+            kind = 'other'
+        files.append({
+            'path': rel(path, root),
+            'kind': kind,
+            'bytes': path.stat().st_size,
+            'gzip_bytes': gzip_size(path),
+        })
+    return files, '\n'.join(js_text)
+
+
+def legacy_archive_bytes(root):
+    """Byte delle icone legacy archiviate (None se l'archivio non esiste)"""
+    try:
+        with open(root / LEGACY_ARCHIVE / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            entries = json.load(f).get('entries', {})
+    except (OSError, ValueError):
+        return None
+    return sum(entry['size'] for entry in entries.values())
+
+
+def build_report(root, dist):
+    """
+    Analizza progetto e bundle
+
+    Args:
+        root: Directory del progetto (electron-nsis-app)
+        dist: Output webpack del renderer, relativo a root
+
+    Returns:
+        Report come dizionario serializzabile in JSON
+    """
+    sources = load_reference_sources(root)
+    bundle, bundle_text = scan_bundle(root, dist)
+    rasters = scan_rasters(root, sources)
+    svg_icons = scan_svg_icons(root, sources, bundle_text)
+    animated, unattributed_css = scan_animated_icons(root, sources)
+
+    lucide_chunks = [entry for entry in bundle if 'lucide' in Path(entry['path']).name]
+    totals = {
+        'raster_files': len(rasters),
+        'raster_bytes': sum(e['bytes'] for e in rasters),
+        'unused_raster_bytes': sum(e['bytes'] for e in rasters if not e['used']),
+        'duplicate_raster_bytes': sum(e['bytes'] for e in rasters if e['duplicate_of']),
+        'svg_components': len(svg_icons),
+        'svg_module_bytes': sum(e['module_bytes'] or 0 for e in svg_icons),
+        'animated_icons': len(animated),
+        'animated_source_bytes': sum(e['source_bytes'] for e in animated),
+        'animated_css_bytes': sum(e['css_bytes'] for e in animated),
+        'unattributed_css_bytes': unattributed_css,
+        'bundle_bytes': sum(e['bytes'] for e in bundle),
+        'bundle_gzip_bytes': sum(e['gzip_bytes'] for e in bundle),
+        'lucide_chunk_bytes': sum(e['bytes'] for e in lucide_chunks),
+        'legacy_archive_bytes': legacy_archive_bytes(root),
+    }
+
+    return {
+        'version': REPORT_VERSION,
+        'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'dist': dist,
+        'totals': totals,
+        'raster': rasters,
+        'svg_icons': svg_icons,
+        'animated_icons': animated,
+        'bundle': bundle,
+    }
+
+
+def format_kb(value):
+    return "n/d" if value is None else f"{value / 1024:.1f} KB"
+
+
+def print_report(report):
+    totals = report['totals']
+
+    print(f"[*] Icone raster: {totals['raster_files']} file, {format_kb(totals['raster_bytes'])}")
+    for entry in report['raster']:
+        note = entry['convention'] or ", ".join(entry['referenced_by']) if entry['used'] else "non usato"
+        if entry['duplicate_of']:
+            note = f"duplicato di {entry['duplicate_of']} ({note})"
+        mark = "[!]" if not entry['used'] else "[i]" if entry['duplicate_of'] else "[+]"
+        size = f"{entry['width']}x{entry['height']}" if entry['width'] else entry['format']
+        print(f"  {mark} {entry['path']:<58} {format_kb(entry['bytes']):>9}  {size:<9}  {note}")
+
+    print(f"\n[*] Componenti SVG: {totals['svg_components']}, moduli {format_kb(totals['svg_module_bytes'] or None)}")
+    unused = [e['name'] for e in report['svg_icons'] if not e['referenced_by']]
+    if unused:
+        print(f"  [i] Non usati fuori dal sistema icone: {', '.join(unused)}")
+    if report['bundle']:
+        missing = [e['name'] for e in report['svg_icons'] if e['in_bundle'] is False]
+        print(f"  [i] Nel bundle: {totals['svg_components'] - len(missing)}, esclusi dal tree-shaking: {len(missing)}")
+
+    print(f"\n[*] Icone animate: {totals['animated_icons']}, componenti {format_kb(totals['animated_source_bytes'])}, "
+          f"CSS {format_kb(totals['animated_css_bytes'])} (+{format_kb(totals['unattributed_css_bytes'])} non attribuiti)")
+    for entry in report['animated_icons']:
+        users = ", ".join(entry['referenced_by']) or "non usato"
+        mark = "[+]" if entry['referenced_by'] else "[!]"
+        print(f"  {mark} {entry['name']:<18} {format_kb(entry['source_bytes']):>9} + CSS {format_kb(entry['css_bytes']):>9}  {users}")
+
+    if report['bundle']:
+        print(f"\n[*] Bundle {report['dist']}: {format_kb(totals['bundle_bytes'])} "
+              f"(gzip {format_kb(totals['bundle_gzip_bytes'])}), chunk Lucide {format_kb(totals['lucide_chunk_bytes'])}")
+    else:
+        print(f"\n[!] Bundle {report['dist']} non trovato: esegui prima 'npm run build:renderer'")
+
+    if totals['legacy_archive_bytes'] is not None:
+        print(f"[*] Icone legacy archiviate: {format_kb(totals['legacy_archive_bytes'])}")
+
+    print(f"\n[=] Raster non usati (eliminabili): {format_kb(totals['unused_raster_bytes'])}, "
+          f"duplicati: {format_kb(totals['duplicate_raster_bytes'])}")
+
+
+def diff_reports(old, new):
+    """
+    Differenze tra due report
+
+    Returns:
+        Dizionario {'totals': {chiave: (prima, dopo)}, sezione: {'added', 'removed', 'changed'}}
+    """
+    diff = {'totals': {}}
+    for key, value in new['totals'].items():
+        previous = old['totals'].get(key)
+        if previous != value:
+            diff['totals'][key] = (previous, value)
+
+    sections = {
+        'raster': ('path', 'bytes'),
+        'svg_icons': ('name', 'module_bytes'),
+        'animated_icons': ('name', 'css_bytes'),
+        'bundle': ('path', 'bytes'),
+    }
+    for section, (key, size_key) in sections.items():
+        before = {e[key]: e for e in old.get(section, [])}
+        after = {e[key]: e for e in new.get(section, [])}
+        diff[section] = {
+            'added': sorted(set(after) - set(before)),
+            'removed': sorted(set(before) - set(after)),
+            'changed': {
+                name: (before[name][size_key], after[name][size_key])
+                for name in sorted(set(before) & set(after))
+                if before[name][size_key] != after[name][size_key]
+                or before[name].get('sha256') != after[name].get('sha256')
+            },
+        }
+    return diff
+
+
+def print_diff(diff, old):
+    print(f"\n[*] Confronto con il report del {old.get('generated', '?')}")
+    for key, (before, after) in diff['totals'].items():
+        delta = f" ({after - before:+d})" if isinstance(before, int) and isinstance(after, int) else ""
+        print(f"  [=] {key}: {before} -> {after}{delta}")
+
+    for section in ('raster', 'svg_icons', 'animated_icons', 'bundle'):
+        changes = diff[section]
+        for name in changes['added']:
+            print(f"  [+] {section}: {name}")
+        for name in changes['removed']:
+            print(f"  [-] {section}: {name}")
+        for name, (before, after) in changes['changed'].items():
+            print(f"  [!] {section}: {name} {before} -> {after}")
+
+    if not any(diff['totals'].values()) and not any(
+            any(diff[section].values()) for section in diff if section != 'totals'):
+        print("  [=] Nessuna differenza")
+
+
+def main():
+    # Fix encoding per Windows console
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+    parser = argparse.ArgumentParser(description="Analisi delle dimensioni delle icone nel bundle")
+    parser.add_argument('--root', default=str(PROJECT_ROOT), help="Directory del progetto (default: electron-nsis-app)")
+    parser.add_argument('--dist', default=DEFAULT_DIST, help=f"Output webpack del renderer (default: {DEFAULT_DIST})")
+    parser.add_argument('--json', help="Scrive il report in questo file")
+    parser.add_argument('--diff', help="Report precedente da confrontare")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  Analisi Icone nel Bundle - Controllo Stato NSIS")
+    print("=" * 60)
+    print()
+
+    report = build_report(Path(args.root).resolve(), args.dist)
+    print_report(report)
+
+    if args.diff:
+        try:
+            with open(args.diff, 'r', encoding='utf-8') as f:
+                old = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[-] ERRORE lettura report precedente: {e}")
+            return 1
+        print_diff(diff_reports(old, report), old)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n[+] Report salvato in {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Scrittura e validazione dei contenitori ICO (Windows) e ICNS (macOS)
+
+I contenitori vengono scritti direttamente sul file di output a partire da
+buffer PNG già codificati (vedi IconRenderer.encode_png), senza copie
+intermedie. I validatori rileggono solo le intestazioni: directory, offset,
+lunghezze e chunk IHDR dei PNG, senza decodificare i pixel.
+"""
+
+import os
+import struct
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+ICO_HEADER_SIZE = 6
+ICO_ENTRY_SIZE = 16
+ICO_MAX_SIZE = 256
+
+ICNS_HEADER_SIZE = 8
+
+# Tipi di elemento ICNS con PNG: dimensione in pixel -> OSType
+ICNS_TYPES = {
+    16: b'icp4',
+    32: b'icp5',
+    64: b'icp6',
+    128: b'ic07',
+    256: b'ic08',
+    512: b'ic09',
+    1024: b'ic10',
+}
+
+# Varianti Retina (@2x): dimensione logica -> OSType (pixel = 2x)
+ICNS_RETINA_TYPES = {
+    16: b'ic11',
+    32: b'ic12',
+    128: b'ic13',
+    256: b'ic14',
+}
+
+# Dimensione in pixel attesa per ogni OSType
+ICNS_PIXEL_SIZES = {
+    **{ostype: size for size, ostype in ICNS_TYPES.items()},
+    **{ostype: size * 2 for size, ostype in ICNS_RETINA_TYPES.items()},
+}
+
+
+def png_dimensions(header):
+    """
+    Legge larghezza e altezza dall'intestazione di un PNG (firma + IHDR)
+
+    Args:
+        header: Almeno i primi 24 byte del file PNG
+
+    Returns:
+        Tupla (larghezza, altezza), oppure None se non è un PNG
+    """
+    if len(header) < 24 or header[:8] != PNG_SIGNATURE or header[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', header[16:24])
+
+
+def icns_entries_for_sizes(sizes):
+    """
+    Elementi ICNS (OSType, dimensione in pixel) per un insieme di dimensioni
+
+    Include le varianti Retina quando la dimensione doppia è disponibile.
+
+    Args:
+        sizes: Dimensioni in pixel disponibili
+
+    Returns:
+        Lista di tuple (ostype, pixel)
+    """
+    available = set(sizes)
+    entries = [(ostype, size) for size, ostype in ICNS_TYPES.items() if size in available]
+    entries += [(ostype, size * 2) for size, ostype in ICNS_RETINA_TYPES.items() if size * 2 in available]
+    return entries
+
+
+def write_ico(output_path, images):
+    """
+    Scrive un file ICO con immagini PNG già codificate
+
+    Args:
+        output_path: Percorso del file ICO
+        images: Lista di tuple (size, png_bytes), in ordine di directory
+    """
+    count = len(images)
+    offset = ICO_HEADER_SIZE + ICO_ENTRY_SIZE * count
+
+    with open(output_path, 'wb') as f:
+        # Header ICO: reserved(2) + type(2) + count(2)
+        f.write(struct.pack('<HHH', 0, 1, count))
+
+        # Entry della directory
+        for size, png_data in images:
+            if size > ICO_MAX_SIZE:
+                raise ValueError(f"Dimensione {size} non supportata dal formato ICO (max {ICO_MAX_SIZE})")
+            dim = size if size < ICO_MAX_SIZE else 0  # 0 = 256 nel formato ICO
+            # width, height, colors, reserved, color planes, bits per pixel, size, offset
+            f.write(struct.pack('<BBBBHHII', dim, dim, 0, 0, 1, 32, len(png_data), offset))
+            offset += len(png_data)
+
+        # Dati delle immagini PNG
+        for _, png_data in images:
+            f.write(png_data)
+
+
+def write_icns(output_path, images):
+    """
+    Scrive un file ICNS con immagini PNG già codificate
+
+    Args:
+        output_path: Percorso del file ICNS
+        images: Lista di tuple (ostype, png_bytes), vedi icns_entries_for_sizes
+    """
+    total = ICNS_HEADER_SIZE + sum(ICNS_HEADER_SIZE + len(png_data) for _, png_data in images)
+
+    with open(output_path, 'wb') as f:
+        # Header ICNS: magic + lunghezza totale (big endian)
+        f.write(b'icns' + struct.pack('>I', total))
+
+        for ostype, png_data in images:
+            if ostype not in ICNS_PIXEL_SIZES:
+                raise ValueError(f"Tipo ICNS non supportato: {ostype!r}")
+            f.write(ostype + struct.pack('>I', ICNS_HEADER_SIZE + len(png_data)))
+            f.write(png_data)
+
+
+def validate_ico(path):
+    """
+    Verifica struttura e coerenza di un file ICO senza decodificare le immagini
+
+    Controlla header, directory, offset e lunghezze (dentro il file e senza
+    sovrapposizioni) e, per le immagini PNG, che le dimensioni dell'IHDR
+    corrispondano alla directory.
+
+    Args:
+        path: Percorso del file ICO
+
+    Returns:
+        Lista di dizionari {size, offset, length, format}
+
+    Raises:
+        ValueError: Se il file non è un ICO valido
+    """
+    file_size = os.path.getsize(path)
+
+    with open(path, 'rb') as f:
+        header = f.read(ICO_HEADER_SIZE)
+        if len(header) < ICO_HEADER_SIZE:
+            raise ValueError("ICO troncato: header incompleto")
+
+        reserved, kind, count = struct.unpack('<HHH', header)
+        if reserved != 0 or kind != 1:
+            raise ValueError(f"Header ICO non valido (reserved={reserved}, type={kind})")
+        if count == 0:
+            raise ValueError("ICO senza immagini")
+
+        directory_end = ICO_HEADER_SIZE + ICO_ENTRY_SIZE * count
+        if directory_end > file_size:
+            raise ValueError(f"ICO troncato: directory di {count} entry oltre la fine del file")
+
+        entries = []
+        for _ in range(count):
+            width, height, _, _, _, _, length, offset = struct.unpack('<BBBBHHII', f.read(ICO_ENTRY_SIZE))
+            entries.append({
+                'width': width or ICO_MAX_SIZE,
+                'height': height or ICO_MAX_SIZE,
+                'offset': offset,
+                'length': length,
+            })
+
+        end = directory_end
+        for entry in sorted(entries, key=lambda e: e['offset']):
+            if entry['offset'] < end:
+                raise ValueError(f"Immagine {entry['width']}x{entry['height']}: offset {entry['offset']} sovrapposto")
+            end = entry['offset'] + entry['length']
+            if end > file_size:
+                raise ValueError(f"Immagine {entry['width']}x{entry['height']}: dati oltre la fine del file")
+
+            f.seek(entry['offset'])
+            head = f.read(24)
+            dims = png_dimensions(head)
+            if dims is not None:
+                entry['format'] = 'png'
+                if dims != (entry['width'], entry['height']):
+                    raise ValueError(f"Immagine {entry['width']}x{entry['height']}: IHDR dichiara {dims[0]}x{dims[1]}")
+            else:
+                # BMP senza file header: BITMAPINFOHEADER (altezza = immagine + maschera)
+                bi_size, bi_width, bi_height = struct.unpack('<Iii', head[:12]) if len(head) >= 12 else (0, 0, 0)
+                if bi_size != 40 or (bi_width, bi_height) != (entry['width'], entry['height'] * 2):
+                    raise ValueError(f"Immagine {entry['width']}x{entry['height']}: né PNG né BMP valido")
+                entry['format'] = 'bmp'
+
+    return [
+        {'size': e['width'], 'offset': e['offset'], 'length': e['length'], 'format': e['format']}
+        for e in entries
+    ]
+
+
+def validate_icns(path):
+    """
+    Verifica struttura e coerenza di un file ICNS senza decodificare le immagini
+
+    Controlla magic e lunghezza totale, che gli elementi coprano esattamente
+    il file e, per gli elementi PNG, che le dimensioni dell'IHDR corrispondano
+    al tipo dell'elemento.
+
+    Args:
+        path: Percorso del file ICNS
+
+    Returns:
+        Lista di dizionari {type, size, offset, length}
+
+    Raises:
+        ValueError: Se il file non è un ICNS valido
+    """
+    file_size = os.path.getsize(path)
+
+    with open(path, 'rb') as f:
+        header = f.read(ICNS_HEADER_SIZE)
+        if len(header) < ICNS_HEADER_SIZE or header[:4] != b'icns':
+            raise ValueError("Magic ICNS non trovato")
+
+        total = struct.unpack('>I', header[4:])[0]
+        if total != file_size:
+            raise ValueError(f"Lunghezza ICNS dichiarata {total}, file di {file_size} byte")
+
+        entries = []
+        offset = ICNS_HEADER_SIZE
+        while offset < total:
+            f.seek(offset)
+            element = f.read(ICNS_HEADER_SIZE)
+            if len(element) < ICNS_HEADER_SIZE:
+                raise ValueError(f"Elemento troncato all'offset {offset}")
+
+            ostype = element[:4]
+            length = struct.unpack('>I', element[4:])[0]
+            if length < ICNS_HEADER_SIZE or offset + length > total:
+                raise ValueError(f"Elemento {ostype!r}: lunghezza {length} non valida all'offset {offset}")
+
+            entry = {'type': ostype.decode('latin-1'), 'size': None, 'offset': offset, 'length': length}
+            expected = ICNS_PIXEL_SIZES.get(ostype)
+            if expected is not None:
+                dims = png_dimensions(f.read(24))
+                if dims is not None and dims != (expected, expected):
+                    raise ValueError(f"Elemento {entry['type']}: IHDR dichiara {dims[0]}x{dims[1]}, atteso {expected}x{expected}")
+                entry['size'] = expected
+
+            entries.append(entry)
+            offset += length
+
+    if not entries:
+        raise ValueError("ICNS senza elementi")
+    return entries
+
+
+def validate(path):
+    """
+    Valida un contenitore in base all'estensione (.ico o .icns)
+
+    Args:
+        path: Percorso del file
+
+    Returns:
+        Lista delle entry (vedi validate_ico / validate_icns)
+    """
+    if str(path).lower().endswith('.icns'):
+        return validate_icns(path)
+    return validate_ico(path)
+
+
+if __name__ == "__main__":
+    import sys
+
+    failed = False
+    for path in sys.argv[1:]:
+        try:
+            entries = validate(path)
+            print(f"[+] {path}: {len(entries)} immagini OK")
+        except (OSError, ValueError) as e:
+            print(f"[-] {path}: {e}")
+            failed = True
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pipeline unica per la generazione delle icone dell'applicazione
+
+Legge il manifest degli asset (icon_manifest.json) e costruisce il grafo
+decode -> render(size, padding) [-> template] -> encode -> file/contenitore: i nodi comuni a
+più output (stessa sorgente, stessa icona) vengono calcolati una volta sola.
+Vengono eseguiti solo i nodi necessari agli output non aggiornati (vedi
+icon_build_cache.py).
+
+Ogni PNG viene ricompresso senza perdita (vedi icon_recompress.py): i file PNG
+possono diventare a palette o in scala di grigi, i frame ICO/ICNS restano RGBA.
+Gli asset esistenti elencati in "recompress" (es. immagini del renderer) vengono
+ricompressi sul posto. "max_bytes" fissa un budget in byte per file: la
+pipeline termina con errore se un file lo supera.
+
+Uso:
+    python icon_pipeline.py [--manifest FILE] [--force] [--jobs N] [--dry-run]
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from icon_build_cache import BuildCache, file_sha256
+from icon_containers import icns_entries_for_sizes, validate_icns, validate_ico, write_icns, write_ico
+from icon_recompress import PNG_ENCODER, recompress_file
+from icon_render import IconRenderer, StageStats, padding_pixels
+from icon_template import make_template_icons
+
+DEFAULT_MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icon_manifest.json")
+
+OUTPUT_TYPES = ('png', 'ico', 'icns')
+
+# color: icona a colori; template: monocromatica per la barra dei menu macOS
+OUTPUT_STYLES = ('color', 'template')
+
+# Ordine di esecuzione delle fasi del grafo
+STAGES = ('decode', 'render', 'template', 'encode', 'write')
+
+
+def load_manifest(path):
+    """
+    Carica e normalizza il manifest degli asset
+
+    I percorsi sono relativi a "root", a sua volta relativo al manifest.
+    I campi mancanti di ogni output vengono presi da "defaults".
+
+    Args:
+        path: Percorso del manifest JSON
+
+    Returns:
+        Dizionario {'sources': {nome: percorso}, 'outputs': [output, ...], 'recompress': [asset, ...]}
+
+    Raises:
+        ValueError: Se il manifest non è valido
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    root = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(path)), data.get('root', '.')))
+    sources = {name: os.path.join(root, rel) for name, rel in data.get('sources', {}).items()}
+    defaults = data.get('defaults', {})
+
+    outputs = []
+    seen = set()
+    for index, spec in enumerate(data.get('outputs', [])):
+        name = spec.get('path')
+        kind = spec.get('type')
+        source = spec.get('source', defaults.get('source'))
+        padding = spec.get('padding', defaults.get('padding', 0))
+        style = spec.get('style', 'color')
+
+        if not name:
+            raise ValueError(f"Output #{index}: percorso mancante")
+        if kind not in OUTPUT_TYPES:
+            raise ValueError(f"{name}: tipo '{kind}' non supportato (usa {', '.join(OUTPUT_TYPES)})")
+        if source not in sources:
+            raise ValueError(f"{name}: sorgente '{source}' non definita")
+        if style not in OUTPUT_STYLES:
+            raise ValueError(f"{name}: stile '{style}' non supportato (usa {', '.join(OUTPUT_STYLES)})")
+
+        if kind == 'png':
+            frames = [(spec['size'], padding)]
+        else:
+            frames = [(frame['size'], frame.get('padding', padding)) for frame in spec.get('frames', [])]
+        if not frames:
+            raise ValueError(f"{name}: nessuna dimensione indicata")
+
+        path_abs = os.path.normpath(os.path.join(root, name))
+        if path_abs in seen:
+            raise ValueError(f"{name}: output duplicato")
+        seen.add(path_abs)
+
+        outputs.append({
+            'name': name,
+            'path': path_abs,
+            'type': kind,
+            'source': source,
+            'style': style,
+            'frames': frames,
+            'max_bytes': spec.get('max_bytes'),
+        })
+
+    recompress = []
+    for spec in data.get('recompress', []):
+        name = spec.get('path')
+        if not name or not name.lower().endswith('.png'):
+            raise ValueError(f"recompress: '{name}' non è un file PNG")
+        path_abs = os.path.normpath(os.path.join(root, name))
+        if path_abs in seen:
+            raise ValueError(f"{name}: già generato dalla pipeline")
+        seen.add(path_abs)
+        recompress.append({'name': name, 'path': path_abs, 'max_bytes': spec.get('max_bytes')})
+
+    return {'sources': sources, 'outputs': outputs, 'recompress': recompress}
+
+
+def output_params(output):
+    """Parametri di generazione di un output (registrati nella cache)"""
+    return {
+        'type': output['type'],
+        'style': output['style'],
+        'frames': [list(frame) for frame in output['frames']],
+        'encoder': PNG_ENCODER,
+    }
+
+
+RECOMPRESS_PARAMS = {'type': 'recompress', 'encoder': PNG_ENCODER}
+
+
+def build_plan(manifest, cache):
+    """
+    Costruisce il grafo delle operazioni per gli output non aggiornati
+
+    Ogni nodo è identificato da una chiave: nodi con la stessa chiave (stessa
+    sorgente decodificata, stessa icona renderizzata, stessa codifica PNG)
+    vengono creati una volta sola e condivisi tra gli output.
+
+    Args:
+        manifest: Manifest restituito da load_manifest
+        cache: BuildCache per escludere gli output aggiornati
+
+    Returns:
+        Dizionario {'nodes': {chiave: nodo}, 'outputs': [da generare], 'fresh': [aggiornati],
+                    'recompress': [asset da ricomprimere]}
+    """
+    nodes = {}
+    source_hashes = {}
+    stale = []
+    fresh = []
+
+    def add(key, deps=(), spec=None):
+        node = nodes.get(key)
+        if node is None:
+            node = nodes[key] = {'stage': key[0], 'deps': list(deps), 'spec': spec, 'users': 0}
+        node['users'] += 1
+        return key
+
+    for output in manifest['outputs']:
+        source = output['source']
+        if source not in source_hashes:
+            source_hashes[source] = file_sha256(manifest['sources'][source])
+        output['source_hash'] = source_hashes[source]
+
+        if cache.is_fresh(output['path'], output_params(output), output['source_hash']):
+            fresh.append(output)
+            continue
+
+        decode = add(('decode', source))
+        encodes = {}
+        # Solo i file PNG possono cambiare tipo di colore: i frame dei contenitori restano RGBA
+        reduce_color = output['type'] == 'png'
+        for size, padding in output['frames']:
+            image = add(('render', source, size, padding_pixels(size, padding)), [decode], (size, padding))
+            if output['style'] == 'template':
+                image = add(('template', image), [image])
+            encodes[size] = add(('encode', image, reduce_color), [image])
+
+        output['encodes'] = encodes
+        add(('write', output['path']), list(encodes.values()))
+        stale.append(output)
+
+    recompress = []
+    for asset in manifest['recompress']:
+        if cache.is_fresh(asset['path'], RECOMPRESS_PARAMS, file_sha256(asset['path'])):
+            fresh.append(asset)
+        else:
+            recompress.append(asset)
+
+    return {'nodes': nodes, 'outputs': stale, 'fresh': fresh, 'recompress': recompress}
+
+
+def print_plan(plan):
+    """Stampa il numero di nodi per fase e quanti sono condivisi tra più output"""
+    counts = {stage: 0 for stage in STAGES}
+    shared = 0
+    for node in plan['nodes'].values():
+        counts[node['stage']] += 1
+        shared += node['users'] - 1
+
+    print(f"[*] Piano: {len(plan['outputs'])} output da generare, {len(plan['recompress'])} asset da ricomprimere, "
+          f"{len(plan['fresh'])} aggiornati")
+    print("    " + ", ".join(f"{counts[stage]} {stage}" for stage in STAGES) + f" ({shared} riusi di nodi condivisi)")
+
+
+def source_of(key):
+    """Sorgente da cui deriva un nodo render o template"""
+    return source_of(key[1]) if key[0] == 'template' else key[1]
+
+
+def execute_plan(manifest, plan, cache, jobs=1, stats=None, verbose=True):
+    """
+    Esegue il grafo fase per fase: decode, render, encode (in parallelo), scrittura
+
+    Args:
+        manifest: Manifest restituito da load_manifest
+        plan: Piano restituito da build_plan
+        cache: BuildCache in cui registrare gli output generati
+        jobs: Numero di processi per la codifica PNG
+        stats: StageStats condiviso (opzionale)
+        verbose: Se False non stampa gli output generati
+    """
+    stats = stats or StageStats()
+    by_stage = {stage: [] for stage in STAGES}
+    for key, node in plan['nodes'].items():
+        by_stage[node['stage']].append(key)
+
+    # 1. Decode: una volta per sorgente
+    renderers = {}
+    for _, source in by_stage['decode']:
+        renderers[source] = IconRenderer.open(manifest['sources'][source], stats, jobs)
+
+    # 2. Render: una volta per (sorgente, dimensione, padding in pixel)
+    images = {}
+    for key in by_stage['render']:
+        size, padding = plan['nodes'][key]['spec']
+        images[key] = renderers[key[1]].render(size, padding_percent=padding)
+
+    # 3. Template monocromatici: tutte le dimensioni in un'unica operazione vettoriale
+    if by_stage['template']:
+        with stats.stage('template'):
+            templates = make_template_icons([images[key[1]] for key in by_stage['template']])
+            images.update(zip(by_stage['template'], templates))
+
+    # 4. Encode: tutte le codifiche di una sorgente in un unico batch parallelo
+    for _, image_key, reduce_color in by_stage['encode']:
+        renderers[source_of(image_key)].queue_encode(images[image_key], reduce_color)
+    for renderer in renderers.values():
+        renderer.flush()
+
+    # 5. Scrittura di file PNG e contenitori dai buffer codificati
+    savings = {'baseline': 0, 'bytes': 0}
+    for output in plan['outputs']:
+        renderer = renderers[output['source']]
+        frames = {}
+        for size, (_, image_key, reduce_color) in output['encodes'].items():
+            frames[size] = renderer.encode_png(images[image_key], reduce_color)
+            savings['baseline'] += renderer.baseline_size(images[image_key], reduce_color)
+            savings['bytes'] += len(frames[size])
+
+        os.makedirs(os.path.dirname(output['path']), exist_ok=True)
+        with stats.stage('write'):
+            if output['type'] == 'png':
+                with open(output['path'], 'wb') as f:
+                    f.write(next(iter(frames.values())))
+            elif output['type'] == 'ico':
+                write_ico(output['path'], list(frames.items()))
+                validate_ico(output['path'])
+            else:
+                entries = icns_entries_for_sizes(frames)
+                write_icns(output['path'], [(ostype, frames[size]) for ostype, size in entries])
+                validate_icns(output['path'])
+            stats.add_output(os.path.getsize(output['path']))
+
+        cache.record(output['path'], output_params(output), output['source_hash'])
+        if verbose:
+            sizes = ", ".join(str(size) for size in frames)
+            print(f"  [+] {output['name']} ({output['type']}: {sizes})")
+
+    return savings
+
+
+def recompress_assets(assets, cache, jobs=1, stats=None, verbose=True):
+    """
+    Ricomprime sul posto gli asset PNG esistenti (in parallelo se jobs > 1)
+
+    Args:
+        assets: Asset da ricomprimere (plan['recompress'])
+        cache: BuildCache in cui registrare gli asset ricompressi
+        jobs: Numero di processi
+        stats: StageStats condiviso (opzionale)
+        verbose: Se False non stampa gli asset ricompressi
+
+    Returns:
+        Dizionario {'baseline': byte prima, 'bytes': byte dopo}
+    """
+    stats = stats or StageStats()
+    savings = {'baseline': 0, 'bytes': 0}
+    if not assets:
+        return savings
+
+    paths = [asset['path'] for asset in assets]
+    with stats.stage('recompress'):
+        if jobs > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as pool:
+                results = list(pool.map(recompress_file, paths))
+        else:
+            results = [recompress_file(path) for path in paths]
+        for result in results:
+            stats.add_output(result['after'])
+
+    for asset, result in zip(assets, results):
+        savings['baseline'] += result['before']
+        savings['bytes'] += result['after']
+        cache.record(asset['path'], RECOMPRESS_PARAMS, file_sha256(asset['path']))
+        if verbose:
+            note = result['skipped'] or f"{result['color']}, filtro {result['filter']}"
+            print(f"  [+] {asset['name']}: {result['before'] / 1024:.1f} KB -> {result['after'] / 1024:.1f} KB ({note})")
+    return savings
+
+
+def check_budgets(manifest):
+    """
+    Confronta la dimensione dei file con il budget "max_bytes" del manifest
+
+    Returns:
+        Lista di tuple (nome, byte, budget) dei file fuori budget
+    """
+    over = []
+    for entry in manifest['outputs'] + manifest['recompress']:
+        if entry['max_bytes'] is not None and os.path.exists(entry['path']):
+            size = os.path.getsize(entry['path'])
+            if size > entry['max_bytes']:
+                over.append((entry['name'], size, entry['max_bytes']))
+    return over
+
+
+def print_savings(savings):
+    """Stampa il risparmio della ricompressione rispetto a Pillow optimize=True / ai file originali"""
+    if savings['baseline']:
+        saved = savings['baseline'] - savings['bytes']
+        print(f"[*] Ricompressione PNG: {savings['baseline'] / 1024:.1f} KB -> {savings['bytes'] / 1024:.1f} KB "
+              f"(-{saved / 1024:.1f} KB, -{saved * 100 / savings['baseline']:.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera le icone dell'applicazione dal manifest degli asset")
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST, help="Manifest degli asset (default: icon_manifest.json)")
+    parser.add_argument('--force', action='store_true', help="Rigenera tutte le icone ignorando la cache")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help="Processi per la codifica PNG (default: numero di CPU, 1 = in serie)")
+    parser.add_argument('--dry-run', action='store_true', help="Mostra il piano senza generare nulla")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  Pipeline Icone Applicazione - Controllo Stato NSIS")
+    print("=" * 60)
+    print()
+
+    try:
+        manifest = load_manifest(args.manifest)
+        cache = BuildCache(force=args.force)
+        plan = build_plan(manifest, cache)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[-] ERRORE nel manifest: {e}")
+        return 1
+
+    print_plan(plan)
+    for output in plan['fresh']:
+        print(f"  [=] {output['name']}")
+
+    if args.dry_run:
+        for entry in plan['outputs'] + plan['recompress']:
+            print(f"  [ ] {entry['name']}")
+        return 0
+
+    stats = StageStats()
+    savings = {'baseline': 0, 'bytes': 0}
+    if plan['outputs'] or plan['recompress']:
+        print(f"\n[*] Generazione ({max(1, args.jobs)} processi per la codifica PNG)...")
+        try:
+            for key, value in execute_plan(manifest, plan, cache, args.jobs, stats).items():
+                savings[key] += value
+            for key, value in recompress_assets(plan['recompress'], cache, args.jobs, stats).items():
+                savings[key] += value
+        except Exception as e:
+            print(f"[-] ERRORE nella generazione: {e}")
+            cache.save()
+            return 1
+
+    cache.save()
+    print()
+    cache.print_summary()
+    stats.print_summary()
+    print_savings(savings)
+
+    over = check_budgets(manifest)
+    for name, size, budget in over:
+        print(f"[!] Budget superato: {name} {size / 1024:.1f} KB (massimo {budget / 1024:.1f} KB)")
+    if over:
+        print(f"\n[-] {len(over)} file oltre il budget")
+        return 1
+
+    print("\n[+] Generazione completata con successo!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ricompressione PNG senza perdita
+
+Riscrive un'immagine come PNG minimo provando più rappresentazioni e
+parametri di compressione, e tiene il risultato più piccolo:
+- riduzione del colore senza perdita: niente canale alpha se l'immagine è
+  opaca, scala di grigi se R=G=B, palette (1/2/4/8 bit con tRNS) se ci sono
+  al più 256 colori RGBA distinti;
+- filtri PNG (None, Sub, Up, Average, Paeth e scelta adattiva per riga),
+  calcolati con NumPy su tutta l'immagine;
+- livello e strategia zlib: i filtri vengono confrontati con un livello
+  veloce, i due migliori ricompressi al livello massimo.
+
+Nel file vengono scritti solo i chunk necessari (IHDR, PLTE, tRNS, IDAT) più
+quelli che influiscono sul colore (iCCP, sRGB, gAMA); testo, date, EXIF e
+pHYs vengono rimossi. Il risultato viene decodificato e confrontato pixel per
+pixel con l'originale, e non è mai più grande della codifica Pillow
+(optimize=True).
+
+Uso:
+    python icon_recompress.py FILE.png [FILE.png ...] [--dry-run]
+"""
+
+import argparse
+import io
+import os
+import struct
+import sys
+import zlib
+
+from PIL import Image
+
+try:
+    import numpy as np
+except ImportError:
+    print("Errore: NumPy non installato. Installalo con: pip install numpy")
+    sys.exit(1)
+
+# Versione dell'encoder: registrata nella cache di build, va incrementata
+# quando cambia il risultato della codifica
+PNG_ENCODER = 'recompress-3'
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Tipi di colore PNG
+COLOR_GRAY, COLOR_RGB, COLOR_PALETTE, COLOR_GRAY_ALPHA, COLOR_RGBA = 0, 2, 3, 4, 6
+COLOR_NAMES = {COLOR_GRAY: 'L', COLOR_RGB: 'RGB', COLOR_PALETTE: 'P', COLOR_GRAY_ALPHA: 'LA', COLOR_RGBA: 'RGBA'}
+
+FILTER_NAMES = ('none', 'sub', 'up', 'average', 'paeth', 'adaptive')
+
+# Livello zlib per confrontare i filtri e filtri ricompressi al massimo livello
+FILTER_PROBE_LEVEL = 6
+FILTER_FINALISTS = 2
+ZLIB_STRATEGIES = (zlib.Z_DEFAULT_STRATEGY, zlib.Z_FILTERED)
+
+
+def _chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+
+def _pack_bits(indices, bit_depth):
+    """Impacchetta indici di palette (H, W) a bit_depth bit per pixel"""
+    if bit_depth == 8:
+        return indices
+    per_byte = 8 // bit_depth
+    height, width = indices.shape
+    padded = np.zeros((height, -(-width // per_byte) * per_byte), dtype=np.uint8)
+    padded[:, :width] = indices
+    groups = padded.reshape(height, -1, per_byte)
+    shifts = np.arange(8 - bit_depth, -1, -bit_depth, dtype=np.uint8)
+    return np.bitwise_or.reduce(groups << shifts, axis=2).astype(np.uint8)
+
+
+def representations(rgba, reduce_color=True):
+    """
+    Rappresentazioni PNG senza perdita di un'immagine RGBA
+
+    Args:
+        rgba: Array (H, W, 4) uint8
+        reduce_color: Se False restituisce solo RGBA a 8 bit (es. frame ICO/ICNS)
+
+    Returns:
+        Lista di dizionari {color, bit_depth, rows (H, stride) uint8, bpp, palette, trns}
+    """
+    height, width, _ = rgba.shape
+    reps = [{'color': COLOR_RGBA, 'bit_depth': 8, 'rows': rgba.reshape(height, width * 4), 'bpp': 4}]
+    if not reduce_color:
+        return reps
+
+    opaque = bool((rgba[..., 3] == 255).all())
+    gray = bool(((rgba[..., 0] == rgba[..., 1]) & (rgba[..., 1] == rgba[..., 2])).all())
+    channels = ([0] if gray else [0, 1, 2]) + ([] if opaque else [3])
+    if len(channels) < 4:
+        color = {(True, True): COLOR_GRAY, (True, False): COLOR_GRAY_ALPHA, (False, True): COLOR_RGB}[(gray, opaque)]
+        reduced = np.ascontiguousarray(rgba[..., channels])
+        reps = [{'color': color, 'bit_depth': 8, 'rows': reduced.reshape(height, -1), 'bpp': len(channels)}]
+
+    packed = rgba.reshape(-1, 4).view(np.uint32).ravel()
+    colors, inverse, counts = np.unique(packed, return_inverse=True, return_counts=True)
+    if len(colors) <= 256:
+        entries = colors.view(np.uint8).reshape(-1, 4)
+        # Colori trasparenti per primi (tRNS più corto), poi i più frequenti
+        order = np.lexsort((-counts, entries[:, 3] == 255))
+        remap = np.empty(len(order), dtype=np.uint8)
+        remap[order] = np.arange(len(order), dtype=np.uint8)
+        entries = entries[order]
+
+        bit_depth = next(depth for depth in (1, 2, 4, 8) if len(colors) <= 1 << depth)
+        indices = remap[inverse.reshape(height, width)]
+        translucent = int((entries[:, 3] < 255).sum())
+        reps.append({
+            'color': COLOR_PALETTE,
+            'bit_depth': bit_depth,
+            'rows': _pack_bits(indices, bit_depth),
+            'bpp': 1,
+            'palette': entries[:, :3].tobytes(),
+            'trns': entries[:translucent, 3].tobytes(),
+        })
+    return reps
+
+
+def filter_rows(rows, bpp):
+    """
+    Applica i filtri PNG a tutte le righe
+
+    Args:
+        rows: Array (H, stride) uint8 di byte grezzi
+        bpp: Byte per pixel (almeno 1)
+
+    Returns:
+        Dizionario {nome filtro: byte dello stream filtrato (con byte di tipo per riga)}
+    """
+    raw = rows.astype(np.int16)
+    left = np.zeros_like(raw)
+    left[:, bpp:] = raw[:, :-bpp]
+    up = np.zeros_like(raw)
+    up[1:] = raw[:-1]
+    upper_left = np.zeros_like(raw)
+    upper_left[1:, bpp:] = raw[:-1, :-bpp]
+
+    estimate = left + up - upper_left
+    dist_left = np.abs(estimate - left)
+    dist_up = np.abs(estimate - up)
+    dist_upper_left = np.abs(estimate - upper_left)
+    paeth = np.where((dist_left <= dist_up) & (dist_left <= dist_upper_left), left,
+                     np.where(dist_up <= dist_upper_left, up, upper_left))
+
+    filtered = np.stack([
+        raw,
+        raw - left,
+        raw - up,
+        raw - ((left + up) >> 1),
+        raw - paeth,
+    ]).astype(np.uint8)
+
+    # Adattivo: per ogni riga il filtro con la minima somma dei valori assoluti (con segno)
+    cost = np.minimum(filtered, 256 - filtered.astype(np.int16)).sum(axis=2)
+    best = cost.argmin(axis=0)
+    adaptive = filtered[best, np.arange(len(best))]
+
+    streams = {}
+    for index, name in enumerate(FILTER_NAMES):
+        data = adaptive if name == 'adaptive' else filtered[index]
+        types = best if name == 'adaptive' else np.full(len(data), index)
+        streams[name] = np.concatenate([types.astype(np.uint8)[:, None], data], axis=1).tobytes()
+    return streams
+
+
+def deflate(data, level, strategy=zlib.Z_DEFAULT_STRATEGY):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 15, 9, strategy)
+    return compressor.compress(data) + compressor.flush()
+
+
+def color_chunks(info):
+    """Chunk che influiscono sul colore (iCCP, sRGB, gAMA) da Image.info"""
+    chunks = []
+    if info.get('icc_profile'):
+        chunks.append(_chunk(b'iCCP', b'ICC Profile\x00\x00' + zlib.compress(info['icc_profile'], 9)))
+    elif 'srgb' in info:
+        chunks.append(_chunk(b'sRGB', bytes([info['srgb']])))
+    if 'gamma' in info and not info.get('icc_profile'):
+        chunks.append(_chunk(b'gAMA', struct.pack('>I', round(info['gamma'] * 100000))))
+    return chunks
+
+
+def write_png(width, height, rep, idat, extra_chunks=()):
+    """
+    Compone un file PNG
+
+    Args:
+        width, height: Dimensioni in pixel
+        rep: Rappresentazione (vedi representations)
+        idat: Stream filtrato e compresso
+        extra_chunks: Chunk già codificati da inserire prima di PLTE
+
+    Returns:
+        Byte del file PNG
+    """
+    header = struct.pack('>IIBBBBB', width, height, rep['bit_depth'], rep['color'], 0, 0, 0)
+    parts = [PNG_SIGNATURE, _chunk(b'IHDR', header), *extra_chunks]
+    if rep['color'] == COLOR_PALETTE:
+        parts.append(_chunk(b'PLTE', rep['palette']))
+        if rep['trns']:
+            parts.append(_chunk(b'tRNS', rep['trns']))
+    parts += [_chunk(b'IDAT', idat), _chunk(b'IEND', b'')]
+    return b''.join(parts)
+
+
+def pillow_png_bytes(img):
+    """Codifica Pillow di riferimento (optimize=True)"""
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def recompress_image(img, reduce_color=True, extra_chunks=()):
+    """
+    Codifica un'immagine nel PNG più piccolo trovato
+
+    Args:
+        img: Immagine PIL
+        reduce_color: Se False mantiene RGBA a 8 bit (frame ICO/ICNS)
+        extra_chunks: Chunk di colore da conservare (vedi color_chunks)
+
+    Returns:
+        Tupla (byte PNG, dettagli {baseline, bytes, color, filter, level})
+    """
+    baseline = pillow_png_bytes(img)
+    # La codifica Pillow non conserva i chunk di colore: in quel caso è solo un riferimento
+    best = (None if extra_chunks else baseline, {'color': 'pillow', 'filter': None, 'level': None})
+
+    rgba = np.asarray(img.convert('RGBA'))
+    for rep in representations(rgba, reduce_color):
+        streams = filter_rows(rep['rows'], rep['bpp'])
+        probes = sorted(streams, key=lambda name: len(deflate(streams[name], FILTER_PROBE_LEVEL)))
+        for name in probes[:FILTER_FINALISTS]:
+            for strategy in ZLIB_STRATEGIES:
+                data = write_png(img.width, img.height, rep, deflate(streams[name], 9, strategy), extra_chunks)
+                if best[0] is None or len(data) < len(best[0]):
+                    color = f"{COLOR_NAMES[rep['color']]}{rep['bit_depth']}"
+                    best = (data, {'color': color, 'filter': name, 'level': 9})
+
+    data, details = best
+    if data is not baseline:
+        with Image.open(io.BytesIO(data)) as decoded:
+            if decoded.convert('RGBA').tobytes() != rgba.tobytes():
+                raise ValueError("Ricompressione non senza perdita: pixel diversi dall'originale")
+
+    details.update(baseline=len(baseline), bytes=len(data))
+    return data, details
+
+
+def png_bit_depth(data):
+    """Profondità di bit dichiarata nell'IHDR (None se non è un PNG)"""
+    if len(data) < 33 or data[:8] != PNG_SIGNATURE or data[12:16] != b'IHDR':
+        return None
+    return data[24]
+
+
+def recompress_file(path, dry_run=False):
+    """
+    Ricomprime un PNG esistente sul posto (solo se diventa più piccolo)
+
+    I PNG a 16 bit e animati (APNG) vengono lasciati invariati.
+
+    Args:
+        path: Percorso del file PNG
+        dry_run: Se True calcola il risultato senza riscrivere il file
+
+    Returns:
+        Dizionario {before, after, skipped, color, filter}
+    """
+    with open(path, 'rb') as f:
+        original = f.read()
+
+    result = {'before': len(original), 'after': len(original), 'skipped': None, 'color': None, 'filter': None}
+    bit_depth = png_bit_depth(original)
+    if bit_depth is None:
+        result['skipped'] = "non è un PNG"
+        return result
+    if bit_depth > 8:
+        result['skipped'] = "PNG a 16 bit"
+        return result
+    if b'acTL' in original[:original.find(b'IDAT')]:
+        result['skipped'] = "PNG animato"
+        return result
+
+    with Image.open(io.BytesIO(original)) as img:
+        img.load()
+        data, details = recompress_image(img, extra_chunks=color_chunks(img.info))
+
+    result.update(color=details['color'], filter=details['filter'])
+    if len(data) >= len(original):
+        return result
+
+    result['after'] = len(data)
+    if not dry_run:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    return result
+
+
+def main():
+    # Fix encoding per Windows console
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+    parser = argparse.ArgumentParser(description="Ricompressione PNG senza perdita")
+    parser.add_argument('files', nargs='+', help="File PNG da ricomprimere sul posto")
+    parser.add_argument('--dry-run', action='store_true', help="Mostra il risparmio senza riscrivere i file")
+    args = parser.parse_args()
+
+    before = after = 0
+    for path in args.files:
+        try:
+            result = recompress_file(path, args.dry_run)
+        except (OSError, ValueError) as e:
+            print(f"[-] {path}: {e}")
+            return 1
+        before += result['before']
+        after += result['after']
+        if result['skipped']:
+            print(f"[=] {path}: invariato ({result['skipped']})")
+        elif result['after'] == result['before']:
+            print(f"[=] {path}: invariato (già ottimale)")
+        else:
+            print(f"[+] {path}: {result['before'] / 1024:.1f} KB -> {result['after'] / 1024:.1f} KB "
+                  f"({result['color']}, filtro {result['filter']})")
+
+    if before:
+        print(f"\n[*] Totale: {before / 1024:.1f} KB -> {after / 1024:.1f} KB (-{(before - after) * 100 / before:.1f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
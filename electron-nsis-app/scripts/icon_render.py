@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motore di rendering condiviso per i generatori di icone
+
+Decodifica l'immagine sorgente una sola volta e costruisce una piramide di
+riduzioni successive (fattore 2, media a blocchi): ogni icona viene poi
+ricampionata con LANCZOS dal livello più piccolo che sia almeno il doppio
+della dimensione finale, invece che dall'immagine a piena risoluzione.
+
+I render (size, padding) e le codifiche PNG sono memorizzati: icone identiche
+richieste da più tabelle vengono prodotte una volta sola e scritte su più file.
+La codifica PNG (ricompressione senza perdita, vedi icon_recompress.py: la fase
+più costosa) viene accodata ed eseguita in parallelo su più processi da flush().
+"""
+
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from PIL import Image
+
+from icon_recompress import recompress_image
+
+try:
+    import resource
+except ImportError:  # Windows: picco RSS non disponibile
+    resource = None
+
+# Il livello scelto deve essere almeno PYRAMID_GAP volte la dimensione finale,
+# così LANCZOS lavora sempre su un fattore di riduzione contenuto
+PYRAMID_GAP = 2
+
+
+def image_bytes(img):
+    """
+    Memoria occupata dai pixel di un'immagine
+
+    Args:
+        img: Immagine PIL
+
+    Returns:
+        Numero di byte (larghezza x altezza x canali)
+    """
+    return img.width * img.height * len(img.getbands())
+
+
+def encode_png_bytes(img, reduce_color=True):
+    """
+    Codifica un'immagine come PNG ricompresso senza perdita
+
+    Usata sia in serie sia nei processi worker: a parità di pixel il risultato
+    è identico byte per byte.
+
+    Args:
+        img: Immagine PIL
+        reduce_color: Se False mantiene RGBA a 8 bit (frame ICO/ICNS)
+
+    Returns:
+        Tupla (byte del file PNG, byte della codifica Pillow optimize=True)
+    """
+    data, details = recompress_image(img, reduce_color)
+    return data, details['baseline']
+
+
+def _encode_png_worker(job):
+    """Entry point dei processi worker: job = (mode, size, pixel grezzi, reduce_color)"""
+    mode, size, pixels, reduce_color = job
+    return encode_png_bytes(Image.frombytes(mode, size, pixels), reduce_color)
+
+
+def cpu_seconds():
+    """Tempo CPU (utente + sistema) del processo e dei figli terminati, es. i worker di codifica"""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def peak_rss_bytes():
+    """
+    Picco di memoria residente del processo (e dei figli terminati)
+
+    Returns:
+        Byte, oppure None se non misurabile su questa piattaforma
+    """
+    if resource is None:
+        return None
+    # ru_maxrss è in KB su Linux, in byte su macOS
+    scale = 1 if os.uname().sysname == 'Darwin' else 1024
+    return max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    ) * scale
+
+
+def padding_pixels(size, padding_percent):
+    """
+    Padding in pixel per lato di un'icona
+
+    Args:
+        size: Dimensione dell'icona
+        padding_percent: Percentuale di padding
+
+    Returns:
+        Pixel di padding (due percentuali diverse possono dare lo stesso render)
+    """
+    return int(size * padding_percent / 100)
+
+
+def fit_size(width, height, box):
+    """
+    Dimensioni con cui Image.thumbnail() farebbe entrare l'immagine nel box
+
+    Replica l'arrotondamento di Pillow così il risultato ha esattamente le
+    stesse dimensioni del vecchio thumbnail() fatto dall'immagine originale.
+
+    Args:
+        width: Larghezza sorgente
+        height: Altezza sorgente
+        box: Lato del box quadrato di destinazione
+
+    Returns:
+        Tupla (larghezza, altezza)
+    """
+    if box >= width and box >= height:
+        return width, height
+
+    x, y = box, box
+    aspect = width / height
+
+    def round_aspect(number, key):
+        return max(min(math.floor(number), math.ceil(number), key=key), 1)
+
+    if x / y >= aspect:
+        x = round_aspect(y * aspect, key=lambda n: abs(aspect - n / y))
+    else:
+        y = round_aspect(x / aspect, key=lambda n: 0 if n == 0 else abs(aspect - x / n))
+    return x, y
+
+
+class StageStats:
+    """Tempo, CPU, memoria e byte prodotti per ogni fase della generazione"""
+
+    def __init__(self):
+        self.stages = {}
+        self._current = None
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Misura una fase (le fasi annidate vengono attribuite alla più esterna)
+
+        Args:
+            name: Nome della fase (decode, pyramid, render, encode, ...)
+        """
+        if self._current is not None:
+            yield
+            return
+
+        entry = self.stages.setdefault(name, {
+            'seconds': 0.0, 'cpu_seconds': 0.0, 'calls': 0,
+            'peak_bytes': 0, 'peak_rss': None, 'output_bytes': 0
+        })
+        self._current = entry
+        start = time.perf_counter()
+        cpu_start = cpu_seconds()
+        try:
+            yield
+        finally:
+            entry['seconds'] += time.perf_counter() - start
+            entry['cpu_seconds'] += cpu_seconds() - cpu_start
+            entry['calls'] += 1
+            entry['peak_rss'] = peak_rss_bytes()
+            self._current = None
+
+    def observe(self, live_bytes):
+        """
+        Registra la memoria immagini attualmente in uso nella fase corrente
+
+        Args:
+            live_bytes: Byte di pixel/buffer vivi in questo momento
+        """
+        if self._current is not None:
+            self._current['peak_bytes'] = max(self._current['peak_bytes'], live_bytes)
+
+    def add_output(self, num_bytes):
+        """
+        Conta i byte prodotti dalla fase corrente (PNG codificati, file scritti)
+
+        Args:
+            num_bytes: Numero di byte
+        """
+        if self._current is not None:
+            self._current['output_bytes'] += num_bytes
+
+    def print_summary(self):
+        """Stampa tempo e picco di memoria per fase"""
+        print("[*] Tempi per fase:")
+        for name, entry in self.stages.items():
+            print(f"  {name:<10} {entry['seconds'] * 1000:8.1f} ms  cpu {entry['cpu_seconds'] * 1000:8.1f} ms  "
+                  f"{entry['calls']:3d} chiamate  picco {entry['peak_bytes'] / (1024 * 1024):6.1f} MB")
+
+
+class IconRenderer:
+    """Render memorizzati di un'unica immagine sorgente"""
+
+    def __init__(self, source, stats=None, jobs=1):
+        """
+        Args:
+            source: Immagine PIL sorgente (già decodificata, vedi IconRenderer.open)
+            stats: StageStats condiviso (opzionale)
+            jobs: Numero di processi per la codifica PNG (1 = in serie)
+        """
+        self.stats = stats or StageStats()
+        self.jobs = max(1, jobs)
+        self.live_bytes = 0
+
+        with self.stats.stage('decode'):
+            if source.mode not in ('RGB', 'RGBA'):
+                source = source.convert('RGBA')
+            source.load()
+            self.source = source
+            self._hold(source)
+
+        self._levels = None
+        self._renders = {}
+        self._pngs = {}
+        self._pending = []
+
+    @classmethod
+    def open(cls, path, stats=None, jobs=1):
+        """
+        Decodifica un file immagine e crea il renderer
+
+        Args:
+            path: Percorso dell'immagine sorgente
+            stats: StageStats condiviso (opzionale)
+            jobs: Numero di processi per la codifica PNG
+
+        Returns:
+            IconRenderer
+        """
+        stats = stats or StageStats()
+        with stats.stage('decode'):
+            img = Image.open(path)
+            img.load()
+            return cls(img, stats, jobs)
+
+    def _hold(self, img_or_bytes):
+        self.live_bytes += img_or_bytes if isinstance(img_or_bytes, int) else image_bytes(img_or_bytes)
+        self.stats.observe(self.live_bytes)
+
+    def _pyramid(self):
+        """Livelli di riduzione 1/1, 1/2, 1/4, ... costruiti alla prima richiesta"""
+        if self._levels is None:
+            with self.stats.stage('pyramid'):
+                levels = [self.source]
+                while min(levels[-1].size) >= 2 * PYRAMID_GAP:
+                    level = levels[-1].reduce(2)
+                    levels.append(level)
+                    self._hold(level)
+                self._levels = levels
+        return self._levels
+
+    def _scaled(self, levels, width, height):
+        """Ricampiona la sorgente a (width, height) partendo dal livello adatto della piramide"""
+        if (width, height) == self.source.size:
+            return self.source
+
+        base = self.source
+        for level in levels:
+            if level.width >= width * PYRAMID_GAP and level.height >= height * PYRAMID_GAP:
+                base = level
+            else:
+                break
+        return base.resize((width, height), Image.Resampling.LANCZOS)
+
+    def render(self, size, padding_percent=10):
+        """
+        Icona quadrata con il logo centrato e padding (canvas trasparente)
+
+        Args:
+            size: Dimensione finale dell'icona (width & height)
+            padding_percent: Percentuale di padding
+
+        Returns:
+            Immagine PIL RGBA (condivisa: non modificarla)
+        """
+        padding = padding_pixels(size, padding_percent)
+        key = (size, padding)
+        if key in self._renders:
+            return self._renders[key]
+
+        logo_size = size - (padding * 2)
+        width, height = fit_size(self.source.width, self.source.height, logo_size)
+
+        levels = self._pyramid()
+        with self.stats.stage('render'):
+            logo = self._scaled(levels, width, height)
+            self.stats.observe(self.live_bytes + image_bytes(logo))
+
+            # Centra logo nel canvas
+            icon = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+            x = (size - logo.width) // 2
+            y = (size - logo.height) // 2
+            icon.paste(logo, (x, y), logo if logo.mode == 'RGBA' else None)
+            self._hold(icon)
+
+        self._renders[key] = icon
+        return icon
+
+    def queue_encode(self, img, reduce_color=True):
+        """
+        Accoda la codifica PNG di un'immagine (eseguita da flush())
+
+        Args:
+            img: Immagine da codificare (render() o esterna, es. icona template)
+            reduce_color: Se False mantiene RGBA a 8 bit (frame ICO/ICNS)
+        """
+        key = (id(img), reduce_color)
+        if key not in self._pngs and all(
+                pending is not img or reduce != reduce_color for pending, reduce in self._pending):
+            self._pending.append((img, reduce_color))
+
+    def flush(self):
+        """
+        Codifica in parallelo le immagini accodate
+
+        L'ordine di accodamento non conta: ogni codifica è associata alla
+        propria immagine, qualunque sia il numero di processi.
+        """
+        self._encode_pending()
+
+    def encode_png(self, img, reduce_color=True):
+        """
+        Codifica PNG memorizzata per immagine
+
+        Args:
+            img: Immagine da codificare (render() o esterna, es. icona template)
+            reduce_color: Se False mantiene RGBA a 8 bit (frame ICO/ICNS)
+
+        Returns:
+            Byte del file PNG
+        """
+        key = (id(img), reduce_color)
+        if key not in self._pngs:
+            self.queue_encode(img, reduce_color)
+            self._encode_pending()
+        return self._pngs[key][1]
+
+    def baseline_size(self, img, reduce_color=True):
+        """Byte della codifica Pillow (optimize=True) di un'immagine già codificata"""
+        return self._pngs[(id(img), reduce_color)][2]
+
+    def _encode_pending(self):
+        """Codifica le immagini accodate (in parallelo se jobs > 1)"""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        with self.stats.stage('encode'):
+            if self.jobs > 1 and len(pending) > 1:
+                # Immagini più grandi per prime: i processi finiscono più o meno insieme
+                pending.sort(key=lambda job: image_bytes(job[0]), reverse=True)
+                jobs = [(img.mode, img.size, img.tobytes(), reduce_color) for img, reduce_color in pending]
+                with ProcessPoolExecutor(max_workers=min(self.jobs, len(pending))) as pool:
+                    encoded = list(pool.map(_encode_png_worker, jobs))
+            else:
+                encoded = [encode_png_bytes(img, reduce_color) for img, reduce_color in pending]
+
+            # Il memo tiene un riferimento all'immagine: finché la voce esiste
+            # id() non può essere riusato da un'altra immagine (es. icone template)
+            for (img, reduce_color), (data, baseline) in zip(pending, encoded):
+                self._pngs[(id(img), reduce_color)] = (img, data, baseline)
+                self._hold(len(data))
+                self.stats.add_output(len(data))
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Icone "template" monocromatiche per la barra dei menu di macOS
+
+macOS usa solo il canale alpha delle immagini template (il colore viene
+scelto dal sistema in base al tema). Da un'icona RGBA a colori si ottiene
+un'icona nera in cui l'alpha è la copertura dell'"inchiostro":
+- le zone molto chiare (luminanza sopra la soglia di knockout) diventano
+  trasparenti, così i dettagli chiari restano leggibili come fori;
+- la copertura quasi nulla viene azzerata e quella quasi piena portata a
+  opaca, mentre i valori intermedi (bordi anti-aliased) sono mantenuti.
+
+Tutte le dimensioni vengono elaborate in un'unica operazione vettoriale NumPy
+su un array (N, H, W, 4).
+"""
+
+import sys
+
+from PIL import Image
+
+try:
+    import numpy as np
+except ImportError:
+    print("Errore: NumPy non installato. Installalo con: pip install numpy")
+    sys.exit(1)
+
+# Pesi di luminanza Rec. 709
+LUMA_WEIGHTS = (0.2126, 0.7152, 0.0722)
+
+# Rampa di knockout: sotto il primo valore inchiostro pieno, sopra il secondo trasparente
+KNOCKOUT_LUMINANCE = (0.80, 0.95)
+
+# Copertura sotto il primo valore -> 0 (alone), sopra il secondo -> opaca
+ALPHA_THRESHOLD = (0.08, 0.92)
+
+
+def make_template_icons(images, knockout=KNOCKOUT_LUMINANCE, alpha_threshold=ALPHA_THRESHOLD):
+    """
+    Converte un gruppo di icone RGBA in icone template monocromatiche
+
+    Args:
+        images: Lista di immagini PIL (dimensioni anche diverse)
+        knockout: Tupla (luminanza inchiostro pieno, luminanza trasparente), 0-1
+        alpha_threshold: Tupla (copertura azzerata sotto, copertura opaca sopra), 0-1
+
+    Returns:
+        Lista di immagini RGBA nere con alpha = copertura, nello stesso ordine
+    """
+    if not images:
+        return []
+
+    # Le icone più piccole vengono allineate in alto a sinistra e riempite di
+    # trasparenza: il padding non contribuisce e viene scartato al ritaglio
+    height = max(img.height for img in images)
+    width = max(img.width for img in images)
+    batch = np.zeros((len(images), height, width, 4), dtype=np.float32)
+    for index, img in enumerate(images):
+        batch[index, :img.height, :img.width] = np.asarray(img.convert('RGBA'), dtype=np.float32)
+    batch /= 255.0
+
+    luminance = batch[..., :3] @ np.asarray(LUMA_WEIGHTS, dtype=np.float32)
+    ink_full, ink_none = knockout
+    ink = np.clip((ink_none - luminance) / (ink_none - ink_full), 0.0, 1.0)
+
+    coverage = batch[..., 3] * ink
+    low, high = alpha_threshold
+    coverage[coverage < low] = 0.0
+    coverage[coverage > high] = 1.0
+
+    result = np.zeros(batch.shape, dtype=np.uint8)
+    result[..., 3] = np.rint(coverage * 255.0).astype(np.uint8)
+
+    return [
+        Image.fromarray(result[index, :img.height, :img.width], 'RGBA')
+        for index, img in enumerate(images)
+    ]
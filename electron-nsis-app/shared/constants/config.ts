@@ -6,7 +6,7 @@
 export const URL_NSIS = 'https://www.impresa.gov.it/intro/info/news.html';
 export const MAX_RETRIES = 2;
 export const FETCH_TIMEOUT_MS = 5000;
-export const FETCH_CHECK_INTERVAL_MS = 50;
+export const RESULTS_ROW_SELECTOR = "#risultatiConsultazionePratica tbody tr";
 export const STATO_SELECTOR = "#risultatiConsultazionePratica tbody tr td:nth-child(3)";
 
 export const ALL_CELLS_JS = `(function() {
@@ -19,10 +19,58 @@ export const ALL_CELLS_JS = `(function() {
 })();`;
 
 // Delays and Fetch Controls (in milliseconds)
-export const DELAY_AFTER_INPUT_JS = 50;
-export const DELAY_AFTER_CLICK_JS = 500;
 export const DELAY_BETWEEN_RETRIES = 500;
 export const MAX_NULL_CHECKS = 3;
+export const DELAY_BETWEEN_CODES = 500;
+
+// Worker Pool
+export const NSIS_PARTITION = 'persist:nsis';
+export const DEFAULT_POOL_SIZE = 1;
+export const MAX_POOL_SIZE = 6;
+
+// Adaptive Rate Control (pacing, retries and circuit breaker)
+export const RATE_MIN_PER_SECOND = 0.2;             // slowest pace: one code every 5 s
+export const RATE_MAX_PER_SECOND = 20;              // fastest pace across all sessions
+export const RATE_INCREASE_PER_SECOND = 0.5;        // additive increase per second of healthy responses
+export const RATE_DECREASE_FACTOR = 0.5;            // multiplicative decrease on errors or slow responses
+export const RATE_WINDOW_SIZE = 50;                 // attempts in the rolling latency/error window
+export const RATE_SLOW_FACTOR = 3;                  // slower than 3x the best p50 counts as congestion
+export const RATE_SLOW_FLOOR_MS = 2000;             // ...but never below this latency
+export const RATE_LATENCY_BUCKETS_MS = [250, 500, 1000, 2000, 5000, 10000];
+export const RETRY_BACKOFF_MAX_MS = 8000;           // cap of the exponential retry backoff (base DELAY_BETWEEN_RETRIES)
+export const RETRY_ERROR_RATE_LIMIT = 0.5;          // above this error rate only one retry per code
+export const CIRCUIT_FAILURE_THRESHOLD = 8;         // consecutive failed attempts that pause the run
+export const CIRCUIT_OPEN_MS = 30000;               // first pause, doubled while the portal keeps failing
+export const CIRCUIT_MAX_OPEN_MS = 5 * 60 * 1000;
+
+// IPC
+export const IPC_FLUSH_INTERVAL_MS = 50;  // max delay of coalesced main -> renderer updates
+
+// Logs
+export const LOG_BUFFER_SIZE = 2000;                // entries kept in the log area
+export const LOG_FILE_MAX_BYTES = 5 * 1024 * 1024;  // rotate userData/logs/processing.log above this size
+export const LOG_FILE_MAX_FILES = 5;                // rotated files kept
+
+// Run Tracing
+export const TRACE_DIR_NAME = 'traces';          // Chrome traces of the runs under userData
+export const TRACE_MAX_FILES = 20;               // traces kept
+export const TRACE_MAX_EVENTS = 500000;          // spans written per trace (summaries stay exact)
+export const THROUGHPUT_WINDOW_MS = 60000;       // window of the live codes/min and ETA
+
+// Result Cache
+export const CACHE_FILE_NAME = 'result-cache.jsonl';
+export const CACHE_TTL_FINAL_MS = 7 * 24 * 60 * 60 * 1000;  // chiusa / annullata
+export const CACHE_TTL_OPEN_MS = 30 * 60 * 1000;            // aperta, in lavorazione, ...
+export const CACHE_MAX_ENTRIES = 50000;
+export const CACHE_FLUSH_BATCH = 50;
+
+// Checkpoints (resume of interrupted runs)
+export const CHECKPOINT_DIR_NAME = 'checkpoints';
+export const CHECKPOINT_SAVE_EVERY = 100;            // results between Excel write-backs
+export const CHECKPOINT_SAVE_INTERVAL_MS = 60000;    // max time between Excel write-backs
+
+// Excel Files
+export const EXCEL_STREAMING_THRESHOLD_BYTES = 20 * 1024 * 1024;  // streaming reader/writer above this size
 
 // Excel Column Names (case-insensitive)
 export const COL_RICERCA = "ricerca";
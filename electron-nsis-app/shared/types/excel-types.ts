@@ -6,6 +6,7 @@ export interface ExcelData {
   codes: string[];
   columns: string[];
   filePath: string;
+  resumableCount?: number;
 }
 
 export interface ProcessingResult {
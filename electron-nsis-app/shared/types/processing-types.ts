@@ -0,0 +1,73 @@
+/**
+ * TypeScript types for batch processing configuration and statistics
+ */
+
+export type LookupEngineType = 'dom' | 'http';
+
+export interface ProcessingOptions {
+  poolSize?: number;
+  engine?: LookupEngineType;
+  forceRefresh?: boolean;
+  resume?: boolean;
+}
+
+export interface WorkerStats {
+  workerId: number;
+  processed: number;
+  errors: number;
+  codesPerMinute: number;
+}
+
+export type CircuitState = 'closed' | 'open' | 'half-open';
+
+export interface RateStats {
+  codesPerMinute: number;    // current target pace across all sessions
+  concurrency: number;       // sessions allowed to query at the same time
+  maxConcurrency: number;
+  latencyP50Ms: number;      // over the rolling window
+  latencyP95Ms: number;
+  errorRate: number;         // 0-1, over the rolling window
+  histogram: number[];       // attempts per RATE_LATENCY_BUCKETS_MS bucket (+ overflow)
+  circuit: CircuitState;
+  resumeAt: number | null;   // epoch ms of the next probe while the circuit is open
+}
+
+export interface StageStats {
+  stage: string;             // 'code', 'pacing', 'input', 'click', 'request', ...
+  count: number;
+  p50Ms: number;
+  p95Ms: number;
+  p99Ms: number;
+  totalMs: number;
+}
+
+export interface ThroughputStats {
+  codesPerMinute: number;    // completed lookups, over the last THROUGHPUT_WINDOW_MS
+  etaMs: number | null;      // null until enough codes are completed
+  elapsedMs: number;
+}
+
+export interface BadgeStats {
+  annullate: number;
+  aperte: number;
+  chiuse: number;
+  inLavorazione: number;
+  inviate: number;
+  eccezioni: number;
+  cacheHits: number;
+  cacheMisses: number;
+}
+
+/**
+ * Coalesced main -> renderer update ('ipc-batch' channel)
+ * Only the fields that changed since the previous batch are set.
+ */
+export interface IpcBatch {
+  progress?: { current: number; total: number };
+  status?: string;
+  badges?: BadgeStats;
+  workerStats?: WorkerStats[];
+  rate?: RateStats;
+  throughput?: ThroughputStats;
+  logs: string[];
+}